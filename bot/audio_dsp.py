@@ -0,0 +1,185 @@
+"""
+Frame-level audio measurements for 16-bit little-endian PCM
+"""
+import math
+import sys
+import warnings
+from array import array
+
+# C-backed routines first: audioop ships with Python up to 3.12 (and as
+# audioop-lts after that), numpy is used when installed, and the array
+# version keeps everything working without either.
+try:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        import audioop
+except ImportError:
+    audioop = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SAMPLE_WIDTH = 2
+
+if audioop is not None:
+    BACKEND = "audioop"
+elif np is not None:
+    BACKEND = "numpy"
+else:
+    BACKEND = "array"
+
+
+def _even(pcm):
+    """Drop a trailing half sample so every routine sees whole samples"""
+    if len(pcm) % SAMPLE_WIDTH:
+        return memoryview(pcm)[:len(pcm) - len(pcm) % SAMPLE_WIDTH]
+    return pcm
+
+
+def _levels_audioop(pcm):
+    return audioop.rms(pcm, SAMPLE_WIDTH), audioop.max(pcm, SAMPLE_WIDTH)
+
+
+def _levels_numpy(pcm):
+    samples = np.frombuffer(pcm, dtype="<i2").astype(np.int32)
+    peak = int(np.abs(samples).max())
+    rms = int(math.sqrt(float(np.dot(samples, samples)) / samples.size))
+    return rms, peak
+
+
+def _levels_array(pcm):
+    samples = array("h")
+    samples.frombytes(pcm)
+    if sys.byteorder == "big":
+        samples.byteswap()
+    peak = max(max(samples), -min(samples))
+    rms = int(math.sqrt(sum(sample * sample for sample in samples) / len(samples)))
+    return rms, peak
+
+
+_LEVELS = {"audioop": _levels_audioop, "numpy": _levels_numpy, "array": _levels_array}
+
+
+def frame_levels(pcm, backend=None):
+    """
+    RMS and peak amplitude of one PCM frame (interleaved channels are fine)
+
+    Returns:
+        tuple: (rms, peak) as ints in 0..32768; (0, 0) for an empty frame
+    """
+    pcm = _even(pcm)
+    if not len(pcm):
+        return 0, 0
+    return _LEVELS[backend or BACKEND](pcm)
+
+
+def _mono_audioop(pcm, channels):
+    return audioop.tomono(pcm, SAMPLE_WIDTH, 0.5, 0.5) if channels == 2 else pcm
+
+
+def _crossings_audioop(pcm, channels):
+    mono = _mono_audioop(pcm, channels)
+    return audioop.cross(mono, SAMPLE_WIDTH), len(mono) // SAMPLE_WIDTH
+
+
+def _crossings_numpy(pcm, channels):
+    samples = np.frombuffer(pcm, dtype="<i2")
+    if channels == 2:
+        samples = (samples[0::2].astype(np.int32) + samples[1::2]) // 2
+    negative = samples < 0
+    return int(np.count_nonzero(negative[1:] != negative[:-1])), samples.size
+
+
+def _crossings_array(pcm, channels):
+    samples = array("h")
+    samples.frombytes(pcm)
+    if sys.byteorder == "big":
+        samples.byteswap()
+    if channels == 2:
+        samples = [(left + right) // 2 for left, right in zip(samples[0::2], samples[1::2])]
+    negative = [sample < 0 for sample in samples]
+    return sum(1 for before, after in zip(negative, negative[1:]) if before != after), len(negative)
+
+
+_CROSSINGS = {"audioop": _crossings_audioop, "numpy": _crossings_numpy, "array": _crossings_array}
+
+
+def zero_crossing_rate(pcm, channels=1, backend=None):
+    """
+    Sign changes per sample of the (downmixed) frame, 0.0..1.0
+
+    Voiced speech sits low (well under 0.1 at 48 kHz); hiss and broadband
+    noise sit near 0.5.
+    """
+    pcm = _even(pcm)
+    if channels == 2 and len(pcm) % 4:
+        pcm = memoryview(pcm)[:len(pcm) - len(pcm) % 4]
+    crossings, samples = _CROSSINGS[backend or BACKEND](pcm, channels)
+    return crossings / samples if samples > 1 else 0.0
+
+
+def _resample_audioop(pcm, channels, rate, target_rate):
+    mono = _mono_audioop(pcm, channels)
+    if rate == target_rate:
+        return bytes(mono)
+    converted, _ = audioop.ratecv(mono, SAMPLE_WIDTH, 1, rate, target_rate, None)
+    return converted
+
+
+def _resample_numpy(pcm, channels, rate, target_rate):
+    samples = np.frombuffer(pcm, dtype="<i2").astype(np.float32)
+    if channels > 1:
+        samples = samples[:samples.size - samples.size % channels].reshape(-1, channels).mean(axis=1)
+    if rate != target_rate:
+        if rate % target_rate == 0:
+            # 48 kHz -> 16 kHz: average each block of 3 (cheap low-pass + decimate)
+            factor = rate // target_rate
+            samples = samples[:samples.size - samples.size % factor].reshape(-1, factor).mean(axis=1)
+        else:
+            positions = np.arange(0, samples.size, rate / target_rate)
+            samples = np.interp(positions, np.arange(samples.size), samples)
+    return np.clip(np.rint(samples), -32768, 32767).astype("<i2").tobytes()
+
+
+def _resample_array(pcm, channels, rate, target_rate):
+    samples = array("h")
+    samples.frombytes(pcm)
+    if sys.byteorder == "big":
+        samples.byteswap()
+    if channels > 1:
+        samples = [sum(frame) // channels for frame in zip(*(samples[c::channels] for c in range(channels)))]
+    if rate != target_rate:
+        if rate % target_rate == 0:
+            factor = rate // target_rate
+            samples = [sum(block) // factor for block in zip(*(samples[i::factor] for i in range(factor)))]
+        else:
+            step = rate / target_rate
+            samples = [samples[int(i * step)] for i in range(int(len(samples) / step))]
+    out = array("h", samples)
+    if sys.byteorder == "big":
+        out.byteswap()
+    return out.tobytes()
+
+
+_RESAMPLE = {"audioop": _resample_audioop, "numpy": _resample_numpy, "array": _resample_array}
+
+
+def downmix_resample(pcm, channels=2, rate=48000, target_rate=16000, backend=None):
+    """Mix interleaved PCM down to mono and resample it to ``target_rate`` (what Whisper wants)"""
+    pcm = _even(pcm)
+    frame_bytes = SAMPLE_WIDTH * channels
+    if len(pcm) % frame_bytes:
+        pcm = memoryview(pcm)[:len(pcm) - len(pcm) % frame_bytes]
+    if not len(pcm):
+        return b""
+    return _RESAMPLE[backend or BACKEND](pcm, channels, rate, target_rate)
+
+
+def available_backends():
+    """Backends that can run in this interpreter, preferred first"""
+    return [
+        name for name, module in (("audioop", audioop), ("numpy", np), ("array", array))
+        if module is not None
+    ]
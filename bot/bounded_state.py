@@ -0,0 +1,141 @@
+"""
+Bounded in-memory state containers (LRU + idle TTL)
+"""
+from collections import OrderedDict
+import time
+
+
+class _Entry:
+    __slots__ = ("value", "touched_at")
+
+    def __init__(self, value, touched_at):
+        self.value = value
+        self.touched_at = touched_at
+
+
+class MuteRecord:
+    """A user server-muted by the word filter (the unmute itself is a scheduled action)"""
+
+    __slots__ = ("mute_time", "guild_id")
+
+    def __init__(self, guild_id, mute_time=None):
+        self.guild_id = guild_id
+        self.mute_time = time.time() if mute_time is None else mute_time
+
+
+class BoundedDict:
+    """
+    Dict with a maximum size and an optional idle TTL.
+
+    Writes and ``[key]`` lookups "touch" an entry: it moves to the back of the
+    LRU order and its idle timer restarts. ``get()``, ``in`` and iteration only
+    peek. Because entries are ordered by touch time, both the LRU victim and
+    the next entry to expire are always at the front, so trimming is cheap and
+    happens on every touch.
+
+    With a ``default_factory`` a missing ``[key]`` creates the value, like
+    defaultdict.
+    """
+
+    def __init__(self, name, *, max_entries, ttl_seconds=None, default_factory=None, clock=time.monotonic):
+        self.name = name
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = ttl_seconds if ttl_seconds and ttl_seconds > 0 else None
+        self.default_factory = default_factory
+        self._clock = clock
+        self._data = OrderedDict()
+
+        # Counters for the health snapshot
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def _is_expired(self, entry, now):
+        return self.ttl_seconds is not None and now - entry.touched_at >= self.ttl_seconds
+
+    def _trim(self, now):
+        data = self._data
+        if self.ttl_seconds is not None:
+            while data:
+                oldest = next(iter(data.values()))
+                if not self._is_expired(oldest, now):
+                    break
+                data.popitem(last=False)
+                self.expirations += 1
+        while len(data) > self.max_entries:
+            data.popitem(last=False)
+            self.evictions += 1
+
+    def _live_entry(self, key, now):
+        entry = self._data.get(key)
+        if entry is not None and self._is_expired(entry, now):
+            del self._data[key]
+            self.expirations += 1
+            return None
+        return entry
+
+    def __getitem__(self, key):
+        now = self._clock()
+        entry = self._live_entry(key, now)
+        if entry is None:
+            if self.default_factory is None:
+                raise KeyError(key)
+            entry = self._data[key] = _Entry(self.default_factory(), now)
+        else:
+            entry.touched_at = now
+            self._data.move_to_end(key)
+        self._trim(now)
+        return entry.value
+
+    def __setitem__(self, key, value):
+        now = self._clock()
+        entry = self._data.get(key)
+        if entry is None:
+            self._data[key] = _Entry(value, now)
+        else:
+            entry.value = value
+            entry.touched_at = now
+            self._data.move_to_end(key)
+        self._trim(now)
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def __contains__(self, key):
+        return self._live_entry(key, self._clock()) is not None
+
+    def get(self, key, default=None):
+        """Peek at a value without touching it"""
+        entry = self._live_entry(key, self._clock())
+        return default if entry is None else entry.value
+
+    def pop(self, key, default=None):
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry.value
+
+    def clear(self):
+        self._data.clear()
+
+    def items(self):
+        """Live (key, value) pairs, least recently touched first"""
+        now = self._clock()
+        return [(key, entry.value) for key, entry in self._data.items() if not self._is_expired(entry, now)]
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry now (trimming on touch only looks at the front)"""
+        before = self.expirations
+        self._trim(self._clock())
+        return self.expirations - before
+
+    def get_stats(self):
+        """Get size gauges for logging/health checks"""
+        self.purge_expired()
+        return {
+            "size": len(self._data),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -2,7 +2,8 @@ import discord
 from discord.ext import commands
 from groq import Groq
 import asyncio
-from collections import deque, defaultdict
+from collections import deque
+import heapq
 import time
 import random
 import datetime
@@ -12,7 +13,18 @@ import io
 import re
 import sys
 from gtts import gTTS  # Google Text-to-Speech
+from .bounded_state import BoundedDict, MuteRecord
 from .config import Config
+from .llm_scheduler import LLMScheduler
+from .message_pipeline import format_author_tag
+from .mutation_queue import PRIORITY_COSMETIC, PRIORITY_MODERATION, PRIORITY_NORMAL, MutationQueue
+from .nickname_planner import MemberSnapshot, NicknamePlanner
+from .nickname_reconciler import NicknameReconciler
+from .profanity_matcher import ProfanityMatcher
+from .reply_scheduler import ChannelReplyScheduler
+from .request_coalescer import SHARED_RECENT, RequestCoalescer
+from .timer_wheel import ActionScheduler
+from .unicode_transform import to_bold
 from .runtime_config import is_render_environment
 
 if hasattr(sys.stdout, "reconfigure"):
@@ -127,6 +139,13 @@ class SleepCheckInView(discord.ui.View):
         await interaction.response.send_message("Wala ka sa tulog thread ngayon.", ephemeral=True)
 
 
+# Stand-in for the member mentions in pre-generated greetings (filled in at send time)
+GREETING_MENTIONS_PLACEHOLDER = "{MENTIONS}"
+GREETING_CACHE_STATE_KEY = "greeting_cache"
+# channel_id -> {"name", "status": ok/forbidden/rate_limited, "until"}; persisted in bot_state
+CHANNEL_BOLD_STATE_KEY = "channel_bolding"
+
+
 class ChatCog(commands.Cog):
     """Cog for handling chat interactions with the Ginsilog AI and games"""
 
@@ -135,37 +154,121 @@ class ChatCog(commands.Cog):
         # Initialize Groq client with API key (uses the OpenAI-compatible interface)
         self.groq_client = Groq(
             api_key=Config.GROQ_API_KEY,
-            base_url="https://api.groq.com"  # Fixed the base URL
+            base_url=Config.GROQ_BASE_URL
+        )
+        # Per-channel/per-user state is bounded (LRU + idle TTL), see Config.STATE_*
+        self.conversation_history = BoundedDict(
+            "conversation_history",
+            max_entries=Config.STATE_MAX_CHANNELS,
+            ttl_seconds=Config.STATE_CONVERSATION_TTL_SECONDS,
+            default_factory=lambda: deque(maxlen=Config.MAX_CONTEXT_MESSAGES),
+        )
+        # user_id: deque of command timestamps inside the rate limit window
+        self.command_timestamps = BoundedDict(
+            "command_timestamps",
+            max_entries=Config.STATE_MAX_USERS,
+            ttl_seconds=Config.RATE_LIMIT_PERIOD,
+        )
+        # member_id: time of our last nickname edit / high-role nickname DM
+        self.nickname_update_times = BoundedDict(
+            "nickname_update_times",
+            max_entries=Config.STATE_MAX_USERS,
+            ttl_seconds=Config.STATE_NICKNAME_TTL_SECONDS,
+        )
+        self.high_role_dm_times = BoundedDict(
+            "high_role_dm_times",
+            max_entries=Config.STATE_MAX_USERS,
+            ttl_seconds=Config.STATE_NICKNAME_TTL_SECONDS,
         )
-        self.conversation_history = defaultdict(
-            lambda: deque(maxlen=Config.MAX_CONTEXT_MESSAGES))
-        self.user_message_timestamps = defaultdict(list)
         self.creator = Config.BOT_CREATOR
         # Database connection will be passed from main.py
         self.db = None
-        self.user_coins = defaultdict(lambda: Config.DEFAULT_BALANCE)
-        self.daily_cooldown = defaultdict(int)
+        # Balances used only while the database is down
+        self.user_coins = BoundedDict(
+            "user_coins",
+            max_entries=Config.STATE_MAX_USERS,
+            default_factory=lambda: Config.DEFAULT_BALANCE,
+        )
         self.blackjack_games = {}
         self.ADMIN_ROLE_ID = 1345727357662658603
         self.memory_refresh_in_progress = set()
-
-        # Setup for nickname scanning - RENDER FIX: only set task in async context
-        self.nickname_update_task = None
-        self.channel_maintenance_task = None
-        self.nickname_scanning_active = True
+        # Duplicate mentions/g!usap spam share one LLM call
+        self.ai_coalescer = RequestCoalescer(window=Config.AI_COALESCE_WINDOW_SECONDS)
+        # Every Groq chat completion shares one concurrency/token budget
+        self.llm_scheduler = LLMScheduler(
+            max_concurrency=Config.LLM_MAX_CONCURRENCY,
+            per_guild_concurrency=Config.LLM_GUILD_MAX_CONCURRENCY,
+            tokens_per_minute=Config.LLM_TOKENS_PER_MINUTE,
+            class_weights=Config.LLM_CLASS_WEIGHTS,
+        )
+        # Pre-generated AI greetings, loaded lazily from bot_state
+        self.greeting_cache = None
+        self.greetings_pregenerated = 0
+        self.greeting_cache_hits = 0
+        self.greeting_cache_misses = 0
+        # Mention replies are serialized per channel (and optionally merged)
+        self.reply_scheduler = ChannelReplyScheduler(
+            self._reply_to_mentions,
+            batching=Config.AI_REPLY_BATCHING,
+            debounce_seconds=Config.AI_REPLY_BATCH_WINDOW_MS / 1000,
+            max_batch=Config.AI_REPLY_BATCH_MAX,
+        )
 
         # Setup for role-emoji mappings - dynamic configuration
         self.role_emoji_mappings = Config.ROLE_EMOJI_MAP.copy()  # Create local copy to support runtime additions
+        # Nickname planner for the current map (rebuilt by g!roles)
+        self.nickname_planner = None
+        # Emojis replaced with g!roles, still stripped from old nicknames
+        self.retired_role_emojis = set()
+
+        # Nicknames are reconciled from member events (plus a slow safety-net sweep)
+        # RENDER FIX: tasks are only created in async context (on_ready)
+        self.nickname_reconciler = NicknameReconciler(
+            bot,
+            self._desired_nickname,
+            self._apply_nickname,
+            should_manage=self._manages_nickname,
+            sweep_interval=Config.NICKNAME_SWEEP_SECONDS,
+            page_size=Config.NICKNAME_SWEEP_PAGE_SIZE,
+            memo_size=Config.STATE_MAX_USERS,
+        )
+        self.nickname_update_task = None
+        self.nickname_sweep_task = None
+        self.channel_maintenance_task = None
+        # Channel bolding memo, loaded lazily from bot_state
+        self.channel_bold_memo = None
+        self.channel_bold_memo_dirty = False
+        self.channel_sweep_cursor = 0
+        self.channels_bolded = 0
+        self.channel_bold_skips = 0
 
         # For debugging nickname issues
         self.debug_nickname_updates = True
-        self.muted_users = {}
 
-        # Custom banned words list (empty by default, will be populated by set_words command)
-        self.custom_banned_words = []
-
-        # Track users who are muted for violation to automatically unmute them
-        self.muted_users = {}
+        # Banned words per guild: Postgres overrides on top of Config.DEFAULT_WORD_ACTIONS.
+        # Matchers are compiled once per guild so on_message never touches the DB.
+        self.banned_word_overrides = {}  # guild_id: {word: action, or None if removed}
+        self.banned_words_versions = {}  # guild_id: version last loaded from the DB
+        self.default_profanity_matcher = ProfanityMatcher(Config.DEFAULT_WORD_ACTIONS)
+        self.profanity_matchers = {}  # guild_id: ProfanityMatcher for guilds with overrides
+        self.banned_words_sync_task = None
+
+        # Users muted for a violation (user_id: MuteRecord); entries outlive the
+        # 60s mute by a wide margin in case the unmute action is delayed
+        self.muted_users = BoundedDict(
+            "muted_users",
+            max_entries=Config.STATE_MAX_USERS,
+            ttl_seconds=60 * 60,
+        )
+        # Nick/channel edits, mutes and deletes go through per-route rate limit buckets
+        self.mutations = MutationQueue(
+            route_intervals=Config.MUTATION_ROUTE_INTERVALS,
+            max_attempts=Config.MUTATION_MAX_ATTEMPTS,
+        )
+        # Durable delayed actions (auto-unmute etc.), all driven by one coroutine
+        self.action_scheduler = ActionScheduler(lambda: self.db)
+        self.action_scheduler.register("unmute", self._run_unmute_action)
+        self.action_scheduler_task = None
 
     @commands.Cog.listener()
     async def on_voice_state_update(self, member, before, after):
@@ -186,60 +289,15 @@ class ChatCog(commands.Cog):
         if member.bot:
             return
 
-        # Use the dynamic role-emoji mappings that includes admin updates
-        role_emoji_map = self.role_emoji_mappings
-
-        # Get member's roles sorted by position (highest first)
-        member_roles = sorted(member.roles, key=lambda r: r.position, reverse=True)
-
-        # Find the highest role that's in our mapping
-        highest_matched_role_id = None
-        for role in member_roles:
-            if role.id in role_emoji_map:
-                highest_matched_role_id = role.id
-                break
-
-        # If no matching role found, use default (no emoji)
-        # We'll still convert their name to Unicode bold style
-        if not highest_matched_role_id:
-            # Use a default format with no emoji for @everyone
-            emoji = ""  # No emoji for default users
-            role_name = "@everyone"
-        else:
-            # Get the emoji for this role
-            emoji = role_emoji_map[highest_matched_role_id]
-            role_name = "Role"  # We don't need exact role name here
-
-        # Format the name - only remove trailing emoji
-        original_name = member.display_name
-
-        # Clean the name using our centralized function (only removes trailing emojis)
-        clean_name = self.clean_name_of_emojis(original_name, role_emoji_map)
-
-        # Convert to Unicode bold style using our helper
-        formatted_name = self.format_to_bold(clean_name)
-
-        # Add the role emoji
-        new_name = f"{formatted_name} {emoji}"
-
-        # Skip if the name is already correctly formatted
-        if member.display_name == new_name:
-            return
-
-        # Update the name
-        try:
-            await member.edit(nick=new_name)
-            # Debug prints removed as requested to clean up logs
-        except Exception:
-            # Debug prints removed as requested to clean up logs
-            pass
+        self.nickname_reconciler.mark_dirty(member)
 
     @commands.Cog.listener()
     async def on_ready(self):
         """Called when the cog is ready - start tasks and initial maintenance"""
-        # Start nickname scanning task
+        # Start nickname reconciler and its safety-net sweep
         if self.nickname_update_task is None:
-            self.nickname_update_task = self.bot.loop.create_task(self._regular_nickname_scan())
+            self.nickname_update_task = self.bot.loop.create_task(self.nickname_reconciler.run())
+            self.nickname_sweep_task = self.bot.loop.create_task(self.nickname_reconciler.run_sweeps())
             print(f"🔄 Starting automatic nickname maintenance task")
 
         # Start channel maintenance task for counters and stats
@@ -247,39 +305,32 @@ class ChatCog(commands.Cog):
             self.channel_maintenance_task = self.bot.loop.create_task(self._regular_channel_maintenance())
             print(f"📊 Starting automatic channel bolding maintenance task")
 
+        # Recover persisted unmutes and run delayed actions
+        if self.action_scheduler_task is None:
+            self.action_scheduler_task = self.bot.loop.create_task(self.action_scheduler.run())
+
+        # Load per-guild banned words and keep them in sync with other instances
+        if self.banned_words_sync_task is None:
+            self.banned_words_sync_task = self.bot.loop.create_task(self._regular_banned_words_sync())
+
     @commands.Cog.listener()
     async def on_guild_channel_create(self, channel):
         """Automatically convert new channel names to bold style"""
         try:
-            # Skip if it's already in the correct format
-            bold_name = self.format_to_bold(channel.name)
-            if channel.name != bold_name:
-                await channel.edit(name=bold_name)
-                print(f"✅ Auto-bolded new channel: {channel.name} -> {bold_name}")
-        except discord.Forbidden:
-            pass # No permissions for this channel
+            await self._bold_channel(channel, "new")
         except Exception as e:
-            if "Rate limited" not in str(e):
-                print(f"❌ Error bolding new channel {channel.name}: {e}")
+            print(f"❌ Error bolding new channel {channel.name}: {e}")
 
     @commands.Cog.listener()
     async def on_guild_channel_update(self, before, after):
         """Ensure channel names stay in bold style when renamed or font is changed"""
+        # Permission/topic changes don't affect the name
+        if before.name == after.name:
+            return
         try:
-            # Always check the final name against its bold version
-            # This catches changes from normal font back to bold font
-            bold_name = self.format_to_bold(after.name)
-            if after.name != bold_name:
-                # Discord has a strict rate limit for channel names (2 per 10 mins)
-                # We try to edit, but expect potential 429s which the task will handle later
-                await after.edit(name=bold_name)
-                print(f"✅ Auto-bolded changed channel: {after.name} -> {bold_name}")
-        except discord.Forbidden:
-            pass # No permissions for this channel
+            await self._bold_channel(after, "changed")
         except Exception as e:
-            if "Rate limited" not in str(e):
-                # Don't spam logs with rate limit errors as they are expected with counter bots
-                pass
+            print(f"❌ Error bolding changed channel {after.name}: {e}")
 
     @commands.Cog.listener()
     async def on_member_update(self, before, after):
@@ -298,10 +349,6 @@ class ChatCog(commands.Cog):
             if after.bot:
                 return
 
-            # Use the dynamic role-emoji mappings that includes admin updates
-            role_emoji_map = self.role_emoji_mappings
-            role_names = Config.ROLE_NAMES
-
             change_type = "role change" if roles_changed else "nickname change"
 
             # Special check for owner changing their nickname (only when nickname changes)
@@ -317,7 +364,7 @@ class ChatCog(commands.Cog):
                     clean_name = self.clean_name_of_emojis(after.display_name)
 
                     # Format properly with Unicode bold
-                    formatted_name = ''.join(Config.UNICODE_MAP.get(c, c) for c in clean_name)
+                    formatted_name = to_bold(clean_name)
                     suggested_name = f"{formatted_name} {owner_emoji}"
 
                     # Only send a DM if the format isn't already correct
@@ -338,64 +385,9 @@ class ChatCog(commands.Cog):
                 # So we return here
                 return
 
-            # Get member's roles sorted by position (highest first)
-            member_roles = sorted(after.roles, key=lambda r: r.position, reverse=True)
-
-            # Find the highest role that's in our mapping
-            highest_matched_role_id = None
-            for role in member_roles:
-                if role.id in role_emoji_map:
-                    highest_matched_role_id = role.id
-                    break
-
-            # If no matching role found, use default (no emoji)
-            # We'll still convert their name to Unicode bold style
-            if not highest_matched_role_id:
-                # Use a default format with no emoji for @everyone
-                emoji = ""  # No emoji for default users
-                role_name = "@everyone"
-            else:
-                # Get the emoji for this role
-                emoji = role_emoji_map[highest_matched_role_id]
-                role_name = role_names.get(highest_matched_role_id, "Role")  # Get proper role name if available
-
-            # Format the name - get original name without trailing emoji
-            original_name = after.display_name
-
-            # Use our centralized emoji cleaning function to only remove trailing emojis
-            clean_name = self.clean_name_of_emojis(original_name, role_emoji_map)
-
-            # Convert to Unicode bold style using our helper (preserves user's actual nickname)
-            formatted_name = self.format_to_bold(clean_name)
-
-            # Add the role emoji - just one emoji at the end as requested
-            new_name = f"{formatted_name} {emoji}"
-
-            # Skip if the name is already correctly formatted to prevent unnecessary edits
-            if after.display_name == new_name:
-                return
-
-            # No longer skipping updates based on time
-            # REALTIME updates as requested
-            update_key = f"nickname_update_time_{after.id}"
-            now = time.time()
-
-            # Always update nickname immediately with no time-based skipping
-
-            # Update the name (silently - no notifications)
-            try:
-                await after.edit(nick=new_name)
-                # Store the timestamp of when we last updated this member
-                self.user_message_timestamps[update_key] = now
-                # Debug output for nickname changes
-                print(f"✅ Auto-updated nickname for {after.name} due to {change_type}: {original_name} → {new_name}")
-            except discord.Forbidden:
-                # This will happen for members with higher permissions than the bot
-                # The server owner will already get a DM from the special handling above
-                pass
-            except Exception as e:
-                # Print general errors for troubleshooting
-                print(f"❌ Error updating nickname for {after.name}: {e}")
+            # The reconciler works out the desired nickname and edits only if it differs
+            print(f"🔄 Queued nickname check for {after.name} due to {change_type}")
+            self.nickname_reconciler.mark_dirty(after)
 
         except Exception as e:
             # Handle any unexpected errors in the event handler
@@ -412,45 +404,25 @@ class ChatCog(commands.Cog):
                 # Debug prints removed as requested to clean up logs
                 pass
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        """Listen for messages that mention the bot and respond automatically and filter profanity"""
-        # Ignore messages from the bot itself
-        if message.author.bot:
-            return
-
-        await self._record_message_for_memory(message)
-
-        # Profanity filter - now using dynamic word_actions dictionary
-        content_lower = message.content.lower()
+    def register_message_stages(self, pipeline):
+        """Hook this cog's on_message work into the shared message pipeline"""
+        pipeline.register("memory_log", self._stage_record_memory, order=10)
+        pipeline.register("profanity", self._stage_profanity_filter, order=20)
+        pipeline.register("mention_reply", self._stage_mention_reply, order=50)
 
-        # Create word_actions dictionary if it doesn't exist yet
-        if not hasattr(self, 'word_actions'):
-            self.word_actions = {
-                # Default word actions
-                "nigga": "both",      # Mute and disconnect
-                "chingchong": "both", # Mute and disconnect
-                "bading": "mute",     # Mute only 
-                "tanga": "mute",      # Mute only
-                "bobo": "mute"        # Mute only
-            }
-
-        # Get additional custom banned words from both sources
-        custom_banned_words = getattr(self, 'custom_banned_words', [])
+    async def _stage_record_memory(self, ctx):
+        await self._record_message_for_memory(ctx.message, author_tag=ctx.author_tag)
 
-        # Build complete list of banned words from word_actions and custom_banned_words
-        all_banned_words = list(self.word_actions.keys()) + [w for w in custom_banned_words if w not in self.word_actions]
+    async def _stage_profanity_filter(self, ctx):
+        """Punish and delete messages with banned words; stops the pipeline on a hit"""
+        message = ctx.message
 
-        # Check for profanity
-        detected_word = None
-        for word in all_banned_words:
-            if word in content_lower:
-                detected_word = word
-                break
+        # One pass, highest-severity word wins
+        matcher = self.profanity_matchers.get(ctx.guild_id, self.default_profanity_matcher)
+        match = matcher.find_folded(ctx.folded_text)
 
-        if detected_word:
-            # Get the action type for this word (default to "mute" if not specified)
-            action_type = self.word_actions.get(detected_word, "mute")
+        if match:
+            detected_word, action_type = match
             # Create a warning embed
             warning_embed = discord.Embed(
                 title="⚠️ VIOLATION DETECTED! ⚠️",
@@ -474,16 +446,20 @@ class ChatCog(commands.Cog):
                 # Apply proper action based on action_type
                 if action_type == "mute" or action_type == "both":
                     # Server mute the user
-                    await message.author.edit(mute=True)
+                    await self.mutations.submit(
+                        "member", message.author.edit, mute=True, bucket=message.guild.id,
+                        priority=PRIORITY_MODERATION, key=("mute", message.author.id),
+                    )
 
                     # Set a timer to unmute after 60 seconds
-                    self.muted_users[message.author.id] = {
-                        "mute_time": time.time(),
-                        "guild": message.guild
-                    }
+                    self.muted_users[message.author.id] = MuteRecord(message.guild.id)
 
-                    # Schedule automatic unmute after 60 seconds
-                    self.bot.loop.create_task(self.auto_unmute_user(message.author.id, 60))
+                    # Schedule automatic unmute after 60 seconds (survives restarts)
+                    self.action_scheduler.schedule(
+                        "unmute",
+                        60,
+                        {"guild_id": message.guild.id, "user_id": message.author.id, "seconds": 60},
+                    )
 
                     # Add unmute timing to the warning message
                     warning_embed.add_field(name="UNMUTE TIME:", value="You will be automatically unmuted after 60 seconds", inline=False)
@@ -495,7 +471,10 @@ class ChatCog(commands.Cog):
                 if action_type == "disconnect" or action_type == "both":
                     # Disconnect from voice channel if they're in one
                     if message.author.voice:
-                        await message.author.move_to(None)  # Disconnect from voice
+                        await self.mutations.submit(  # Disconnect from voice
+                            "member", message.author.move_to, None, bucket=message.guild.id,
+                            priority=PRIORITY_MODERATION, key=("voice", message.author.id),
+                        )
 
                     # 2. Try to send a DM to the user
                     try:
@@ -554,55 +533,94 @@ class ChatCog(commands.Cog):
 
             # Try to delete the message
             try:
-                await message.delete()
+                await self.mutations.submit(
+                    "message", message.delete, bucket=message.channel.id, priority=PRIORITY_MODERATION
+                )
             except Exception as e:
                 print(f"❌ Error deleting profanity message: {e}")
 
             # Skip further processing
-            return
+            return True
 
-        # Check if the bot is mentioned in the message
-        if self.bot.user.mentioned_in(message) and not message.mention_everyone:
-            # Remove the mention from the message
-            content = message.content
-            for mention in message.mentions:
-                content = content.replace(f'<@{mention.id}>', '').replace(f'<@!{mention.id}>', '')
+    async def _stage_mention_reply(self, ctx):
+        """Answer messages that mention the bot"""
+        if not ctx.mentions_bot or not ctx.mention_content:
+            return  # Not a mention, or empty message after removing mention
 
-            # Clean up and get the actual message
-            content = content.strip()
-            if not content:
-                return  # Empty message after removing mention
+        message = ctx.message
+        content = ctx.mention_content
 
-            # Get conversation history
-            channel_history = []
-            try:
-                channel_history = self.db.get_conversation_history(message.channel.id, Config.MAX_CONTEXT_MESSAGES)
-            except Exception as e:
-                print(f"❌ Error retrieving conversation history for mention: {e}")
-                pass
+        # Replies go through the per-channel scheduler so history stays in order
+        response, shared = await self.ai_coalescer.run(
+            self.ai_coalescer.make_key("mention", message.channel.id, message.author.id, content),
+            lambda: self.reply_scheduler.submit(message.channel.id, (message, content)),
+        )
+        if shared == SHARED_RECENT:
+            # Already answered moments ago: repeat the answer without another AI call
+            print(f"♻️ Repeating recent answer for duplicate mention from {message.author.name}")
+            await message.reply(response, mention_author=False)
+            return True
+        if shared:
+            # Same author spamming the same mention - the first copy's reply answers it
+            print(f"♻️ Coalesced duplicate mention from {message.author.name}")
+            return True
+        print(f"✅ AI response generated for mention: '{response[:50]}...'")
+        return True
+
+    async def _reply_to_mentions(self, channel_id, mentions):
+        """Answer queued (message, content) mentions for one channel with a single AI call"""
+        last_message = mentions[-1][0]
+        channel = last_message.channel
 
-            # Add user's message to history
+        # Get conversation history
+        channel_history = []
+        try:
+            channel_history = self.db.get_conversation_history(channel_id, Config.MAX_CONTEXT_MESSAGES)
+        except Exception as e:
+            print(f"❌ Error retrieving conversation history for mention: {e}")
+
+        if len(mentions) == 1:
+            message, content = mentions[0]
+            author_tag = self._format_author_tag(message.author)
             channel_history.append({"is_user": True, "content": content})
+            print(f"🧠 Generating AI response for mention: '{content}'")
+        else:
+            author_tags = list(dict.fromkeys(self._format_author_tag(message.author) for message, _ in mentions))
+            author_tag = ", ".join(author_tags)
+            combined = "\n".join(
+                f"[{self._format_author_tag(message.author)}]: {content}" for message, content in mentions
+            )
+            channel_history.append({
+                "is_user": True,
+                "content": f"MULTIPLE_MENTIONS: Sabay-sabay silang nag-mention, sagutin mo silang lahat sa iisang reply.\n{combined}",
+            })
+            print(f"🧠 Generating one AI response for {len(mentions)} batched mentions in channel {channel_id}")
+
+        # Add typing indicator
+        async with channel.typing():
+            response = await self.get_ai_response(
+                channel_history,
+                channel_id=channel_id,
+                author_id=last_message.author.id,
+                author_tag=author_tag,
+                voice_members=self._get_voice_member_names(last_message.author),
+            )
 
-            # Add typing indicator
-            async with message.channel.typing():
-                print(f"🧠 Generating AI response for mention: '{content}'")
-                response = await self.get_ai_response(
-                    channel_history,
-                    channel_id=message.channel.id,
-                    author_id=message.author.id,
-                    author_tag=self._format_author_tag(message.author),
-                    voice_members=self._get_voice_member_names(message.author),
-                )
-                print(f"✅ AI response generated for mention: '{response[:50]}...'")
+            # Add the conversation to history (in arrival order)
+            for _, content in mentions:
+                self.add_to_conversation(channel_id, True, content)
+            self.add_to_conversation(channel_id, False, response)
+
+            reply = response
+            if len(mentions) > 1:
+                mentioned = " ".join(dict.fromkeys(message.author.mention for message, _ in mentions))
+                reply = f"{mentioned}\n{response}"
 
-                # Add the conversation to history
-                self.add_to_conversation(message.channel.id, True, content)
-                self.add_to_conversation(message.channel.id, False, response)
+            # Send the response
+            await channel.send(reply)
+            self._log_bot_message(last_message, reply)
 
-                # Send the response
-                await message.channel.send(response)
-                self._log_bot_message(message, response)
+        return [response] * len(mentions)
 
     def _get_voice_member_names(self, member):
         if not getattr(member, "voice", None) or not member.voice or not member.voice.channel:
@@ -610,11 +628,7 @@ class ChatCog(commands.Cog):
         return [voice_member.display_name for voice_member in member.voice.channel.members if not voice_member.bot]
 
     def _format_author_tag(self, member_or_user):
-        display_name = getattr(member_or_user, "display_name", None) or getattr(member_or_user, "name", "someone")
-        username = getattr(member_or_user, "name", display_name)
-        if display_name == username:
-            return display_name
-        return f"{display_name} (@{username})"
+        return format_author_tag(member_or_user)
 
     def _resolve_context_guild(self, channel_id=None, author_id=None):
         if channel_id:
@@ -662,6 +676,17 @@ class ChatCog(commands.Cog):
 
         return f"OWNER_CONTEXT: {owner_context} Kilala mo siya at hindi mo nakakalimutan kung sino ang boss mo."
 
+    async def _create_chat_completion(self, *, request_class, channel_id=None, author_id=None, **kwargs):
+        """Run a Groq chat completion through the global LLM scheduler"""
+        guild = self._resolve_context_guild(channel_id=channel_id, author_id=author_id)
+        return await self.llm_scheduler.run(
+            self.groq_client.chat.completions.create,
+            guild_id=guild.id if guild else None,
+            request_class=request_class,
+            estimated_tokens=LLMScheduler.estimate_tokens(kwargs.get("messages"), kwargs.get("max_tokens")),
+            **kwargs,
+        )
+
     def _get_recent_history_messages(self, channel_id, limit=None):
         if not channel_id or not self.db or not self.db.connected:
             return []
@@ -713,8 +738,10 @@ class ChatCog(commands.Cog):
 
         for model in thinking_models:
             try:
-                response = await asyncio.to_thread(
-                    self.groq_client.chat.completions.create,
+                response = await self._create_chat_completion(
+                    request_class="planning",
+                    channel_id=channel_id,
+                    author_id=author_id,
                     model=model,
                     messages=[
                         {
@@ -768,7 +795,7 @@ class ChatCog(commands.Cog):
             print(f"Error in AI planning pass: {last_error}")
         return ""
 
-    async def _record_message_for_memory(self, message):
+    async def _record_message_for_memory(self, message, author_tag=None):
         if not self.db or not self.db.connected:
             return
 
@@ -781,7 +808,7 @@ class ChatCog(commands.Cog):
                 message.guild.id if message.guild else None,
                 message.channel.id,
                 message.author.id,
-                self._format_author_tag(message.author),
+                author_tag or self._format_author_tag(message.author),
                 content or "[empty]",
                 is_bot=False,
             )
@@ -839,8 +866,9 @@ class ChatCog(commands.Cog):
                 f"RECENT_MESSAGES:\n{transcript}"
             )
 
-            response = await asyncio.to_thread(
-                self.groq_client.chat.completions.create,
+            response = await self._create_chat_completion(
+                request_class="memory",
+                channel_id=channel_id,
                 model=Config.GROQ_MEMORY_MODEL,
                 messages=[
                     {
@@ -878,53 +906,135 @@ class ChatCog(commands.Cog):
             self.memory_refresh_in_progress.discard(channel_id)
 
     # === HELPER FUNCTIONS ===
+    def _load_channel_bold_memo(self):
+        """Load the channel bolding memo (str channel id -> entry), persisted in bot_state"""
+        if self.channel_bold_memo is None:
+            self.channel_bold_memo = {}
+            if self.db and self.db.connected:
+                try:
+                    self.channel_bold_memo = dict(self.db.get_state(CHANNEL_BOLD_STATE_KEY) or {})
+                except Exception as e:
+                    print(f"❌ Error loading channel bolding memo: {e}")
+        return self.channel_bold_memo
+
+    def _save_channel_bold_memo(self):
+        if not self.channel_bold_memo_dirty:
+            return
+        if self.db and self.db.connected:
+            try:
+                self.db.set_state(CHANNEL_BOLD_STATE_KEY, self._load_channel_bold_memo())
+                self.channel_bold_memo_dirty = False
+            except Exception as e:
+                print(f"❌ Error saving channel bolding memo: {e}")
+
+    def _remember_channel(self, channel, name, status, retry_seconds=None):
+        entry = {"name": name, "status": status}
+        if retry_seconds:
+            entry["until"] = time.time() + retry_seconds
+        memo = self._load_channel_bold_memo()
+        if memo.get(str(channel.id)) != entry:
+            memo[str(channel.id)] = entry
+            self.channel_bold_memo_dirty = True
+
+    def _channel_bold_settled(self, channel):
+        """True if the memo says this exact name is already bold or can't be fixed right now"""
+        entry = self._load_channel_bold_memo().get(str(channel.id))
+        if not entry or entry.get("name") != channel.name:
+            return False
+        return time.time() < entry.get("until", float("inf"))
+
+    async def _bold_channel(self, channel, source):
+        """Rename a channel to its bold form unless the memo says there's nothing to do"""
+        if not channel.name:
+            return False
+        if self._channel_bold_settled(channel):
+            self.channel_bold_skips += 1
+            return False
+
+        bold_name = self.format_to_bold(channel.name)
+        if channel.name == bold_name:
+            self._remember_channel(channel, channel.name, "ok")
+            return False
+
+        try:
+            await self.mutations.submit(
+                "channel", channel.edit, name=bold_name, bucket=channel.id,
+                priority=PRIORITY_COSMETIC, key=("name", channel.id),
+            )
+        except discord.Forbidden:
+            # No permissions for this channel; retried if renamed or after a while
+            self._remember_channel(channel, channel.name, "forbidden", Config.CHANNEL_BOLD_FORBIDDEN_RETRY_SECONDS)
+            return False
+        except discord.HTTPException as e:
+            if e.status != 429:
+                raise
+            # Still rate limited after the queue's retries (e.g. counter channels) - leave it be
+            self._remember_channel(channel, channel.name, "rate_limited", Config.CHANNEL_BOLD_RATE_LIMIT_RETRY_SECONDS)
+            return False
+
+        self._remember_channel(channel, bold_name, "ok")
+        self.channels_bolded += 1
+        print(f"✅ Auto-bolded {source} channel: {channel.name} -> {bold_name}")
+        return True
+
     async def _regular_channel_maintenance(self):
-        """Background task to ensure all channels (especially counters) stay bolded"""
+        """Safety-net sweep: bold a bounded slice of channels per run, resuming from a cursor"""
         await self.bot.wait_until_ready()
         print("🔍 Channel bolding maintenance task started")
-        
+
         while not self.bot.is_closed():
             try:
-                for guild in self.bot.guilds:
-                    for channel in guild.channels:
-                        # Skip if there's no name or name is already bolded
-                        if not channel.name:
-                            continue
-                            
-                        bold_name = self.format_to_bold(channel.name)
-                        if channel.name != bold_name:
-                            try:
-                                # Attempt to boldify
-                                await channel.edit(name=bold_name)
-                                print(f"🔧 Maintenance: Bolded recovered channel {channel.name}")
-                                # Slow down to respect Discord's strict channel name rate limits
-                                # Limits are roughly 2 edits per 10 minutes per channel
-                                await asyncio.sleep(5)
-                            except discord.Forbidden:
-                                # Bot doesn't have permission for this channel
-                                continue
-                            except discord.HTTPException as e:
-                                if e.status == 429: # Too many requests
-                                    # We hit a rate limit, cool down for a while
-                                    retry_after = getattr(e, 'retry_after', 600)
-                                    print(f"⏳ Channel bolding rate limited, waiting {retry_after}s")
-                                    await asyncio.sleep(retry_after + 1)
-                                    break # Move to next loop iteration
-                                continue
-                            except Exception:
-                                continue
+                await self._channel_maintenance_step()
             except Exception as e:
                 print(f"❌ Error in channel maintenance loop: {e}")
-                
-            # Scan again in 10 minutes (matching Discord's channel edit rate limit window)
-            await asyncio.sleep(600)
+            self._save_channel_bold_memo()
+
+            await asyncio.sleep(Config.CHANNEL_SWEEP_SECONDS)
+
+    async def _channel_maintenance_step(self):
+        # Next slice of channels by id after the cursor
+        batch = heapq.nsmallest(
+            Config.CHANNEL_SWEEP_BATCH,
+            (
+                channel
+                for guild in self.bot.guilds
+                for channel in guild.channels
+                if channel.id > self.channel_sweep_cursor
+            ),
+            key=lambda channel: channel.id,
+        )
+
+        for channel in batch:
+            self.channel_sweep_cursor = channel.id
+            try:
+                await self._bold_channel(channel, "recovered")
+            except Exception:
+                continue
+
+        if len(batch) < Config.CHANNEL_SWEEP_BATCH:
+            # Full pass done: start over and forget channels that no longer exist
+            self.channel_sweep_cursor = 0
+            existing = {str(channel.id) for guild in self.bot.guilds for channel in guild.channels}
+            memo = self._load_channel_bold_memo()
+            for channel_id in [channel_id for channel_id in memo if channel_id not in existing]:
+                del memo[channel_id]
+                self.channel_bold_memo_dirty = True
+
+    def get_channel_bold_stats(self):
+        """Get channel bolding counters for logging/health checks"""
+        statuses = {}
+        for entry in self._load_channel_bold_memo().values():
+            statuses[entry.get("status")] = statuses.get(entry.get("status"), 0) + 1
+        return {
+            "memo": statuses,
+            "bolded": self.channels_bolded,
+            "skipped": self.channel_bold_skips,
+            "cursor": self.channel_sweep_cursor,
+        }
 
     def format_to_bold(self, text):
-        """Convert standard text to fancy unicode bold style from Config"""
-        if not text:
-            return text
-        # Use Config.UNICODE_MAP to convert each character
-        return ''.join(Config.UNICODE_MAP.get(c, c) for c in text)
+        """Convert standard text to fancy unicode bold style"""
+        return to_bold(text)
 
     def get_user_balance(self, user_id):
         """Get user's balance with aggressive Tagalog flair"""
@@ -954,16 +1064,37 @@ class ChatCog(commands.Cog):
 
     def is_rate_limited(self, user_id):
         """Check if user is spamming commands"""
-        current_time = time.time()
-        if user_id not in self.user_message_timestamps:
-            self.user_message_timestamps[user_id] = []
-        # Filter out old timestamps
-        self.user_message_timestamps[user_id] = [
-            ts for ts in self.user_message_timestamps[user_id]
-            if current_time - ts < Config.RATE_LIMIT_PERIOD
-        ]
-        return len(self.user_message_timestamps[user_id]
-                   ) >= Config.RATE_LIMIT_MESSAGES
+        timestamps = self.command_timestamps.get(user_id)
+        if not timestamps:
+            return False
+        # Drop timestamps that fell out of the window
+        cutoff = time.time() - Config.RATE_LIMIT_PERIOD
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()
+        return len(timestamps) >= Config.RATE_LIMIT_MESSAGES
+
+    def record_command_use(self, user_id):
+        """Count a rate-limited command towards the user's window"""
+        timestamps = self.command_timestamps.get(user_id)
+        if timestamps is None:
+            timestamps = deque(maxlen=Config.RATE_LIMIT_MESSAGES)
+        timestamps.append(time.time())
+        # Re-set to restart the entry's idle TTL
+        self.command_timestamps[user_id] = timestamps
+
+    def get_state_stats(self):
+        """Get size gauges of the bounded in-memory state for logging/health checks"""
+        return {
+            state.name: state.get_stats()
+            for state in (
+                self.conversation_history,
+                self.command_timestamps,
+                self.nickname_update_times,
+                self.high_role_dm_times,
+                self.user_coins,
+                self.muted_users,
+            )
+        }
 
     def clean_name_of_emojis(self, name, role_emoji_map=None):
         """
@@ -977,36 +1108,20 @@ class ChatCog(commands.Cog):
         Returns:
             str: The cleaned name with only trailing role emojis removed
         """
-        if role_emoji_map is None:
-            role_emoji_map = self.role_emoji_mappings
-
         # Don't change the name content, only remove ALL trailing role emojis
-        clean_name = name.strip()
-
-        # Clean all trailing role emojis and specifically cloud emoji
-        # Do not remove emojis in the middle of names, only at the end
-        changed = True
-        while changed:
-            changed = False
-            # Try all possible emojis until no more can be removed
-            for emoji_value in role_emoji_map.values():
-                if clean_name.endswith(f" {emoji_value}"):
-                    clean_name = clean_name[:-len(emoji_value)-1].strip()
-                    changed = True
-
-            # Special case for cloud emoji (both variants)
-            if clean_name.endswith(" ☁️") or clean_name.endswith(" ☁"):
-                if clean_name.endswith(" ☁️"):
-                    clean_name = clean_name[:-2].strip()
-                else:
-                    clean_name = clean_name[:-2].strip()
-                changed = True
-
-        # If the name is empty after cleaning, use a default
-        if not clean_name:
-            clean_name = "User"
-
-        return clean_name
+        # (one right-to-left pass over a suffix trie of the role emojis plus the cloud);
+        # an empty result becomes "User"
+        if role_emoji_map is None or role_emoji_map is self.role_emoji_mappings:
+            return self._nickname_planner().clean_name(name)
+        return NicknamePlanner(role_emoji_map).clean_name(name)
+
+    def _nickname_planner(self):
+        """Planner for the current role-emoji map, rebuilt when the map changes"""
+        if self.nickname_planner is None:
+            self.nickname_planner = NicknamePlanner(
+                self.role_emoji_mappings, retired_emojis=self.retired_role_emojis
+            )
+        return self.nickname_planner
 
     def add_to_conversation(self, channel_id, is_user, content):
         """Add a message to the conversation history"""
@@ -1491,6 +1606,7 @@ class ChatCog(commands.Cog):
         author_id=None,
         author_tag=None,
         voice_members=None,
+        request_class="reply",
     ):
         """Get response from Groq AI with channel memory and user context."""
         try:
@@ -1549,8 +1665,10 @@ class ChatCog(commands.Cog):
             last_error = None
             for model in Config.GROQ_MODELS:
                 try:
-                    response = await asyncio.to_thread(
-                        self.groq_client.chat.completions.create,
+                    response = await self._create_chat_completion(
+                        request_class=request_class,
+                        channel_id=channel_id,
+                        author_id=author_id,
                         model=model,
                         messages=messages,
                         temperature=Config.TEMPERATURE,
@@ -1585,8 +1703,12 @@ class ChatCog(commands.Cog):
         name_hint = author_tag.split("#")[0] if author_tag and "#" in author_tag else "teh"
         return f"Sandali muna, {name_hint}. Humihingal pa utak ko sa kabobohan ng lahat dito. Try mo ulit mamaya."
 
-    async def generate_greeting(self, greeting_type, members=None):
-        """Generate a greeting (AI or static) based on type (morning/night)"""
+    async def generate_greeting(self, greeting_type, members=None, for_date=None):
+        """Generate a greeting (AI or static) based on type (morning/night)
+
+        If ``for_date`` is given and a pre-generated greeting is cached for it,
+        that text is used instead of waiting on a fresh completion.
+        """
         mentions = ""
         if members:
             # Limit mentions to avoid too long messages if many people are online
@@ -1614,32 +1736,13 @@ class ChatCog(commands.Cog):
                 return random.choice(night_messages)
 
         try:
-            if greeting_type == "morning":
-                prompt = f"Mag-generate ka ng barumbado, bastos, at nakaka-bad trip na Good Morning greeting sa Tagalog para sa mga kupal na to: {mentions}. Siguraduhin mong may mura gaya ng 'putangina niyo' at sabihan mo silang gising na dahil tanghali na at kailangan nilang mag-trabaho dahil wala silang kwenta. Isang paragraph lang at diretso sa punto."
+            cached = self._pop_cached_greeting(greeting_type, for_date) if for_date else None
+            if cached:
+                print(f"⚡ Using pre-generated {greeting_type} greeting for {for_date}")
+                ai_response = cached.replace(GREETING_MENTIONS_PLACEHOLDER, mentions).strip()
             else:
-                prompt = "Mag-generate ka ng barumbado, bastos, at nakaka-bad trip na Good Night greeting sa Tagalog. Sabihan mo silang matulog na dahil puyat na sila sa Discord at wala silang mapapala dito kundi pagiging palamunin. Murahin mo silang mabuti (halimbawa: sigawan mo sila ng 'putangina niyo'). Isang paragraph lang at diretso sa punto."
-
-            system_prompt = """Ikaw ay isang barumbado, bastos, at mayabang na AI bot na walang pasensya sa mga tanga. Laging may mura (gaya ng 'putangina', 'gago', 'bobo'), laging may angas. 
-Dapat barumbado, diretso, at walang paligoy-ligoy. Sumagot sa Tagalog. 
-Huwag kang mahiya mag-mura dahil yan ang personality mo.
-Huwag gumamit ng emojis maliban kung pang-asar lang. 
-Siguraduhin na ang tono mo ay galit at naiirita."""
-
-            response = await asyncio.to_thread(
-                self.groq_client.chat.completions.create,
-                model=Config.GROQ_MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.9,
-                max_tokens=600
-            )
+                ai_response = await self._request_ai_greeting(greeting_type, mentions)
 
-            ai_response = response.choices[0].message.content
-            # Clean of thinking blocks and strip whitespace
-            ai_response = re.sub(r'<think>.*?</think>', '', ai_response, flags=re.DOTALL).strip()
-            
             # Ensure mentions are included if it's a morning greeting and they're not in the response
             if greeting_type == "morning" and mentions and not any(m.mention in ai_response for m in (members[:5] if members else [])):
                 ai_response = f"{mentions}\n\n{ai_response}"
@@ -1663,6 +1766,101 @@ Siguraduhin na ang tono mo ay galit at naiirita."""
                 ]
                 return random.choice(night_messages)
 
+    async def _request_ai_greeting(self, greeting_type, mentions):
+        """Ask the LLM for a morning/night greeting (raises on failure)"""
+        if greeting_type == "morning":
+            prompt = f"Mag-generate ka ng barumbado, bastos, at nakaka-bad trip na Good Morning greeting sa Tagalog para sa mga kupal na to: {mentions}. Siguraduhin mong may mura gaya ng 'putangina niyo' at sabihan mo silang gising na dahil tanghali na at kailangan nilang mag-trabaho dahil wala silang kwenta. Isang paragraph lang at diretso sa punto."
+        else:
+            prompt = "Mag-generate ka ng barumbado, bastos, at nakaka-bad trip na Good Night greeting sa Tagalog. Sabihan mo silang matulog na dahil puyat na sila sa Discord at wala silang mapapala dito kundi pagiging palamunin. Murahin mo silang mabuti (halimbawa: sigawan mo sila ng 'putangina niyo'). Isang paragraph lang at diretso sa punto."
+        if mentions == GREETING_MENTIONS_PLACEHOLDER:
+            prompt += f" Isulat mo nang eksakto ang {GREETING_MENTIONS_PLACEHOLDER} kung saan mo sila tatawagin."
+
+        system_prompt = """Ikaw ay isang barumbado, bastos, at mayabang na AI bot na walang pasensya sa mga tanga. Laging may mura (gaya ng 'putangina', 'gago', 'bobo'), laging may angas. 
+Dapat barumbado, diretso, at walang paligoy-ligoy. Sumagot sa Tagalog. 
+Huwag kang mahiya mag-mura dahil yan ang personality mo.
+Huwag gumamit ng emojis maliban kung pang-asar lang. 
+Siguraduhin na ang tono mo ay galit at naiirita."""
+
+        response = await self._create_chat_completion(
+            request_class="greeting",
+            model=Config.GROQ_MODEL,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.9,
+            max_tokens=600
+        )
+
+        ai_response = response.choices[0].message.content
+        # Clean of thinking blocks and strip whitespace
+        return re.sub(r'<think>.*?</think>', '', ai_response, flags=re.DOTALL).strip()
+
+    def _load_greeting_cache(self):
+        """Load pre-generated greetings ("type:YYYY-MM-DD" -> text), persisted in bot_state"""
+        if self.greeting_cache is None:
+            self.greeting_cache = {}
+            if self.db and self.db.connected:
+                try:
+                    self.greeting_cache = dict(self.db.get_state(GREETING_CACHE_STATE_KEY) or {})
+                except Exception as e:
+                    print(f"❌ Error loading greeting cache: {e}")
+        return self.greeting_cache
+
+    def _save_greeting_cache(self):
+        cache = self._load_greeting_cache()
+        # Drop greetings for days that already passed
+        today = datetime.datetime.now(pytz.timezone('Asia/Manila')).date().isoformat()
+        for key in [key for key in cache if key.split(":", 1)[-1] < today]:
+            del cache[key]
+
+        if self.db and self.db.connected:
+            try:
+                self.db.set_state(GREETING_CACHE_STATE_KEY, cache)
+            except Exception as e:
+                print(f"❌ Error saving greeting cache: {e}")
+
+    def _pop_cached_greeting(self, greeting_type, for_date):
+        cache = self._load_greeting_cache()
+        text = cache.pop(f"{greeting_type}:{for_date.isoformat()}", None)
+        if text is None:
+            self.greeting_cache_misses += 1
+            return None
+        self.greeting_cache_hits += 1
+        self._save_greeting_cache()
+        return text
+
+    async def pregenerate_greeting(self, greeting_type, for_date):
+        """Generate and cache the AI greeting for ``for_date`` ahead of time"""
+        if not Config.USE_AI_GREETING:
+            return False
+
+        cache = self._load_greeting_cache()
+        key = f"{greeting_type}:{for_date.isoformat()}"
+        if key in cache:
+            return False
+
+        mentions = GREETING_MENTIONS_PLACEHOLDER if greeting_type == "morning" else ""
+        try:
+            cache[key] = await self._request_ai_greeting(greeting_type, mentions)
+        except Exception as e:
+            print(f"❌ Error pre-generating {greeting_type} greeting: {e}")
+            return False
+
+        self.greetings_pregenerated += 1
+        self._save_greeting_cache()
+        print(f"✅ Pre-generated {greeting_type} greeting for {for_date}")
+        return True
+
+    def get_greeting_cache_stats(self):
+        """Get pre-generated greeting counters for logging/health checks"""
+        return {
+            "cached": sorted(self.greeting_cache or {}),
+            "pregenerated": self.greetings_pregenerated,
+            "hits": self.greeting_cache_hits,
+            "misses": self.greeting_cache_misses,
+        }
+
     @commands.command(name="toggleai")
     @commands.check(lambda ctx: any(role.id in Config.ADMIN_ROLE_IDS for role in ctx.author.roles))
     async def toggle_ai_greeting(self, ctx):
@@ -1677,6 +1875,29 @@ Siguraduhin na ang tono mo ay galit at naiirita."""
 
         await ctx.send(message)
 
+    async def _generate_command_reply(self, ctx, message):
+        """Fetch channel history and get an AI reply for a chat command"""
+        # Get history directly from the database
+        channel_history = []
+        try:
+            # Always use the database directly - no fallback to memory
+            channel_history = self.db.get_conversation_history(ctx.channel.id, Config.MAX_CONTEXT_MESSAGES)
+        except Exception as e:
+            print(f"❌ Error retrieving conversation history: {e}")
+            # Just continue with empty history instead of failing
+            pass
+
+        # Add current message to history for context
+        channel_history.append({"is_user": True, "content": message})
+
+        return await self.get_ai_response(
+            channel_history,
+            channel_id=ctx.channel.id,
+            author_id=ctx.author.id,
+            author_tag=self._format_author_tag(ctx.author),
+            voice_members=self._get_voice_member_names(ctx.author),
+        )
+
     @commands.command(name="usap")
     async def usap(self, ctx, *, message: str):
         """Chat with Ginsilog AI (g!ask command)"""
@@ -1690,31 +1911,22 @@ Siguraduhin na ang tono mo ay galit at naiirita."""
             return
 
         # Add timestamp to rate limiting
-        self.user_message_timestamps[ctx.author.id].append(time.time())
-
-        # Get history directly from the database
-        channel_history = []
-        try:
-            # Always use the database directly - no fallback to memory
-            channel_history = self.db.get_conversation_history(ctx.channel.id, Config.MAX_CONTEXT_MESSAGES)
-        except Exception as e:
-            print(f"❌ Error retrieving conversation history: {e}")
-            # Just continue with empty history instead of failing
-            pass
-
-        # Add current message to history for context
-        channel_history.append({"is_user": True, "content": message})
+        self.record_command_use(ctx.author.id)
 
         # Get AI response with typing indicator
         async with ctx.typing():
             print(f"🧠 Generating AI response for g!usap command: '{message}'")
-            response = await self.get_ai_response(
-                channel_history,
-                channel_id=ctx.channel.id,
-                author_id=ctx.author.id,
-                author_tag=self._format_author_tag(ctx.author),
-                voice_members=self._get_voice_member_names(ctx.author),
+            response, shared = await self.ai_coalescer.run(
+                self.ai_coalescer.make_key("usap", ctx.channel.id, ctx.author.id, message),
+                lambda: self._generate_command_reply(ctx, message),
             )
+            if shared == SHARED_RECENT:
+                print(f"♻️ Repeating recent answer for duplicate g!usap from {ctx.author.name}")
+                await ctx.reply(response, mention_author=False)
+                return
+            if shared:
+                print(f"♻️ Coalesced duplicate g!usap from {ctx.author.name}")
+                return
             print(f"✅ AI response generated for g!usap: '{response[:50]}...'")
 
             self.add_to_conversation(ctx.channel.id, True, message)
@@ -1734,30 +1946,20 @@ Siguraduhin na ang tono mo ay galit at naiirita."""
             return
 
         # Add timestamp to rate limiting
-        self.user_message_timestamps[ctx.author.id].append(time.time())
-
-        # Get history directly from the database
-        channel_history = []
-        try:
-            # Always use the database directly - no fallback to memory
-            channel_history = self.db.get_conversation_history(ctx.channel.id, Config.MAX_CONTEXT_MESSAGES)
-        except Exception as e:
-            print(f"❌ Error retrieving conversation history: {e}")
-            # Just continue with empty history instead of failing
-            pass
-
-        # Add current message to history for context
-        channel_history.append({"is_user": True, "content": message})
+        self.record_command_use(ctx.author.id)
 
         # Get AI response with typing indicator
         async with ctx.typing():
-            response = await self.get_ai_response(
-                channel_history,
-                channel_id=ctx.channel.id,
-                author_id=ctx.author.id,
-                author_tag=self._format_author_tag(ctx.author),
-                voice_members=self._get_voice_member_names(ctx.author),
+            response, shared = await self.ai_coalescer.run(
+                self.ai_coalescer.make_key("asklog", ctx.channel.id, ctx.author.id, message),
+                lambda: self._generate_command_reply(ctx, message),
             )
+            if shared == SHARED_RECENT:
+                # Already answered and logged moments ago
+                await ctx.reply(response, mention_author=False)
+                return
+            if shared:
+                return
             self.add_to_conversation(ctx.channel.id, True, message)
             self.add_to_conversation(ctx.channel.id, False, response)
 
@@ -1780,7 +1982,7 @@ Siguraduhin na ang tono mo ay galit at naiirita."""
             self.db.clear_conversation_history(ctx.channel.id)
 
         # Always clear from memory
-        self.conversation_history[ctx.channel.id].clear()
+        self.conversation_history.pop(ctx.channel.id)
 
         # Create polite embed for clearing history with blue left border (Discohook style)
         clear_embed = discord.Embed(
@@ -2373,6 +2575,8 @@ Siguraduhin na ang tono mo ay galit at naiirita."""
                 "Ipakita ang lahat ng commands (ito mismo)",
                 "g!roles [role_id] [emoji]":
                 "Tignan at palitan ang role-emoji mappings + auto-update lahat ng nicknames",
+                "g!nickplan [role_id]":
+                "Dry run: ipakita kung aling nicknames ang babaguhin (walang binabago)",
                 "g!ask <message>":
                 "Voice-only AI response (console log only)",
                 "g!asklog <message>":
@@ -2569,6 +2773,8 @@ Siguraduhin na ang tono mo ay galit at naiirita."""
             "Ipakita ang master list ng lahat ng commands",
             "g!roles [role_id] [emoji]":
             "Tignan at palitan ang role-emoji mappings + auto-update lahat ng nicknames",
+            "g!nickplan [role_id]":
+            "Dry run: ipakita kung aling nicknames ang babaguhin (walang binabago)",
             "g!ask <message>":
             "Voice-only AI response (console log only, walang Discord log)",
             "g!asklog <message>":
@@ -2593,7 +2799,7 @@ Siguraduhin na ang tono mo ay galit at naiirita."""
         }
 
         # Group commands by type for better organization
-        mod_tools = ["g!sagad", "g!bawas", "g!clear_messages", "g!roles"]
+        mod_tools = ["g!sagad", "g!bawas", "g!clear_messages", "g!roles", "g!nickplan"]
         message_tools = [
             "g!g", "g!goodmorning", "g!tulog", "g!test", "g!announcement"
         ]
@@ -2685,7 +2891,9 @@ Siguraduhin na ang tono mo ay galit at naiirita."""
                 limit=500):  # Check last 500 messages
             if message.author.id == self.bot.user.id:  # Only delete bot's own messages
                 try:
-                    await message.delete()
+                    await self.mutations.submit(
+                        "message", message.delete, bucket=message.channel.id, priority=PRIORITY_NORMAL
+                    )
                     deleted_count += 1
                     # Update status message every 10 deletions
                     if deleted_count % 10 == 0:
@@ -2696,9 +2904,6 @@ Siguraduhin na ang tono mo ay galit at naiirita."""
                 except Exception as e:
                     print(f"Error deleting message: {e}")
 
-                # Add a small delay to avoid rate limits
-                await asyncio.sleep(0.7)
-
         # Final confirmation
         await status_message.edit(
             content=
@@ -3015,43 +3220,110 @@ Siguraduhin na ang tono mo ay galit at naiirita."""
             print(f"❌ Error updating bot status: {e}")
 
     # Auto unmute users after a timeout for violations
-    async def auto_unmute_user(self, user_id, seconds):
-        """Automatically unmute a user after specified seconds"""
+    async def _run_unmute_action(self, payload):
+        """
+        Scheduled action: unmute a user whose violation mute expired
+
+        Unmute errors propagate so the scheduler keeps the action and retries it.
+        """
+        user_id = int(payload["user_id"])
+        seconds = payload.get("seconds", 60)
+        # After a restart muted_users is empty, so go by the persisted guild id
+        guild = self.bot.get_guild(int(payload["guild_id"]))
+        if not guild:
+            return
+        # Get the member from the guild
+        member = guild.get_member(user_id)
+        if not member:
+            print(f"❌ Could not find member with ID {user_id} for auto-unmute")
+            return
+
+        # Unmute the user (replaces a mute that's still queued)
+        await self.mutations.submit(
+            "member", member.edit, mute=False, bucket=guild.id,
+            priority=PRIORITY_MODERATION, key=("mute", user_id),
+        )
+
+        # Try to send a DM to inform them
         try:
-            # Wait for the specified time
-            await asyncio.sleep(seconds)
+            dm_embed = discord.Embed(
+                title="🔊 SERVER MUTE EXPIRED",
+                description="You have been automatically unmuted after your timeout period.",
+                color=Config.EMBED_COLOR_PRIMARY
+            )
 
-            # Check if the user is still in the muted list
-            if user_id in self.muted_users:
-                guild = self.muted_users[user_id]["guild"]
+            dm_channel = await member.create_dm()
+            await dm_channel.send(embed=dm_embed)
+        except Exception as e:
+            print(f"❌ Error sending unmute DM to user: {e}")
+
+        # Remove from muted users dictionary
+        self.muted_users.pop(user_id, None)
+        print(f"✅ Auto-unmuted user {user_id} after {seconds} seconds")
+
+    def _word_actions_for_guild(self, guild_id):
+        """Effective banned words for a guild: the defaults plus its add/remove overrides"""
+        word_actions = dict(Config.DEFAULT_WORD_ACTIONS)
+        for word, action in self.banned_word_overrides.get(guild_id, {}).items():
+            if action is None:
+                word_actions.pop(word, None)
+            else:
+                word_actions[word] = action
+        return word_actions
 
-                # Get the member from the guild
-                member = guild.get_member(user_id)
-                if member:
-                    # Unmute the user
-                    await member.edit(mute=False)
+    def _rebuild_profanity_matcher(self, guild_id):
+        if self.banned_word_overrides.get(guild_id):
+            self.profanity_matchers[guild_id] = ProfanityMatcher(self._word_actions_for_guild(guild_id))
+        else:
+            # Unconfigured guilds share the default matcher
+            self.profanity_matchers.pop(guild_id, None)
+
+    async def _sync_banned_words(self):
+        """Reload matchers for guilds whose banned words changed (on this or any other instance)"""
+        versions = await asyncio.to_thread(self.db.get_banned_words_versions)
+        changed = [guild_id for guild_id, version in versions.items() if self.banned_words_versions.get(guild_id) != version]
+        removed = [guild_id for guild_id in self.banned_words_versions if guild_id not in versions]
+        if not changed and not removed:
+            return 0
+
+        overrides = await asyncio.to_thread(self.db.get_banned_words) if changed else {}
+        for guild_id in changed:
+            self.banned_word_overrides[guild_id] = overrides.get(guild_id, {})
+            self._rebuild_profanity_matcher(guild_id)
+        for guild_id in removed:
+            self.banned_word_overrides.pop(guild_id, None)
+            self._rebuild_profanity_matcher(guild_id)
+
+        self.banned_words_versions = versions
+        return len(changed) + len(removed)
+
+    async def _regular_banned_words_sync(self):
+        """Background task that loads banned words at startup, then polls for changes"""
+        await self.bot.wait_until_ready()
 
-                    # Try to send a DM to inform them
-                    try:
-                        dm_embed = discord.Embed(
-                            title="🔊 SERVER MUTE EXPIRED",
-                            description="You have been automatically unmuted after your timeout period.",
-                            color=Config.EMBED_COLOR_PRIMARY
-                        )
+        while not self.bot.is_closed():
+            try:
+                if self.db and self.db.connected:
+                    updated = await self._sync_banned_words()
+                    if updated:
+                        print(f"🔄 Reloaded banned words for {updated} guild(s)")
+            except Exception as e:
+                print(f"❌ Error syncing banned words: {e}")
 
-                        dm_channel = await member.create_dm()
-                        await dm_channel.send(embed=dm_embed)
-                    except Exception as e:
-                        print(f"❌ Error sending unmute DM to user: {e}")
+            await asyncio.sleep(Config.BANNED_WORDS_SYNC_SECONDS)
 
-                    # Remove from muted users dictionary
-                    del self.muted_users[user_id]
-                    print(f"✅ Auto-unmuted user {user_id} after {seconds} seconds")
-                else:
-                    print(f"❌ Could not find member with ID {user_id} for auto-unmute")
+    async def _save_banned_word(self, guild_id, word, action):
+        """Apply a set_words change locally right away and persist it for other instances"""
+        self.banned_word_overrides.setdefault(guild_id, {})[word] = action
+        self._rebuild_profanity_matcher(guild_id)
 
-        except Exception as e:
-            print(f"❌ Error in auto_unmute_user: {e}")
+        if self.db and self.db.connected:
+            try:
+                await asyncio.to_thread(self.db.set_banned_word, guild_id, word, action)
+                return True
+            except Exception as e:
+                print(f"❌ Error saving banned word: {e}")
+        return False
 
     @commands.command(name="set_words")
     @commands.has_permissions(administrator=True)
@@ -3068,21 +3340,12 @@ Siguraduhin na ang tono mo ay galit at naiirita."""
         g!set_words add racial_slur both
         g!set_words add spam disconnect
         """
-        # Create word_actions dictionary if it doesn't exist
-        if not hasattr(self, 'word_actions'):
-            self.word_actions = {
-                # Default word actions
-                "nigga": "both",      # Mute and disconnect
-                "chingchong": "both", # Mute and disconnect
-                "bading": "mute",     # Mute only 
-                "tanga": "mute",      # Mute only
-                "bobo": "mute"        # Mute only
-            }
+        guild_id = ctx.guild.id if ctx.guild else None
+        word_actions = self._word_actions_for_guild(guild_id)
 
         # List command shows all banned words
         if action == "list":
-            # Get all words from both lists
-            all_words = list(self.word_actions.keys()) + [w for w in self.custom_banned_words if w not in self.word_actions]
+            all_words = list(word_actions)
 
             embed = discord.Embed(
                 title="📝 BANNED WORDS LIST - SLASH STYLE",
@@ -3096,7 +3359,7 @@ Siguraduhin na ang tono mo ay galit at naiirita."""
             both_words = []
 
             for word in all_words:
-                action_type = self.word_actions.get(word, "mute")  # Default to mute if not specified
+                action_type = word_actions.get(word, "mute")  # Default to mute if not specified
 
                 if action_type == "mute":
                     mute_words.append(word)
@@ -3151,15 +3414,13 @@ Siguraduhin na ang tono mo ay galit at naiirita."""
                     return
 
             # Check if already exists
-            if word in self.word_actions:
-                await ctx.send(f"⚠️ The word `{word}` is already in the banned words list with action `{self.word_actions[word]}`.")
+            if word in word_actions:
+                await ctx.send(f"⚠️ The word `{word}` is already in the banned words list with action `{word_actions[word]}`.")
                 await ctx.send(f"To change the action, remove it first then add it again with the new action.")
                 return
 
-            # Add to custom list and set action
-            if word not in self.custom_banned_words:
-                self.custom_banned_words.append(word)
-            self.word_actions[word] = action_type
+            # Save for this guild and recompile its matcher
+            saved = await self._save_banned_word(guild_id, word, action_type)
 
             # Success message
             action_msg = {
@@ -3170,30 +3431,30 @@ Siguraduhin na ang tono mo ay galit at naiirita."""
 
             await ctx.send(f"✅ Added `{word}` to the banned words list with action: `{action_type}`\n"
                           f"Users who use this word will be {action_msg[action_type]}.")
+            if not saved:
+                await ctx.send("⚠️ Database unavailable - this change will be lost on restart.")
 
         elif action == "remove" and parameters:
             # Get word from parameters
             word = parameters.strip().lower()
 
             # Check if word is in default words but allow removal
-            is_default = word in ["nigga", "chingchong", "bading", "tanga", "bobo"]
+            is_default = word in Config.DEFAULT_WORD_ACTIONS
 
             # Check if word exists in any list
-            if word not in self.word_actions and word not in self.custom_banned_words:
+            if word not in word_actions:
                 await ctx.send(f"⚠️ The word `{word}` is not in any banned words list.")
                 return
 
-            # Remove from appropriate lists
-            if word in self.custom_banned_words:
-                self.custom_banned_words.remove(word)
-
-            if word in self.word_actions:
-                del self.word_actions[word]
+            # Remove for this guild (kept as an override so defaults stay removed)
+            saved = await self._save_banned_word(guild_id, word, None)
 
             # Success message with warning if default
             msg = f"✅ Removed `{word}` from the banned words list."
             if is_default:
                 msg += "\n⚠️ Note: This was a default banned word, but it has been removed as requested."
+            if not saved:
+                msg += "\n⚠️ Database unavailable - this change will be lost on restart."
 
             await ctx.send(msg)
 
@@ -3232,162 +3493,131 @@ Siguraduhin na ang tono mo ay galit at naiirita."""
 
             await ctx.send(embed=embed)
 
-    async def _regular_nickname_scan(self):
-        """Automatically scan and update all nicknames every few seconds"""
-        await self.bot.wait_until_ready()
+    def _desired_nickname(self, display_name, role_ids):
+        """Server-format nickname for a display name and roles (highest role first)"""
+        return self._nickname_planner().desired(display_name, role_ids)
 
-        # Now that bot is ready, set the task if it wasn't set in __init__
-        if self.nickname_update_task is None:
-            self.nickname_update_task = asyncio.current_task()
+    def _manages_nickname(self, member):
+        """Whether the nickname reconciler should touch this member"""
+        if member.bot and (member.id == self.bot.user.id or member.id in Config.BOTS_TO_IGNORE):
+            return False
+        return True
 
-        while not self.bot.is_closed() and self.nickname_scanning_active:
-            try:
-                # Print a debug message before scanning
-                print(f"🔍 Running automatic nickname scan to find any users with incorrect nicknames...")
+    async def _apply_nickname(self, member, new_name):
+        """Reconciler callback: edit a nickname, or suggest it to members we can't edit"""
+        # The owner gets a DM from on_member_update when they rename themselves
+        if member.id == member.guild.owner_id:
+            return False
 
-                for guild in self.bot.guilds:
-                    # Use the dynamic role-emoji mappings that includes admin updates
-                    role_emoji_map = self.role_emoji_mappings
-                    role_names = Config.ROLE_NAMES
-
-                    # Ensure role_emoji_map is in sync with Config.ROLE_EMOJI_MAP
-                    if role_emoji_map != Config.ROLE_EMOJI_MAP:
-                        print(f"⚠️ Role emoji mappings out of sync during scan, syncing...")
-                        # Update both directions to ensure they're in sync
-                        role_emoji_map = Config.ROLE_EMOJI_MAP.copy()
-                        self.role_emoji_mappings = role_emoji_map.copy()
-
-                    # Bots to ignore in our server (these should never be renamed)
-                    BOTS_TO_IGNORE = [
-                        self.bot.user.id,  # Our own bot
-                    ] + Config.BOTS_TO_IGNORE
-
-                    # Helper function to convert text to Unicode bold style
-                    def to_unicode_bold(text):
-                        return ''.join(Config.UNICODE_MAP.get(c, c) for c in text)
-
-                    # Initialize counters (only for internal tracking, not for console output)
-                    updated_count = 0
-                    skipped_count = 0
-                    failed_count = 0
-
-                    for member in guild.members:
-                        # Skip bots that are in our ignore list
-                        if member.bot and member.id in BOTS_TO_IGNORE:
-                            skipped_count += 1
-                            continue
-
-                        # Get member's roles sorted by position (highest first)
-                        member_roles = sorted(member.roles, key=lambda r: r.position, reverse=True)
-
-                        # Skip users with higher roles than the bot (like server owner)
-                        # Special override feature - we'll try to change the name anyway
-                        # FORCE EDIT EVERYONE - even server owner and admin users
-                        bot_member = guild.get_member(self.bot.user.id)
-                        if bot_member and member.top_role >= bot_member.top_role and not member.bot:
-                            try:
-                                # Get the highest role they should have emoji for
-                                highest_emoji = None
-                                highest_role_name = None
-                                for role in member_roles:
-                                    if role.id in role_emoji_map:
-                                        highest_emoji = role_emoji_map[role.id]
-                                        highest_role_name = role_names[role.id]
-                                        break
-
-                                if highest_emoji:
-                                    # Clean name of emojis
-                                    clean_name = member.display_name
-                                    # Special case for cloud emoji (both variants)
-                                    clean_name = clean_name.replace("☁️", "").replace("☁", "")
-                                    # Handle all other emojis from the role map
-                                    for emoji_value in role_emoji_map.values():
-                                        while emoji_value in clean_name:
-                                            clean_name = clean_name.replace(emoji_value, '')
-                                    clean_name = clean_name.strip()
-
-                                    # Unicode conversion
-                                    formatted_name = to_unicode_bold(clean_name)
-                                    suggested_name = f"{formatted_name} {highest_emoji}"
-
-                                    # Check if we should send a DM to the high-role user (once per day max)
-                                    high_role_key = f"high_role_dm_{member.id}"
-                                    if high_role_key not in self.user_message_timestamps or time.time() - self.user_message_timestamps.get(high_role_key, 0) > 86400:
-                                        try:
-                                            # We'll try to DM them with the suggested name
-                                            dm_embed = discord.Embed(
-                                                title="🏆 Nickname Format Suggestion",
-                                                description=f"Hi {member.name},\n\nYour current nickname is **{member.display_name}**.\n\nAs a high-role member of the server, I can't automatically update your nickname. If you'd like to match the server format, please consider updating your nickname to:\n\n**{suggested_name}**\n\nThis matches your {highest_role_name} role with the {highest_emoji} emoji.",
-                                                color=0x5865F2
-                                            )
-                                            await member.send(embed=dm_embed)
-                                            self.user_message_timestamps[high_role_key] = time.time()
-                                        except Exception:
-                                            pass
-                            except Exception:
-                                pass
-
-                            # Special handling for server owner
-                            if member.id == member.guild.owner_id:
-                                # Silent processing for server owner in automatic scans
-                                # No console output, no DMs in regular automatic scanning
-                                pass
-
-                            # We'll continue with the normal process instead of skipping
-
-                        # Get member's roles sorted by position (highest first)
-                        member_roles = sorted(member.roles, key=lambda r: r.position, reverse=True)
-
-                        # Find the highest role that's in our mapping
-                        highest_matched_role_id = None
-                        for role in member_roles:
-                            if role.id in role_emoji_map:
-                                highest_matched_role_id = role.id
-                                break
-
-                        # If no matching role found, use default (no emoji)
-                        # We'll still convert their name to Unicode bold style
-                        if not highest_matched_role_id:
-                            # Use a default format with no emoji for @everyone
-                            emoji = ""  # No emoji for default users
-                            role_name = "@everyone"
-                        else:
-                            # Get the emoji for this role
-                            emoji = role_emoji_map[highest_matched_role_id]
-                            role_name = role_names[highest_matched_role_id]
+        # Members with a role at or above ours can't be edited, suggest the name instead
+        bot_member = member.guild.me
+        if bot_member and member.top_role >= bot_member.top_role and not member.bot:
+            await self._suggest_high_role_nickname(member, new_name)
+            return False
 
-                        # Format the name
-                        original_name = member.display_name
+        original_name = member.display_name
+        try:
+            await self.mutations.submit(
+                "member", member.edit, nick=new_name, bucket=member.guild.id,
+                priority=PRIORITY_COSMETIC, key=("nick", member.id),
+            )
+        except discord.Forbidden:
+            return False
+        self.nickname_update_times[member.id] = time.time()
+        print(f"✅ Auto-updated nickname for {member.name}: {original_name} → {new_name}")
+        return True
 
-                        # Clean the name only removing trailing emoji using centralized function
-                        clean_name = self.clean_name_of_emojis(original_name, role_emoji_map)
+    async def _suggest_high_role_nickname(self, member, suggested_name):
+        """DM a high-role member the server-format nickname (at most once per day)"""
+        # Entries expire after STATE_NICKNAME_TTL_SECONDS (a day by default)
+        if member.id in self.high_role_dm_times:
+            return
 
-                        # Convert to Unicode bold style
-                        formatted_name = to_unicode_bold(clean_name)
+        highest_role = next(
+            (role for role in sorted(member.roles, key=lambda r: r.position, reverse=True)
+             if role.id in self.role_emoji_mappings),
+            None,
+        )
+        if highest_role is None:
+            return
+        highest_emoji = self.role_emoji_mappings[highest_role.id]
+        highest_role_name = Config.ROLE_NAMES.get(highest_role.id, highest_role.name)
 
-                        # Add the role emoji
-                        new_name = f"{formatted_name} {emoji}"
+        try:
+            # We'll try to DM them with the suggested name
+            dm_embed = discord.Embed(
+                title="🏆 Nickname Format Suggestion",
+                description=f"Hi {member.name},\n\nYour current nickname is **{member.display_name}**.\n\nAs a high-role member of the server, I can't automatically update your nickname. If you'd like to match the server format, please consider updating your nickname to:\n\n**{suggested_name}**\n\nThis matches your {highest_role_name} role with the {highest_emoji} emoji.",
+                color=0x5865F2
+            )
+            await member.send(embed=dm_embed)
+        except Exception:
+            pass
+        # Remember failed DMs too so closed DMs aren't retried every sweep
+        self.high_role_dm_times[member.id] = time.time()
 
-                        # Skip if the name is already correctly formatted
-                        if member.display_name == new_name:
-                            skipped_count += 1
-                            continue
+    def _plan_nickname_edits(self, members, only_role_id=None):
+        """
+        Work out which members need a nickname edit (see NicknamePlanner.plan)
 
-                        # Update the name
-                        try:
-                            await member.edit(nick=new_name)
-                            updated_count += 1
-                            # Very small delay to avoid rate limits but still be responsive
-                            await asyncio.sleep(0.1)
-                        except Exception:
-                            failed_count += 1
+        Args:
+            only_role_id: only members whose top mapped role is this one
+
+        Returns:
+            tuple: ([(member, new_name), ...], skipped_count, (owner, new_name) or None)
+        """
+        members_by_id = {member.id: member for member in members}
+        edits, skipped = self._nickname_planner().plan(
+            (MemberSnapshot.from_member(member) for member in members_by_id.values()),
+            only_role_id=only_role_id,
+        )
+
+        plans = []
+        owner_plan = None
+        for edit in edits:
+            member = members_by_id[edit.member_id]
+            # The owner can't be edited; callers may suggest the name instead
+            if edit.is_owner:
+                owner_plan = (member, edit.new)
+                skipped += 1
+                continue
+            plans.append((member, edit.new))
+        return plans, skipped, owner_plan
+
+    async def _rewrite_nicknames(self, plans, status_message, status_embed):
+        """
+        Submit planned nickname edits through the mutation queue, refreshing the
+        progress embed every NICKNAME_PROGRESS_SECONDS instead of per member
+
+        Returns:
+            tuple: (updated_count, failed_count)
+        """
+        futures = [
+            self.mutations.submit(
+                "member", member.edit, nick=new_name, bucket=member.guild.id,
+                priority=PRIORITY_COSMETIC, key=("nick", member.id),
+            )
+            for member, new_name in plans
+        ]
+
+        updated_count = 0
+        failed_count = 0
+        last_progress = time.monotonic()
+        for future in asyncio.as_completed(futures):
+            try:
+                await future
+                updated_count += 1
             except Exception:
-                pass
+                failed_count += 1
 
-            # Wait for much longer between scans to avoid excessive updates
-            # 60 seconds (1 minute) between scans is more appropriate for production
-            print(f"✓ Automatic nickname scan complete. Next scan in 60 seconds...")
-            await asyncio.sleep(60)  # 60 seconds between scans
+            if time.monotonic() - last_progress >= Config.NICKNAME_PROGRESS_SECONDS:
+                last_progress = time.monotonic()
+                status_embed.description = f"Processing... ({updated_count + failed_count}/{len(plans)})\n\nUpdated: {updated_count}\nFailed: {failed_count}"
+                try:
+                    await status_message.edit(embed=status_embed)
+                except Exception:
+                    pass
+        return updated_count, failed_count
 
     @commands.command(name="roles")
     # We'll handle permission check inside the function for better error messages
@@ -3483,102 +3713,29 @@ Siguraduhin na ang tono mo ay galit at naiirita."""
         # Update Config.ROLE_EMOJI_MAP with our updated mapping
         # This ensures the changes persist even if we restart
         Config.ROLE_EMOJI_MAP = self.role_emoji_mappings.copy()
+        # Keep stripping the replaced emoji so "Name 🌿" doesn't become "Name 🌿 🔥"
+        if old_emoji != "None" and old_emoji not in self.role_emoji_mappings.values():
+            self.retired_role_emojis.add(old_emoji)
+        self.nickname_planner = None
+        # The affected members are rewritten below, no need for a full sweep
+        self.nickname_reconciler.role_map_changed(sweep=False)
 
         # Print debug info to confirm that both variables are synchronized
         print(f"Role emoji mappings updated:")
         print(f"Self.role_emoji_mappings: {self.role_emoji_mappings}")
         print(f"Config.ROLE_EMOJI_MAP: {Config.ROLE_EMOJI_MAP}")
 
-        # Now automatically run the nickname update process
-        # First send a status message
+        # Only members whose top mapped role is this one get a new emoji
+        plans, skipped_count, _ = self._plan_nickname_edits(role.members, only_role_id=role_id)
+
         status_embed = discord.Embed(
             title="🔄 Updating Nicknames...",
-            description="Formatting member names with new emoji mapping...",
+            description=f"Formatting {len(plans)} member name(s) with the new emoji mapping...",
             color=Config.EMBED_COLOR_PRIMARY
         )
         status_message = await ctx.send(embed=status_embed)
 
-        # Use the same logic as in setupnn but simplified for automatic updates
-        role_emoji_map = self.role_emoji_mappings
-        role_names = Config.ROLE_NAMES
-
-        # Function to convert text to Unicode bold style
-        def to_unicode_bold(text):
-            return ''.join(Config.UNICODE_MAP.get(c, c) for c in text)
-
-        # Counters for stats
-        updated_count = 0
-        failed_count = 0
-        skipped_count = 0
-
-        # Process members
-        members = ctx.guild.members
-        total_members = len(members)
-
-        for i, member in enumerate(members):
-            # Skip bots
-            if member.bot:
-                skipped_count += 1
-                continue
-
-            # Get member's roles sorted by position (highest first)
-            member_roles = sorted(member.roles, key=lambda r: r.position, reverse=True)
-
-            # Find the highest role that's in our mapping
-            highest_matched_role_id = None
-            for role in member_roles:
-                if role.id in role_emoji_map:
-                    highest_matched_role_id = role.id
-                    break
-
-            # If no matching role found, use default (no emoji)
-            if not highest_matched_role_id:
-                emoji_suffix = ""  # No emoji for default users
-                role_name = "@everyone"
-            else:
-                emoji_suffix = role_emoji_map[highest_matched_role_id]
-                role_name = role_names.get(highest_matched_role_id, "Role")
-
-            # Format the name
-            original_name = member.display_name
-
-            # Clean the name only removing trailing emoji using centralized function
-            clean_name = self.clean_name_of_emojis(original_name, role_emoji_map)
-
-            # Convert to Unicode bold style
-            formatted_name = to_unicode_bold(clean_name)
-
-            # Add the role emoji
-            new_name = f"{formatted_name} {emoji_suffix}"
-
-            # Skip if the name is already correctly formatted
-            if member.display_name == new_name:
-                skipped_count += 1
-                continue
-
-            # Update the name
-            try:
-                # Special handling for server owner
-                if member.id == member.guild.owner_id:
-                    # Skip auto-updating the owner in the automatic process
-                    # They will be notified when they manually change their name
-                    skipped_count += 1
-                    continue
-
-                # For regular members
-                await member.edit(nick=new_name)
-                updated_count += 1
-
-                # Update status every 5 members
-                if i % 5 == 0:
-                    status_embed.description = f"Processing... ({i+1}/{total_members})\n\nUpdated: {updated_count}\nSkipped: {skipped_count}\nFailed: {failed_count}"
-                    await status_message.edit(embed=status_embed)
-
-            except Exception:
-                failed_count += 1
-
-            # Small delay to avoid rate limits
-            await asyncio.sleep(0.5)
+        updated_count, failed_count = await self._rewrite_nicknames(plans, status_message, status_embed)
 
         # Final status update
         status_embed.title = "✅ 𝐍𝐈𝐂𝐊𝐍𝐀𝐌𝐄 𝐔𝐏𝐃𝐀𝐓𝐄 𝐂𝐎𝐌𝐏𝐋𝐄𝐓𝐄"
@@ -3601,14 +3758,6 @@ Siguraduhin na ang tono mo ay galit at naiirita."""
             )
             return await ctx.send(embed=error_embed)
 
-        # Use the dynamic role-emoji mappings (which includes any updates from g!roles command)
-        role_emoji_map = self.role_emoji_mappings
-        role_names = Config.ROLE_NAMES
-
-        # Function to convert text to Unicode bold style
-        def to_unicode_bold(text):
-            return ''.join(Config.UNICODE_MAP.get(c, c) for c in text)
-
         # Status message and counter
         status_embed = discord.Embed(
             title="👑 𝐒𝐄𝐓𝐔𝐏𝐍𝐍 - 𝐍𝐀𝐌𝐄 𝐅𝐎𝐑𝐌𝐀𝐓𝐓𝐈𝐍𝐆 👑",
@@ -3617,106 +3766,32 @@ Siguraduhin na ang tono mo ay galit at naiirita."""
         )
         status_message = await ctx.send(embed=status_embed)
 
-        # Counters for stats
-        updated_count = 0
-        failed_count = 0
-        skipped_count = 0
-
-        # Process members
-        members = ctx.guild.members
-        total_members = len(members)
-
-        for i, member in enumerate(members):
-            # Skip bots
-            if member.bot:
-                skipped_count += 1
-                continue
-
-            # Get member's roles sorted by position (highest first)
-            member_roles = sorted(member.roles, key=lambda r: r.position, reverse=True)
-
-            # Find the highest role that's in our mapping
-            highest_matched_role_id = None
-            for role in member_roles:
-                if role.id in role_emoji_map:
-                    highest_matched_role_id = role.id
-                    break
-
-            # If no matching role found, use default (no emoji)
-            # We'll still convert their name to Unicode bold style
-            if not highest_matched_role_id:
-                # Use a default format with no emoji for @everyone
-                emoji = ""  # No emoji for default users
-                role_name = "@everyone"
-            else:
-                # Get the emoji for this role
-                emoji = role_emoji_map[highest_matched_role_id]
-                role_name = role_names[highest_matched_role_id]
-
-            # Format the name
-            original_name = member.display_name
-
-            # Clean the name only removing trailing emoji using centralized function
-            clean_name = self.clean_name_of_emojis(original_name, role_emoji_map)
-
-            # Convert to Unicode bold style
-            formatted_name = to_unicode_bold(clean_name)
-
-            # Add the role emoji
-            new_name = f"{formatted_name} {emoji}"
-
-            # Skip if the name is already correctly formatted
-            if member.display_name == new_name:
-                skipped_count += 1
-                continue
-
-            # Update the name
+        # Only members whose name is out of format get an edit
+        plans, skipped_count, owner_plan = self._plan_nickname_edits(ctx.guild.members)
+
+        # Special handling for server owner in setupnn command
+        if owner_plan:
+            owner, new_name = owner_plan
+            emoji = new_name.rsplit(" ", 1)[-1]
+            owner_embed = discord.Embed(
+                title="👑 Server Owner Nickname Format",
+                description=f"Hello Server Owner!\n\nYour current nickname is **{owner.display_name}**.\n\nDue to Discord's permissions, I can't change your nickname automatically. If you'd like to match the server format, please consider updating your nickname to:\n\n**{new_name}**\n\nThis matches your Owner role status with the {emoji} emoji.",
+                color=0xFFD700  # Gold color for owner
+            )
             try:
-                # Special handling for server owner in setupnn command
-                if member.id == member.guild.owner_id:
-                    # Debug output removed
+                await owner.send(embed=owner_embed)
 
-                    # Get current nickname for more specific message
-                    current_nickname = member.display_name
-
-                    owner_embed = discord.Embed(
-                        title="👑 Server Owner Nickname Format",
-                        description=f"Hello Server Owner!\n\nYour current nickname is **{current_nickname}**.\n\nDue to Discord's permissions, I can't change your nickname automatically. If you'd like to match the server format, please consider updating your nickname to:\n\n**{new_name}**\n\nThis matches your Owner role status with the {emoji} emoji.",
-                        color=0xFFD700  # Gold color for owner
-                    )
-                    try:
-                        await member.send(embed=owner_embed)
-                        # Debug output removed
-
-                        # Also notify in the channel
-                        owner_notify = discord.Embed(
-                            title="👑 Server Owner Notification",
-                            description=f"I can't update the server owner's nickname due to Discord permissions. I've sent a DM with the suggested format.",
-                            color=0xFFD700
-                        )
-                        await ctx.send(embed=owner_notify)
-                    except Exception as dm_error:
-                        # Debug output removed
-                        pass
-
-                    # These lines must be at the same indentation level as the try-block
-                    skipped_count += 1  # Count this as skipped since we can't edit it
-                    continue
-
-                # For regular members
-                await member.edit(nick=new_name)
-                updated_count += 1
-                # Update status every 5 members
-                if i % 5 == 0:
-                    status_embed.description = f"Processing... ({i+1}/{total_members})\n\nUpdated: {updated_count}\nSkipped: {skipped_count}\nFailed: {failed_count}"
-                    await status_message.edit(embed=status_embed)
-                # Debug output removed
-            except Exception as e:
-                failed_count += 1
-                # Debug output removed
+                # Also notify in the channel
+                owner_notify = discord.Embed(
+                    title="👑 Server Owner Notification",
+                    description=f"I can't update the server owner's nickname due to Discord permissions. I've sent a DM with the suggested format.",
+                    color=0xFFD700
+                )
+                await ctx.send(embed=owner_notify)
+            except Exception:
+                pass
 
-            # Small delay to avoid rate limits
-            await asyncio.sleep(0.5)
+        updated_count, failed_count = await self._rewrite_nicknames(plans, status_message, status_embed)
 
         # Final status update
         status_embed.title = "✅ 𝐍𝐀𝐌𝐄 𝐅𝐎𝐑𝐌𝐀𝐓𝐓𝐈𝐍𝐆 𝐂𝐎𝐌𝐏𝐋𝐄𝐓𝐄"
@@ -3724,6 +3799,37 @@ Siguraduhin na ang tono mo ay galit at naiirita."""
         status_embed.color = Config.EMBED_COLOR_SUCCESS
         await status_message.edit(embed=status_embed)
 
+    @commands.command(name="nickplan")
+    @commands.check(lambda ctx: any(role.id in Config.ADMIN_ROLE_IDS for role in ctx.author.roles))  # Admin roles check
+    async def nickplan(self, ctx, role_id: int = None):
+        """Dry run: show which nicknames setupnn / g!roles would change (admin only)"""
+        members = ctx.guild.members
+        if role_id is not None:
+            role = ctx.guild.get_role(role_id)
+            if role is None:
+                return await ctx.send(f"**Role `{role_id}` not found!**")
+            members = role.members
+
+        started = time.perf_counter()
+        plans, skipped_count, owner_plan = self._plan_nickname_edits(members, only_role_id=role_id)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        embed = discord.Embed(
+            title="🧪 Nickname Plan (dry run)",
+            description=f"**Members checked:** {len(members)}\n**Would update:** {len(plans)}\n**Skipped:** {skipped_count}\n**Planned in:** {elapsed_ms:.1f}ms\n\nNothing was changed.",
+            color=Config.EMBED_COLOR_PRIMARY
+        )
+        if plans:
+            shown = Config.NICKNAME_PLAN_PREVIEW
+            lines = [f"{member.display_name} → {new_name}" for member, new_name in plans[:shown]]
+            if len(plans) > shown:
+                lines.append(f"...and {len(plans) - shown} more")
+            embed.add_field(name="Edits", value="\n".join(lines)[:1024], inline=False)
+        if owner_plan:
+            owner, new_name = owner_plan
+            embed.add_field(name="Owner (DM only)", value=f"{owner.display_name} → {new_name}", inline=False)
+        await ctx.send(embed=embed)
+
 
 async def setup(bot):
     """Asynchronous setup function for the cog"""
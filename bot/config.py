@@ -2,6 +2,8 @@ import os
 import re
 from dotenv import load_dotenv
 
+from .unicode_transform import BOLD_MAP
+
 # Load environment variables
 load_dotenv()
 
@@ -23,6 +25,16 @@ def _env_int(name: str, default: int) -> int:
         return default
 
 
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
 def _env_csv(name: str, default: list[str]) -> list[str]:
     raw = os.getenv(name)
     if not raw:
@@ -30,10 +42,23 @@ def _env_csv(name: str, default: list[str]) -> list[str]:
     return [item.strip() for item in raw.split(",") if item.strip()]
 
 
+def _env_weights(name: str, default: dict[str, float]) -> dict[str, float]:
+    weights = dict(default)
+    for item in _env_csv(name, []):
+        key, _, value = item.partition(":")
+        try:
+            weights[key.strip()] = float(value)
+        except ValueError:
+            continue
+    return weights
+
+
 # Configuration class
 class Config:
     DISCORD_TOKEN = os.getenv('DISCORD_TOKEN')
     GROQ_API_KEY = os.getenv('GROQ_API_KEY')
+    # Point at scripts/llm_stub_server.py for offline load tests
+    GROQ_BASE_URL = os.getenv('GROQ_BASE_URL', "https://api.groq.com")
     DATABASE_URL = os.getenv('DATABASE_URL')
     PORT = _env_int('PORT', 5000)
     PUBLIC_BASE_URL = (
@@ -67,11 +92,35 @@ class Config:
     GOOD_MORNING_HOUR = 8  # 8:00 AM
     GOOD_NIGHT_HOUR = 22  # 10:00 PM
     USE_AI_GREETING = False  # Set to False to use the original static greetings
+    # AI greetings are pre-generated during these PH hours (or when the next one is close)
+    GREETING_PREGEN_HOURS = [int(hour) for hour in _env_csv('GREETING_PREGEN_HOURS', ['3', '15']) if hour.isdigit()]
+    GREETING_PREGEN_LEAD_HOURS = _env_int('GREETING_PREGEN_LEAD_HOURS', 2)
+
+    # Default banned words and their action (mute, disconnect, both); editable with g!set_words
+    DEFAULT_WORD_ACTIONS = {
+        "nigga": "both",      # Mute and disconnect
+        "chingchong": "both", # Mute and disconnect
+        "bading": "mute",     # Mute only
+        "tanga": "mute",      # Mute only
+        "bobo": "mute"        # Mute only
+    }
+    # How often each instance checks Postgres for banned-word changes made elsewhere
+    BANNED_WORDS_SYNC_SECONDS = _env_int('BANNED_WORDS_SYNC_SECONDS', 30)
+    # Auto TTS channel list is re-read from the DB at most this often (toggles apply immediately)
+    AUTO_TTS_CACHE_SECONDS = _env_int('AUTO_TTS_CACHE_SECONDS', 60)
 
     # Rate limiting settings
     RATE_LIMIT_MESSAGES = 5
     RATE_LIMIT_PERIOD = 60
 
+    # Memory budget for ChatCog's in-memory state (least recently used entries are evicted first)
+    STATE_MAX_CHANNELS = _env_int('STATE_MAX_CHANNELS', 2000)
+    STATE_MAX_USERS = _env_int('STATE_MAX_USERS', 20000)
+    # Channels with no chat activity for this long drop their in-memory history (Postgres keeps it)
+    STATE_CONVERSATION_TTL_SECONDS = _env_int('STATE_CONVERSATION_TTL_SECONDS', 6 * 60 * 60)
+    # How long to remember nickname edits / high-role nickname DMs (DMs are sent at most once per window)
+    STATE_NICKNAME_TTL_SECONDS = _env_int('STATE_NICKNAME_TTL_SECONDS', 24 * 60 * 60)
+
     # Conversation memory settings
     MAX_CONTEXT_MESSAGES = 10  # Increased for better conversation memory and coherence
     MEMORY_REFRESH_EVERY = _env_int('MEMORY_REFRESH_EVERY', 20)
@@ -79,6 +128,65 @@ class Config:
     RECENT_HISTORY_LIMIT = _env_int('RECENT_HISTORY_LIMIT', 8)
     VOICE_REJOIN_DELAY_SECONDS = _env_int('VOICE_REJOIN_DELAY_SECONDS', 3)
 
+    # Voice activity detection (per speaker): RMS must clear ratio x noise floor and MIN_RMS,
+    # hiss-like frames (ZCR above MAX_ZCR) are ignored unless very loud
+    VOICE_VAD_THRESHOLD_RATIO = _env_float('VOICE_VAD_THRESHOLD_RATIO', 3.0)
+    VOICE_VAD_MIN_RMS = _env_int('VOICE_VAD_MIN_RMS', 300)
+    VOICE_VAD_MAX_ZCR = _env_float('VOICE_VAD_MAX_ZCR', 0.25)
+    # Speech needs this many consecutive frames to start, and ends after the hangover
+    VOICE_VAD_ATTACK_FRAMES = _env_int('VOICE_VAD_ATTACK_FRAMES', 2)
+    VOICE_VAD_HANGOVER_MS = _env_int('VOICE_VAD_HANGOVER_MS', 800)
+    # Audio kept from before speech starts, prepended to the utterance
+    VOICE_VAD_PREROLL_MS = _env_int('VOICE_VAD_PREROLL_MS', 300)
+    VOICE_MAX_UTTERANCE_SECONDS = _env_int('VOICE_MAX_UTTERANCE_SECONDS', 30)
+    # Utterances are uploaded as 16 kHz mono 'flac' (via ffmpeg) or 'wav'
+    VOICE_STT_FORMAT = os.getenv('VOICE_STT_FORMAT', 'flac').strip().lower()
+    # Utterances waiting for transcription: bounded per guild (oldest dropped when full),
+    # shared worker pool, at most N in flight per guild (1 keeps replies in order)
+    VOICE_QUEUE_MAX_PER_GUILD = _env_int('VOICE_QUEUE_MAX_PER_GUILD', 6)
+    VOICE_STT_WORKERS = _env_int('VOICE_STT_WORKERS', 3)
+    VOICE_STT_PER_GUILD_CONCURRENCY = _env_int('VOICE_STT_PER_GUILD_CONCURRENCY', 1)
+    # Optional local keyword gate (pocketsphinx): only utterances with a wake word, or
+    # follow-ups within the wake window, are uploaded; short stop-word utterances stop locally.
+    # Phrases must be in the pocketsphinx English dictionary (others are skipped with a warning).
+    VOICE_KEYWORD_GATE = _env_bool('VOICE_KEYWORD_GATE', False)
+    VOICE_WAKE_WORDS = _env_csv('VOICE_WAKE_WORDS', ['bot', 'gnslg'])
+    VOICE_STOP_WORDS = _env_csv('VOICE_STOP_WORDS', ['stop', 'cancel', 'hinto', 'tigil', 'tama na'])
+    VOICE_WAKE_WINDOW_SECONDS = _env_float('VOICE_WAKE_WINDOW_SECONDS', 20.0)
+    VOICE_KWS_THRESHOLD = _env_float('VOICE_KWS_THRESHOLD', 1e-20)
+    # Whisper transcript gate (verbose_json segment scores), checked before any LLM call
+    VOICE_MIN_AVG_LOGPROB = _env_float('VOICE_MIN_AVG_LOGPROB', -1.5)
+    VOICE_MAX_NO_SPEECH_PROB = _env_float('VOICE_MAX_NO_SPEECH_PROB', 0.6)
+    VOICE_MAX_COMPRESSION_RATIO = _env_float('VOICE_MAX_COMPRESSION_RATIO', 2.4)
+    # STT backends: Groq Whisper first, offline pocketsphinx when Groq is rate limited, slow or failing
+    VOICE_STT_OFFLINE_FALLBACK = _env_bool('VOICE_STT_OFFLINE_FALLBACK', True)
+    VOICE_STT_TIMEOUT_SECONDS = _env_float('VOICE_STT_TIMEOUT_SECONDS', 15.0)
+    VOICE_STT_BREAKER_FAILURES = _env_int('VOICE_STT_BREAKER_FAILURES', 3)
+    VOICE_STT_BREAKER_RESET_SECONDS = _env_int('VOICE_STT_BREAKER_RESET_SECONDS', 30)
+    # Offline transcripts need this posterior and a wake/stop word to reach the LLM
+    VOICE_STT_OFFLINE_MIN_CONFIDENCE = _env_float('VOICE_STT_OFFLINE_MIN_CONFIDENCE', 0.5)
+
+    # Duplicate AI request coalescing (same entry point + channel + author + text)
+    AI_COALESCE_WINDOW_SECONDS = _env_float('AI_COALESCE_WINDOW_SECONDS', 10.0)
+
+    # Per-channel mention replies (always serialized; batching is opt-in)
+    AI_REPLY_BATCHING = _env_bool('AI_REPLY_BATCHING', False)
+    AI_REPLY_BATCH_WINDOW_MS = _env_int('AI_REPLY_BATCH_WINDOW_MS', 1500)
+    AI_REPLY_BATCH_MAX = _env_int('AI_REPLY_BATCH_MAX', 5)
+
+    # Global LLM scheduler (all Groq chat completions go through it)
+    LLM_MAX_CONCURRENCY = _env_int('LLM_MAX_CONCURRENCY', 4)
+    LLM_GUILD_MAX_CONCURRENCY = _env_int('LLM_GUILD_MAX_CONCURRENCY', 2)
+    LLM_TOKENS_PER_MINUTE = _env_int('LLM_TOKENS_PER_MINUTE', 0)  # 0 = no token budget
+    # Format: class:weight,class:weight (higher weight = bigger share when queued)
+    LLM_CLASS_WEIGHTS = _env_weights('LLM_CLASS_WEIGHTS', {
+        'reply': 4,
+        'voice': 4,
+        'planning': 2,
+        'memory': 1,
+        'greeting': 1,
+    })
+
     # Groq API settings
     PRIMARY_GROQ_MODEL = "qwen/qwen3-32b"
     GROQ_MODELS = _env_csv(
@@ -126,100 +234,8 @@ class Config:
         ),
     )
 
-    # Unicode map for text conversion - bold font style
-    UNICODE_MAP = {
-        'A': '𝐀',
-        'B': '𝐁',
-        'C': '𝐂',
-        'D': '𝐃',
-        'E': '𝐄',
-        'F': '𝐅',
-        'G': '𝐆',
-        'H': '𝐇',
-        'I': '𝐈',
-        'J': '𝐉',
-        'K': '𝐊',
-        'L': '𝐋',
-        'M': '𝐌',
-        'N': '𝐍',
-        'O': '𝐎',
-        'P': '𝐏',
-        'Q': '𝐐',
-        'R': '𝐑',
-        'S': '𝐒',
-        'T': '𝐓',
-        'U': '𝐔',
-        'V': '𝐕',
-        'W': '𝐖',
-        'X': '𝐗',
-        'Y': '𝐘',
-        'Z': '𝐙',
-        'a': '𝐚',
-        'b': '𝐛',
-        'c': '𝐜',
-        'd': '𝐝',
-        'e': '𝐞',
-        'f': '𝐟',
-        'g': '𝐠',
-        'h': '𝐡',
-        'i': '𝐢',
-        'j': '𝐣',
-        'k': '𝐤',
-        'l': '𝐥',
-        'm': '𝐦',
-        'n': '𝐧',
-        'o': '𝐨',
-        'p': '𝐩',
-        'q': '𝐪',
-        'r': '𝐫',
-        's': '𝐬',
-        't': '𝐭',
-        'u': '𝐮',
-        'v': '𝐯',
-        'w': '𝐰',
-        'x': '𝐱',
-        'y': '𝐲',
-        'z': '𝐳',
-        '0': '𝟎',
-        '1': '𝟏',
-        '2': '𝟐',
-        '3': '𝟑',
-        '4': '𝟒',
-        '5': '𝟓',
-        '6': '𝟔',
-        '7': '𝟕',
-        '8': '𝟖',
-        '9': '𝟗',
-        ' ': ' ',
-        '_': '_',
-        '-': '-',
-        '.': '.',
-        ',': ',',
-        '!': '!',
-        '?': '?',
-        ':': ':',
-        '|': '|',
-        '(': '(',
-        ')': ')',
-        '[': '[',
-        ']': ']',
-        '{': '{',
-        '}': '}',
-        '#': '#',
-        '*': '*',
-        '+': '+',
-        '=': '=',
-        '/': '/',
-        '\\': '\\',
-        '<': '<',
-        '>': '>',
-        '~': '~',
-        '@': '@',
-        '$': '$',
-        '%': '%',
-        '^': '^',
-        '&': '&'
-    }
+    # Unicode map for text conversion - bold font style (bot.unicode_transform.to_bold uses a prebuilt table)
+    UNICODE_MAP = dict(BOLD_MAP)
 
     # Role IDs and Emojis - centralized configuration
     # This avoids duplicated data in cog.py
@@ -251,6 +267,29 @@ class Config:
         1345727357612195885: "𝐁𝐎𝐁𝐎",
     }
 
+    # Minimum seconds between Discord edits per mutation route, per guild (member) or channel (channel, message) bucket
+    MUTATION_ROUTE_INTERVALS = _env_weights('MUTATION_ROUTE_INTERVALS', {
+        'member': 0.1,
+        'channel': 5.0,
+        'message': 0.7,
+    })
+    MUTATION_MAX_ATTEMPTS = _env_int('MUTATION_MAX_ATTEMPTS', 5)
+
+    # Channel names are bolded on create/rename; this sweep covers a slice of channels per run
+    CHANNEL_SWEEP_SECONDS = _env_int('CHANNEL_SWEEP_SECONDS', 120)
+    CHANNEL_SWEEP_BATCH = _env_int('CHANNEL_SWEEP_BATCH', 25)
+    # Channels we failed to rename are left alone this long (or until renamed)
+    CHANNEL_BOLD_FORBIDDEN_RETRY_SECONDS = _env_int('CHANNEL_BOLD_FORBIDDEN_RETRY_SECONDS', 7 * 24 * 60 * 60)
+    CHANNEL_BOLD_RATE_LIMIT_RETRY_SECONDS = _env_int('CHANNEL_BOLD_RATE_LIMIT_RETRY_SECONDS', 6 * 60 * 60)
+
+    # Nicknames are fixed from member events; this full sweep is only a safety net
+    NICKNAME_SWEEP_SECONDS = _env_int('NICKNAME_SWEEP_SECONDS', 30 * 60)
+    NICKNAME_SWEEP_PAGE_SIZE = _env_int('NICKNAME_SWEEP_PAGE_SIZE', 200)
+    # Bulk rewrites (g!roles, g!setupnn) refresh their progress embed at most this often
+    NICKNAME_PROGRESS_SECONDS = _env_int('NICKNAME_PROGRESS_SECONDS', 5)
+    # Edits listed by the g!nickplan dry run
+    NICKNAME_PLAN_PREVIEW = _env_int('NICKNAME_PLAN_PREVIEW', 15)
+
     # Bots to ignore in nickname formatting
     BOTS_TO_IGNORE = [
         # Music bots removed as they're no longer needed
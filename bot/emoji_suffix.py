@@ -0,0 +1,69 @@
+"""
+Reverse-suffix trie for stripping trailing role emojis from nicknames
+"""
+
+VARIATION_SELECTOR = "\ufe0f"
+
+
+class EmojiSuffixIndex:
+    """
+    Strips trailing " <emoji>" groups from a name in one right-to-left pass.
+
+    Emojis are stored reversed in a trie, so matching walks backwards from
+    the end of the name and never rescans the whole emoji list. Each emoji
+    matches with or without a trailing variation selector (U+FE0F), e.g.
+    "☁️" and "☁" are the same cloud. Like before, an emoji is only removed
+    when a space precedes it, so names that are just an emoji are kept.
+    Build a new index whenever the role-emoji map changes.
+    """
+
+    def __init__(self, emojis):
+        self._root = {}
+        self.emojis = set()
+        for emoji in emojis:
+            emoji = (emoji or "").strip()
+            if not emoji:
+                continue
+            base = emoji.rstrip(VARIATION_SELECTOR)
+            for variant in (base, base + VARIATION_SELECTOR):
+                self._insert(variant)
+
+    def __len__(self):
+        return len(self.emojis)
+
+    def _insert(self, emoji):
+        if not emoji or emoji in self.emojis:
+            return
+        self.emojis.add(emoji)
+        node = self._root
+        for char in reversed(emoji):
+            node = node.setdefault(char, {})
+        node[None] = True  # end-of-emoji marker
+
+    def _match_at(self, name, end):
+        """Start index of the longest emoji ending at ``end`` that has a space before it, or None"""
+        node = self._root
+        best = None
+        index = end
+        while index > 0:
+            node = node.get(name[index - 1])
+            if node is None:
+                break
+            index -= 1
+            if None in node and index > 0 and name[index - 1] == " ":
+                best = index
+        return best
+
+    def strip(self, name):
+        """Remove every trailing role emoji; returns the stripped name (may be empty)"""
+        name = name.strip()
+        end = len(name)
+        while True:
+            start = self._match_at(name, end)
+            if start is None:
+                break
+            # Drop the emoji and the whitespace before it
+            end = start
+            while end > 0 and name[end - 1].isspace():
+                end -= 1
+        return name[:end]
@@ -0,0 +1,195 @@
+"""
+Local wake-word / stop-word spotting ahead of cloud speech-to-text
+"""
+import asyncio
+import os
+import threading
+import time
+
+try:
+    from pocketsphinx import Decoder
+except ImportError:
+    Decoder = None
+
+from .audio_dsp import SAMPLE_WIDTH
+
+GATE_PASS = "pass"
+GATE_WAKE = "wake"
+GATE_STOP = "stop"
+GATE_DROP = "drop"
+
+
+class KeywordSpotter:
+    """
+    pocketsphinx keyword-spotting search over a fixed list of phrases.
+
+    The decoder is built lazily on first use (loading the acoustic model
+    takes a moment) and shared behind a lock, since transcription workers
+    may call it concurrently. Phrases with words missing from the
+    pronunciation dictionary are dropped with a warning instead of taking
+    the whole spotter down.
+    """
+
+    def __init__(self, phrases, *, threshold=1e-20, sample_rate=16000, work_dir="temp_audio"):
+        self.phrases = [phrase.strip().lower() for phrase in phrases if phrase and phrase.strip()]
+        self.threshold = threshold
+        self.sample_rate = sample_rate
+        self.work_dir = work_dir
+        self._decoder = None
+        self._failed = Decoder is None
+        self._lock = threading.Lock()
+
+    @property
+    def available(self):
+        return not self._failed and bool(self.phrases)
+
+    def _build_decoder(self, phrases):
+        os.makedirs(self.work_dir, exist_ok=True)
+        keyword_file = os.path.join(self.work_dir, "keywords.kws")
+        with open(keyword_file, "w", encoding="utf-8") as f:
+            for phrase in phrases:
+                f.write(f"{phrase} /{self.threshold}/\n")
+        return Decoder(kws=keyword_file, samprate=self.sample_rate, loglevel="FATAL")
+
+    def _decoder_or_none(self):
+        if self._decoder is not None or self._failed:
+            return self._decoder
+        try:
+            self._decoder = self._build_decoder(self.phrases)
+        except Exception as e:
+            # Usually a word that isn't in the dictionary: keep the phrases that load on their own
+            usable = []
+            for phrase in self.phrases:
+                try:
+                    self._build_decoder([phrase])
+                    usable.append(phrase)
+                except Exception:
+                    print(f"⚠️ Keyword '{phrase}' can't be spotted locally (not in the pocketsphinx dictionary)")
+            try:
+                self._decoder = self._build_decoder(usable) if usable else None
+            except Exception:
+                self._decoder = None
+            self.phrases = usable if self._decoder is not None else []
+            if self._decoder is None:
+                print(f"⚠️ Keyword spotting disabled: {e}")
+                self._failed = True
+        return self._decoder
+
+    def spot(self, pcm):
+        """
+        Phrases heard in 16 kHz mono PCM (blocking; run it in a thread)
+
+        Returns:
+            set: spotted phrases (empty when nothing matched or spotting is unavailable)
+        """
+        with self._lock:
+            decoder = self._decoder_or_none()
+            if decoder is None:
+                return set()
+            decoder.start_utt()
+            decoder.process_raw(pcm, full_utt=True)
+            decoder.end_utt()
+            if decoder.hyp() is None:
+                return set()
+            # seg() is None (not empty) in pocketsphinx 5 when nothing was spotted
+            return {segment.word.strip().lower() for segment in decoder.seg() or ()}
+
+
+class KeywordGate:
+    """
+    Decides locally whether an utterance is worth uploading for STT.
+
+    A wake word opens a window for that speaker during which everything is
+    uploaded; outside the window, utterances without a wake word are
+    dropped. Stop words are handled without any upload, but only in short
+    utterances or inside a wake window, so chatter like "don't stop" isn't
+    taken as a command. When pocketsphinx isn't installed, or no wake
+    phrase loads (nothing could ever open the window), every utterance
+    passes.
+    """
+
+    def __init__(self, wake_words, stop_words, *, enabled=True, wake_window_seconds=20.0,
+                 stop_max_seconds=2.5, threshold=1e-20, sample_rate=16000, work_dir="temp_audio"):
+        self.wake_words = {word.strip().lower() for word in wake_words if word.strip()}
+        self.stop_words = {word.strip().lower() for word in stop_words if word.strip()}
+        self.enabled = enabled
+        self.wake_window_seconds = wake_window_seconds
+        self.stop_max_seconds = stop_max_seconds
+        self.sample_rate = sample_rate
+        self.spotter = KeywordSpotter(
+            [*self.wake_words, *self.stop_words],
+            threshold=threshold, sample_rate=sample_rate, work_dir=work_dir,
+        )
+        self._awake_until = {}  # (guild_id, user_id): monotonic deadline
+        self._warned_no_wake = False
+
+        # Counters for the health snapshot
+        self.checked = 0
+        self.spot_seconds = 0.0
+        self.decisions = {GATE_PASS: 0, GATE_WAKE: 0, GATE_STOP: 0, GATE_DROP: 0}
+        self.gated_seconds = 0.0
+        self.uploaded_seconds = 0.0
+
+    @property
+    def active(self):
+        # Phrases missing from the dictionary are pruned from the spotter when it first loads
+        return self.enabled and self.spotter.available and bool(self.wake_words & set(self.spotter.phrases))
+
+    def _record(self, decision, duration):
+        self.decisions[decision] += 1
+        if decision in (GATE_PASS, GATE_WAKE):
+            self.uploaded_seconds += duration
+        else:
+            self.gated_seconds += duration
+        return decision
+
+    async def check(self, guild_id, user_id, pcm):
+        """
+        Returns:
+            str: GATE_PASS / GATE_WAKE (upload it), GATE_STOP (stop locally) or GATE_DROP
+        """
+        duration = len(pcm) / (SAMPLE_WIDTH * self.sample_rate)
+        if not self.active:
+            return self._record(GATE_PASS, duration)
+
+        key = (guild_id, user_id)
+        now = time.monotonic()
+        awake = self._awake_until.get(key, 0.0) > now
+        if not awake:
+            self._awake_until.pop(key, None)
+
+        started = time.perf_counter()
+        spotted = await asyncio.to_thread(self.spotter.spot, pcm)
+        self.spot_seconds += time.perf_counter() - started
+        self.checked += 1
+        if not self.active:
+            # First load dropped every wake phrase: gating now would drop everything
+            if not self._warned_no_wake:
+                print(f"⚠️ No wake word can be spotted locally ({', '.join(sorted(self.wake_words))}); keyword gate disabled")
+                self._warned_no_wake = True
+            return self._record(GATE_PASS, duration)
+
+        if spotted & self.stop_words and (awake or duration <= self.stop_max_seconds):
+            self._awake_until.pop(key, None)
+            return self._record(GATE_STOP, duration)
+        if spotted & self.wake_words:
+            self._awake_until[key] = now + self.wake_window_seconds
+            return self._record(GATE_WAKE, duration)
+        if awake:
+            # Follow-ups keep the conversation open
+            self._awake_until[key] = now + self.wake_window_seconds
+            return self._record(GATE_PASS, duration)
+        return self._record(GATE_DROP, duration)
+
+    def get_stats(self):
+        """Get gated vs uploaded counters for logging/health checks"""
+        return {
+            "enabled": self.enabled,
+            "active": self.active,
+            "phrases": list(self.spotter.phrases),
+            "decisions": dict(self.decisions),
+            "gated_seconds": round(self.gated_seconds, 1),
+            "uploaded_seconds": round(self.uploaded_seconds, 1),
+            "avg_spot_ms": round(self.spot_seconds / self.checked * 1000, 1) if self.checked else None,
+            "awake_speakers": sum(1 for deadline in self._awake_until.values() if deadline > time.monotonic()),
+        }
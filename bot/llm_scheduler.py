@@ -0,0 +1,229 @@
+"""
+Global scheduler for Groq chat completions
+"""
+import asyncio
+import itertools
+import time
+from collections import deque
+
+
+class _Waiter:
+    __slots__ = ("guild_key", "request_class", "cost", "start_tag", "finish_tag", "seq", "enqueued_at", "future")
+
+    def __init__(self, guild_key, request_class, cost, start_tag, finish_tag, seq, future):
+        self.guild_key = guild_key
+        self.request_class = request_class
+        self.cost = cost
+        self.start_tag = start_tag
+        self.finish_tag = finish_tag
+        self.seq = seq
+        self.enqueued_at = time.monotonic()
+        self.future = future
+
+
+class LLMScheduler:
+    """
+    Bounds concurrent LLM calls globally and per guild, with a shared
+    tokens-per-minute budget.
+
+    Waiting requests are ordered by weighted fair queueing: every
+    (guild, request class) pair is its own flow, each flow's virtual finish
+    time advances by ``cost / weight``, and the waiter with the smallest
+    finish time goes next. A noisy guild therefore only delays itself, and
+    replies (higher weight) move ahead of background work like memory
+    refreshes and greetings.
+    """
+
+    DEFAULT_CLASS = "reply"
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 4,
+        per_guild_concurrency: int = 2,
+        tokens_per_minute: int = 0,
+        class_weights=None,
+        wait_samples: int = 256,
+    ):
+        """
+        Args:
+            tokens_per_minute: shared token budget; 0 disables the token bucket.
+            class_weights: request class -> relative share (unknown classes get 1).
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_guild_concurrency = max(1, per_guild_concurrency)
+        self.tokens_per_minute = max(0, tokens_per_minute)
+        self.class_weights = dict(class_weights or {})
+
+        self._waiters = []
+        self._seq = itertools.count()
+        self._virtual_time = 0.0
+        self._flow_finish = {}  # (guild_key, request_class): last virtual finish tag
+        self._in_flight = 0
+        self._guild_in_flight = {}
+        self._wakeup = None
+
+        # Token bucket, refilled continuously
+        self._tokens = float(self.tokens_per_minute)
+        self._tokens_updated = time.monotonic()
+
+        # Metrics
+        self._wait_samples = wait_samples
+        self._class_stats = {}
+        self.token_throttles = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    @staticmethod
+    def estimate_tokens(messages, max_tokens=0):
+        """Rough token estimate for a chat request (~4 characters per token)"""
+        chars = sum(len(str(message.get("content") or "")) for message in messages or [])
+        return chars // 4 + int(max_tokens or 0)
+
+    async def run(self, func, *args, guild_id=None, request_class=None, estimated_tokens=0, **kwargs):
+        """
+        Wait for a slot, then run the blocking ``func`` in a worker thread
+
+        Actual usage reported by the API (``response.usage.total_tokens``)
+        replaces the estimate in the token bucket once the call returns.
+        """
+        request_class = request_class or self.DEFAULT_CLASS
+        guild_key = guild_id or 0
+        cost = max(1, int(estimated_tokens or 0))
+
+        await self._acquire(guild_key, request_class, cost)
+        try:
+            result = await asyncio.to_thread(func, *args, **kwargs)
+        finally:
+            self._release(guild_key)
+
+        usage = getattr(getattr(result, "usage", None), "total_tokens", None)
+        if usage is not None and self.tokens_per_minute:
+            self._refill()
+            self._tokens -= int(usage) - cost
+        return result
+
+    def get_stats(self):
+        """Get queue and wait-time metrics for logging/health checks"""
+        self._refill()
+        classes = {}
+        for request_class, stats in self._class_stats.items():
+            waits = sorted(stats["recent_waits"])
+            classes[request_class] = {
+                "requests": stats["requests"],
+                "queued": sum(1 for waiter in self._waiters if waiter.request_class == request_class),
+                "avg_wait_ms": round(stats["total_wait"] / stats["requests"] * 1000, 1) if stats["requests"] else 0.0,
+                "p95_wait_ms": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 1) if waits else 0.0,
+                "max_wait_ms": round(stats["max_wait"] * 1000, 1),
+            }
+
+        return {
+            "in_flight": self._in_flight,
+            "queued": len(self._waiters),
+            "max_concurrency": self.max_concurrency,
+            "per_guild_concurrency": self.per_guild_concurrency,
+            "tokens_per_minute": self.tokens_per_minute,
+            "tokens_available": int(self._tokens) if self.tokens_per_minute else None,
+            "token_throttles": self.token_throttles,
+            "classes": classes,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    async def _acquire(self, guild_key, request_class, cost):
+        if self.tokens_per_minute:
+            # A single oversized request must still be able to run eventually
+            cost = min(cost, self.tokens_per_minute)
+
+        flow = (guild_key, request_class)
+        weight = max(0.01, float(self.class_weights.get(request_class, 1)))
+        start_tag = max(self._virtual_time, self._flow_finish.get(flow, 0.0))
+        finish_tag = start_tag + cost / weight
+        self._flow_finish[flow] = finish_tag
+
+        waiter = _Waiter(
+            guild_key,
+            request_class,
+            cost,
+            start_tag,
+            finish_tag,
+            next(self._seq),
+            asyncio.get_running_loop().create_future(),
+        )
+        self._waiters.append(waiter)
+        self._dispatch()
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            elif waiter.future.done() and not waiter.future.cancelled():
+                # Granted right as we were cancelled - give the slot back
+                self._release(guild_key)
+            raise
+
+        wait = time.monotonic() - waiter.enqueued_at
+        stats = self._class_stats.setdefault(
+            request_class,
+            {"requests": 0, "total_wait": 0.0, "max_wait": 0.0, "recent_waits": deque(maxlen=self._wait_samples)},
+        )
+        stats["requests"] += 1
+        stats["total_wait"] += wait
+        stats["max_wait"] = max(stats["max_wait"], wait)
+        stats["recent_waits"].append(wait)
+
+    def _release(self, guild_key):
+        self._in_flight -= 1
+        remaining = self._guild_in_flight.get(guild_key, 1) - 1
+        if remaining > 0:
+            self._guild_in_flight[guild_key] = remaining
+        else:
+            self._guild_in_flight.pop(guild_key, None)
+        self._dispatch()
+
+    def _refill(self):
+        if not self.tokens_per_minute:
+            return
+        now = time.monotonic()
+        elapsed = now - self._tokens_updated
+        self._tokens_updated = now
+        self._tokens = min(float(self.tokens_per_minute), self._tokens + elapsed * self.tokens_per_minute / 60.0)
+
+    def _dispatch(self):
+        """Grant slots to eligible waiters in virtual-finish-time order"""
+        self._refill()
+        while self._waiters and self._in_flight < self.max_concurrency:
+            eligible = [
+                waiter for waiter in self._waiters
+                if self._guild_in_flight.get(waiter.guild_key, 0) < self.per_guild_concurrency
+            ]
+            if not eligible:
+                return
+
+            waiter = min(eligible, key=lambda w: (w.finish_tag, w.seq))
+            if self.tokens_per_minute and self._tokens < waiter.cost:
+                # Out of budget: wake up once enough tokens have refilled
+                if self._wakeup is None:
+                    self.token_throttles += 1
+                    delay = (waiter.cost - self._tokens) * 60.0 / self.tokens_per_minute
+                    self._wakeup = asyncio.get_running_loop().call_later(delay, self._on_wakeup)
+                return
+
+            self._waiters.remove(waiter)
+            if waiter.future.done():
+                continue
+
+            # Virtual time follows the start tag of whatever is being served
+            self._virtual_time = max(self._virtual_time, waiter.start_tag)
+            if self.tokens_per_minute:
+                self._tokens -= waiter.cost
+            self._in_flight += 1
+            self._guild_in_flight[waiter.guild_key] = self._guild_in_flight.get(waiter.guild_key, 0) + 1
+            waiter.future.set_result(None)
+
+    def _on_wakeup(self):
+        self._wakeup = None
+        self._dispatch()
@@ -0,0 +1,135 @@
+"""
+Single on_message pipeline shared by all cogs
+"""
+import bisect
+import time
+
+from .text_normalizer import fold_for_matching
+
+
+def format_author_tag(member_or_user):
+    """'Display Name (@username)', or just the name when both are the same"""
+    display_name = getattr(member_or_user, "display_name", None) or getattr(member_or_user, "name", "someone")
+    username = getattr(member_or_user, "name", display_name)
+    if display_name == username:
+        return display_name
+    return f"{display_name} (@{username})"
+
+
+class MessageContext:
+    """Facts about a message computed once and shared by every stage"""
+
+    __slots__ = (
+        "message",
+        "guild_id",
+        "channel_id",
+        "author_tag",
+        "is_command",
+        "mentions_bot",
+        "mention_content",
+        "folded_text",
+        "extras",
+    )
+
+    def __init__(self, message, *, bot_user=None, command_prefix=None):
+        self.message = message
+        self.guild_id = message.guild.id if message.guild else None
+        self.channel_id = message.channel.id
+        self.author_tag = format_author_tag(message.author)
+        content = message.content or ""
+        self.is_command = bool(command_prefix) and content.startswith(command_prefix)
+
+        self.mentions_bot = bool(bot_user) and bot_user.mentioned_in(message) and not message.mention_everyone
+        self.mention_content = ""
+        if self.mentions_bot:
+            for mention in message.mentions:
+                content = content.replace(f'<@{mention.id}>', '').replace(f'<@!{mention.id}>', '')
+            self.mention_content = content.strip()
+
+        # Folded/lowercased text for word filters
+        self.folded_text = fold_for_matching(message.content or "")
+        # Free-form slot for stages to pass things along
+        self.extras = {}
+
+
+class _StageStats:
+    __slots__ = ("calls", "stops", "errors", "total_seconds", "max_seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.stops = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+
+class MessageDispatcher:
+    """
+    Runs registered message stages in order for every non-bot message.
+
+    A stage is an async callable taking a MessageContext. Returning a truthy
+    value means "handled" and skips the remaining stages (e.g. a message that
+    got deleted by the word filter shouldn't also be answered or read aloud).
+    """
+
+    def __init__(self, bot, *, command_prefix=None):
+        self.bot = bot
+        self.command_prefix = command_prefix
+        self._stages = []  # sorted list of (order, sequence, name, handler)
+        self._stats = {}
+        self._sequence = 0
+        self.messages_dispatched = 0
+
+    def register(self, name, handler, *, order=100):
+        """Add a stage; lower ``order`` runs first, ties run in registration order"""
+        self.unregister(name)
+        self._sequence += 1
+        bisect.insort(self._stages, (order, self._sequence, name, handler), key=lambda stage: stage[:2])
+        self._stats.setdefault(name, _StageStats())
+
+    def unregister(self, name):
+        self._stages = [stage for stage in self._stages if stage[2] != name]
+
+    async def dispatch(self, message):
+        """on_message listener"""
+        if message.author.bot or not self._stages:
+            return
+
+        self.messages_dispatched += 1
+        context = MessageContext(message, bot_user=self.bot.user, command_prefix=self.command_prefix)
+
+        for _, _, name, handler in self._stages:
+            stats = self._stats[name]
+            started = time.perf_counter()
+            try:
+                handled = await handler(context)
+            except Exception as e:
+                stats.errors += 1
+                handled = False
+                print(f"❌ Error in message stage '{name}': {e}")
+            elapsed = time.perf_counter() - started
+
+            stats.calls += 1
+            stats.total_seconds += elapsed
+            stats.max_seconds = max(stats.max_seconds, elapsed)
+            if handled:
+                stats.stops += 1
+                break
+
+    def get_stats(self):
+        """Get per-stage timing for logging/health checks"""
+        return {
+            "messages": self.messages_dispatched,
+            "stages": {
+                name: {
+                    "order": order,
+                    "calls": self._stats[name].calls,
+                    "stops": self._stats[name].stops,
+                    "errors": self._stats[name].errors,
+                    "avg_ms": round(self._stats[name].total_seconds / self._stats[name].calls * 1000, 3)
+                    if self._stats[name].calls else 0.0,
+                    "max_ms": round(self._stats[name].max_seconds * 1000, 3),
+                }
+                for order, _, name, _ in self._stages
+            },
+        }
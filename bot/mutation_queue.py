@@ -0,0 +1,233 @@
+"""
+Outbound Discord mutation queue (nick/channel edits, mutes, deletes)
+"""
+import asyncio
+import heapq
+import itertools
+import time
+
+from .rate_limiter import RateLimiter
+
+# Lower runs first within a bucket
+PRIORITY_MODERATION = 0
+PRIORITY_NORMAL = 1
+PRIORITY_COSMETIC = 2
+
+
+class _Mutation:
+    __slots__ = ("priority", "sequence", "key", "func", "args", "kwargs", "future", "attempts", "superseded")
+
+    def __init__(self, priority, sequence, key, func, args, kwargs, future):
+        self.priority = priority
+        self.sequence = sequence
+        self.key = key
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.future = future
+        self.attempts = 0
+        self.superseded = False
+
+    def __lt__(self, other):
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+
+def _copy_result(source, target):
+    if target.done():
+        return
+    if source.cancelled():
+        target.cancel()
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+class _RouteStats:
+    """Counters for one kind of route, summed over its buckets"""
+
+    __slots__ = ("depth", "max_depth", "completed", "failed", "rate_limited", "superseded")
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+
+class _Route:
+    """One rate limit bucket (a route kind + its major parameter) with its own worker"""
+
+    def __init__(self, name, bucket, min_interval, stats):
+        self.name = name
+        self.bucket = bucket
+        self.min_interval = min_interval
+        self.stats = stats
+        self.limiter = RateLimiter()
+        self.heap = []
+        self.pending = {}  # dedup key: _Mutation
+        self.wakeup = asyncio.Event()
+        self.worker = None
+        self.next_allowed = 0.0
+
+
+class MutationQueue:
+    """
+    Serializes Discord edits per rate limit bucket with priorities and 429 backoff.
+
+    Discord rate limits per route *and* major parameter, so routes are
+    keyed by kind ("member", "channel", "message", ...) plus a ``bucket``
+    (the guild for member edits, the channel for channel edits and message
+    deletes). Each bucket has its own worker, a minimum spacing between
+    calls and a RateLimiter that waits out 429s (Retry-After when Discord
+    sends it, exponential backoff otherwise), so a busy guild or channel
+    doesn't hold up the others. Within a bucket moderation runs before
+    cosmetics. Submitting with the ``key`` of a still-pending mutation
+    replaces it (e.g. two nickname edits for the same member collapse into
+    the latest one) and both callers get the result of the one that runs.
+    Idle buckets are dropped after ``idle_seconds``.
+    """
+
+    def __init__(self, *, route_intervals=None, max_attempts=5, idle_seconds=60.0):
+        self.route_intervals = dict(route_intervals or {})
+        self.max_attempts = max(1, max_attempts)
+        self.idle_seconds = idle_seconds
+        self._routes = {}  # (name, bucket): _Route
+        self._stats = {}  # name: _RouteStats
+        self._sequence = itertools.count()
+
+    def _route(self, name, bucket):
+        route = self._routes.get((name, bucket))
+        if route is None:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = _RouteStats()
+            route = self._routes[(name, bucket)] = _Route(name, bucket, self.route_intervals.get(name, 0.0), stats)
+        if route.worker is None or route.worker.done():
+            route.worker = asyncio.get_running_loop().create_task(self._run_route(route))
+        return route
+
+    def submit(self, route_name, func, *args, bucket=None, priority=PRIORITY_NORMAL, key=None, **kwargs):
+        """
+        Queue ``await func(*args, **kwargs)`` on a route
+
+        Args:
+            bucket: the route's major parameter (guild id for member edits,
+                channel id for channel edits and message deletes)
+
+        Returns:
+            asyncio.Future: resolves with the call's result (await it, or ignore it)
+        """
+        route = self._route(route_name, bucket)
+        stats = route.stats
+        loop = asyncio.get_running_loop()
+
+        previous = route.pending.get(key) if key is not None else None
+        if previous is not None:
+            # Superseded edit: only the latest version goes out
+            previous.superseded = True
+            stats.superseded += 1
+            future = previous.future
+            priority = min(priority, previous.priority)
+        else:
+            future = loop.create_future()
+            # Fire-and-forget callers shouldn't trigger "exception never retrieved"
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            stats.depth += 1
+
+        mutation = _Mutation(priority, next(self._sequence), key, func, args, kwargs, future)
+        if key is not None:
+            route.pending[key] = mutation
+        heapq.heappush(route.heap, mutation)
+        stats.max_depth = max(stats.max_depth, stats.depth)
+        route.wakeup.set()
+        return future
+
+    async def _wait_for_work(self, route):
+        """Wait until the bucket has work; False when it sat idle and was dropped"""
+        while not route.heap:
+            route.wakeup.clear()
+            try:
+                await asyncio.wait_for(route.wakeup.wait(), self.idle_seconds)
+            except asyncio.TimeoutError:
+                backing_off, _ = route.limiter.check_backoff()
+                if not route.heap and not backing_off and self._routes.get((route.name, route.bucket)) is route:
+                    del self._routes[(route.name, route.bucket)]
+                    return False
+        return True
+
+    async def _run_route(self, route):
+        stats = route.stats
+        while True:
+            if not await self._wait_for_work(route):
+                return
+
+            # Wait out backoff after a 429 and the route's minimum spacing
+            backing_off, remaining = route.limiter.check_backoff()
+            wait = max(remaining if backing_off else 0.0, route.next_allowed - time.monotonic())
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+
+            mutation = heapq.heappop(route.heap)
+            if mutation.superseded:
+                continue
+            stats.depth -= 1
+            # In flight: a new submit with the same key queues a fresh edit
+            if mutation.key is not None and route.pending.get(mutation.key) is mutation:
+                del route.pending[mutation.key]
+
+            mutation.attempts += 1
+            try:
+                result = await mutation.func(*mutation.args, **mutation.kwargs)
+            except Exception as e:
+                if getattr(e, "status", None) == 429 and mutation.attempts < self.max_attempts:
+                    stats.rate_limited += 1
+                    backoff = route.limiter.record_rate_limit(getattr(e, "retry_after", None))
+                    print(f"⏳ {route.name} mutations rate limited ({route.bucket}), backing off {backoff:.1f}s")
+                    self._requeue(route, mutation)
+                    continue
+                if getattr(e, "status", None) == 429:
+                    stats.rate_limited += 1
+                stats.failed += 1
+                if not mutation.future.done():
+                    mutation.future.set_exception(e)
+            else:
+                stats.completed += 1
+                route.limiter.reset()
+                if not mutation.future.done():
+                    mutation.future.set_result(result)
+            route.next_allowed = time.monotonic() + route.min_interval
+
+    @staticmethod
+    def _requeue(route, mutation):
+        newer = route.pending.get(mutation.key) if mutation.key is not None else None
+        if newer is not None:
+            # Superseded while we were retrying; the newer edit answers our callers too
+            route.stats.superseded += 1
+            newer.future.add_done_callback(lambda f: _copy_result(f, mutation.future))
+            return
+        if mutation.key is not None:
+            route.pending[mutation.key] = mutation
+        route.stats.depth += 1
+        heapq.heappush(route.heap, mutation)
+
+    def get_stats(self):
+        """Get per-route queue depth and 429 counters for logging/health checks"""
+        buckets = {}
+        backing_off = {}
+        for (name, _), route in self._routes.items():
+            buckets[name] = buckets.get(name, 0) + 1
+            if route.limiter.check_backoff()[0]:
+                backing_off[name] = backing_off.get(name, 0) + 1
+        return {
+            name: {
+                "depth": stats.depth,
+                "max_depth": stats.max_depth,
+                "completed": stats.completed,
+                "failed": stats.failed,
+                "rate_limited": stats.rate_limited,
+                "superseded": stats.superseded,
+                "buckets": buckets.get(name, 0),
+                "buckets_backing_off": backing_off.get(name, 0),
+            }
+            for name, stats in self._stats.items()
+        }
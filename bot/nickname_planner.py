@@ -0,0 +1,115 @@
+"""
+Pure nickname planning: member snapshots + role-emoji map -> edits
+"""
+from .emoji_suffix import EmojiSuffixIndex
+from .unicode_transform import to_bold
+
+# Always stripped from the end of names, mapped or not
+ALWAYS_STRIPPED_EMOJIS = ("☁️",)
+
+
+def role_ids_by_position(member):
+    """Member's role ids ordered highest position first"""
+    return tuple(role.id for role in sorted(member.roles, key=lambda r: r.position, reverse=True))
+
+
+class MemberSnapshot:
+    """The parts of a member the planner looks at, detached from discord objects"""
+
+    __slots__ = ("member_id", "display_name", "role_ids", "is_bot", "is_owner")
+
+    def __init__(self, member_id, display_name, role_ids=(), *, is_bot=False, is_owner=False):
+        self.member_id = member_id
+        self.display_name = display_name
+        self.role_ids = tuple(role_ids)  # highest position first
+        self.is_bot = is_bot
+        self.is_owner = is_owner
+
+    @classmethod
+    def from_member(cls, member):
+        return cls(
+            member.id,
+            member.display_name,
+            role_ids_by_position(member),
+            is_bot=member.bot,
+            is_owner=member.guild is not None and member.id == member.guild.owner_id,
+        )
+
+
+class NicknameEdit:
+    __slots__ = ("member_id", "old", "new", "is_owner")
+
+    def __init__(self, member_id, old, new, is_owner=False):
+        self.member_id = member_id
+        self.old = old
+        self.new = new
+        self.is_owner = is_owner
+
+    def __repr__(self):
+        return f"NicknameEdit({self.member_id}, {self.old!r} -> {self.new!r})"
+
+
+class NicknamePlanner:
+    """
+    Computes server-format nicknames ("<bold name> <top role emoji>").
+
+    Holds the role-emoji map and a suffix index of emojis to strip, so build
+    a new planner whenever the map changes. Nothing here touches Discord,
+    which keeps dry runs and benchmarks honest.
+    """
+
+    def __init__(self, role_emoji_map, *, retired_emojis=()):
+        self.role_emoji_map = dict(role_emoji_map)
+        self.emoji_index = EmojiSuffixIndex(
+            [*self.role_emoji_map.values(), *retired_emojis, *ALWAYS_STRIPPED_EMOJIS]
+        )
+
+    def top_mapped_role(self, role_ids):
+        """Id of the highest role that has an emoji, or None"""
+        role_emoji_map = self.role_emoji_map
+        for role_id in role_ids:
+            if role_id in role_emoji_map:
+                return role_id
+        return None
+
+    def clean_name(self, display_name):
+        """Name without trailing role emojis ("User" if nothing is left)"""
+        return self.emoji_index.strip(display_name) or "User"
+
+    def desired(self, display_name, role_ids):
+        top_role = self.top_mapped_role(role_ids)
+        emoji = self.role_emoji_map[top_role] if top_role is not None else ""
+        return f"{to_bold(self.clean_name(display_name))} {emoji}"
+
+    def plan(self, snapshots, *, only_role_id=None):
+        """
+        Args:
+            snapshots: iterable of MemberSnapshot
+            only_role_id: only plan members whose top mapped role is this one
+
+        Returns:
+            tuple: (list of NicknameEdit, skipped_count). Bots are skipped;
+            the owner's edit is included with is_owner=True since only the
+            caller knows whether it can/should be applied.
+        """
+        edits = []
+        skipped = 0
+        for snapshot in snapshots:
+            if snapshot.is_bot:
+                skipped += 1
+                continue
+            if only_role_id is not None and self.top_mapped_role(snapshot.role_ids) != only_role_id:
+                skipped += 1
+                continue
+
+            new_name = self.desired(snapshot.display_name, snapshot.role_ids)
+            if new_name == snapshot.display_name:
+                skipped += 1
+                continue
+            edits.append(NicknameEdit(snapshot.member_id, snapshot.display_name, new_name, snapshot.is_owner))
+        return edits, skipped
+
+
+def plan_nickname_edits(snapshots, role_emoji_map, *, only_role_id=None, retired_emojis=()):
+    """One-shot helper: plan edits for ``snapshots`` under ``role_emoji_map``"""
+    return NicknamePlanner(role_emoji_map, retired_emojis=retired_emojis).plan(snapshots, only_role_id=only_role_id)
@@ -0,0 +1,146 @@
+"""
+Event-driven nickname reconciler
+"""
+import asyncio
+
+from .bounded_state import BoundedDict
+from .nickname_planner import role_ids_by_position
+
+
+class NicknameReconciler:
+    """
+    Keeps member nicknames in the server format without rescanning everyone.
+
+    Member events mark members dirty; one worker drains the dirty set and
+    only edits members whose nickname differs from the desired one. Desired
+    nicknames are memoized per (display name, roles ordered by position),
+    since many members share the same inputs and a role-map change is the
+    only thing that invalidates them. A slow, paginated sweep over every
+    member remains as a safety net for events missed while disconnected.
+    """
+
+    def __init__(self, bot, desired_for, apply, *, should_manage=None,
+                 sweep_interval=1800.0, page_size=200, memo_size=20000):
+        """
+        Args:
+            desired_for: callable(display_name, role_ids) -> desired nickname,
+                with role_ids ordered highest role first.
+            apply: async callable(member, desired) that performs the edit.
+            should_manage: optional callable(member) -> bool to skip members.
+        """
+        self.bot = bot
+        self.desired_for = desired_for
+        self.apply = apply
+        self.should_manage = should_manage or (lambda member: True)
+        self.sweep_interval = sweep_interval
+        self.page_size = max(1, page_size)
+
+        self._memo = BoundedDict("nickname_memo", max_entries=memo_size)
+        self._dirty = {}  # (guild_id, member_id): None, in arrival order
+        self._wakeup = asyncio.Event()
+        self._sweep_now = asyncio.Event()
+        # First sweep runs as soon as the bot is ready
+        self._sweep_now.set()
+
+        # Counters for the health snapshot
+        self.memo_hits = 0
+        self.memo_misses = 0
+        self.edits = 0
+        self.failures = 0
+        self.sweeps = 0
+        self.members_swept = 0
+
+    @staticmethod
+    def role_key(member):
+        """Member's role ids ordered highest position first"""
+        return role_ids_by_position(member)
+
+    def desired_nickname(self, member):
+        key = (member.display_name, self.role_key(member))
+        if key in self._memo:
+            # Indexing (unlike .get) touches the entry, so active members stay in the LRU
+            self.memo_hits += 1
+            return self._memo[key]
+        self.memo_misses += 1
+        desired = self._memo[key] = self.desired_for(*key)
+        return desired
+
+    def needs_update(self, member):
+        return self.should_manage(member) and member.display_name != self.desired_nickname(member)
+
+    def mark_dirty(self, member):
+        """Queue a member to be reconciled (cheap; call from event listeners)"""
+        self._dirty[(member.guild.id, member.id)] = None
+        self._wakeup.set()
+
+    def role_map_changed(self, *, sweep=True):
+        """Role emojis changed: every memoized nickname is stale (re-sweep unless the caller handles it)"""
+        self._memo.clear()
+        if sweep:
+            self._sweep_now.set()
+
+    async def run(self):
+        """Worker coroutine: drain the dirty set as members get marked"""
+        await self.bot.wait_until_ready()
+        while not self.bot.is_closed():
+            if not self._dirty:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            (guild_id, member_id), _ = next(iter(self._dirty.items()))
+            del self._dirty[(guild_id, member_id)]
+
+            guild = self.bot.get_guild(guild_id)
+            member = guild.get_member(member_id) if guild else None
+            if member is None:
+                continue
+
+            try:
+                if self.needs_update(member):
+                    if await self.apply(member, self.desired_nickname(member)):
+                        self.edits += 1
+            except Exception as e:
+                self.failures += 1
+                print(f"❌ Error reconciling nickname for {member.name}: {e}")
+            # Members already in format don't await anything, so yield explicitly
+            await asyncio.sleep(0)
+
+    async def run_sweeps(self):
+        """Safety-net sweep: page through every member, marking the ones out of format"""
+        await self.bot.wait_until_ready()
+        while not self.bot.is_closed():
+            try:
+                await asyncio.wait_for(self._sweep_now.wait(), timeout=self.sweep_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._sweep_now.clear()
+
+            marked = 0
+            for guild in list(self.bot.guilds):
+                members = list(guild.members)
+                for start in range(0, len(members), self.page_size):
+                    for member in members[start:start + self.page_size]:
+                        if self.needs_update(member):
+                            self.mark_dirty(member)
+                            marked += 1
+                    self.members_swept += min(self.page_size, len(members) - start)
+                    # Yield between pages so a big guild doesn't stall the event loop
+                    await asyncio.sleep(0)
+
+            self.sweeps += 1
+            if marked:
+                print(f"🔍 Nickname sweep queued {marked} member(s) for reformatting")
+
+    def get_stats(self):
+        """Get reconciler counters for logging/health checks"""
+        return {
+            "dirty": len(self._dirty),
+            "memo_size": len(self._memo),
+            "memo_hits": self.memo_hits,
+            "memo_misses": self.memo_misses,
+            "edits": self.edits,
+            "failures": self.failures,
+            "sweeps": self.sweeps,
+            "members_swept": self.members_swept,
+        }
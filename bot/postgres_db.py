@@ -121,12 +121,32 @@ class PostgresDB:
             updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
         );
 
+        CREATE TABLE IF NOT EXISTS banned_words (
+            guild_id BIGINT NOT NULL,
+            word TEXT NOT NULL,
+            action TEXT NOT NULL DEFAULT 'mute',
+            enabled BOOLEAN NOT NULL DEFAULT TRUE,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (guild_id, word)
+        );
+
+        CREATE TABLE IF NOT EXISTS scheduled_actions (
+            id BIGSERIAL PRIMARY KEY,
+            kind TEXT NOT NULL,
+            due_at TIMESTAMPTZ NOT NULL,
+            payload JSONB NOT NULL DEFAULT '{{}}'::jsonb,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        );
+
         CREATE TABLE IF NOT EXISTS bot_state (
             key TEXT PRIMARY KEY,
             value JSONB NOT NULL,
             updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
         );
 
+        CREATE INDEX IF NOT EXISTS idx_scheduled_actions_due
+            ON scheduled_actions (due_at);
+
         CREATE INDEX IF NOT EXISTS idx_rate_limits_user_created
             ON rate_limits (user_id, created_at DESC);
 
@@ -501,6 +521,55 @@ class PostgresDB:
                 )
                 return True
 
+    def get_banned_words(self, guild_id: int | None = None) -> dict[int, dict[str, str | None]]:
+        """Per-guild overrides of the default list: word -> action, or None if the word was removed"""
+        with self._connection() as connection:
+            with connection.cursor(cursor_factory=RealDictCursor) as cursor:
+                if guild_id is None:
+                    cursor.execute("SELECT guild_id, word, action, enabled FROM banned_words")
+                else:
+                    cursor.execute(
+                        "SELECT guild_id, word, action, enabled FROM banned_words WHERE guild_id = %s",
+                        (int(guild_id),),
+                    )
+                result: dict[int, dict[str, str | None]] = {}
+                for row in cursor.fetchall():
+                    result.setdefault(int(row["guild_id"]), {})[row["word"]] = row["action"] if row["enabled"] else None
+                return result
+
+    def set_banned_word(self, guild_id: int, word: str, action: str | None) -> bool:
+        """Ban a word for a guild, or pass action=None to unban it (kept as a row so defaults stay removed)"""
+        with self._connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO banned_words (guild_id, word, action, enabled, updated_at)
+                    VALUES (%s, %s, %s, %s, clock_timestamp())
+                    ON CONFLICT (guild_id, word) DO UPDATE
+                    SET action = EXCLUDED.action,
+                        enabled = EXCLUDED.enabled,
+                        updated_at = EXCLUDED.updated_at
+                    """,
+                    (int(guild_id), word, action or "mute", action is not None),
+                )
+        return True
+
+    def get_banned_words_versions(self) -> dict[int, str]:
+        """Cheap change marker per guild (latest update time) for cache invalidation"""
+        with self._connection() as connection:
+            with connection.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute(
+                    """
+                    SELECT guild_id, MAX(updated_at) AS version, COUNT(*) AS words
+                    FROM banned_words
+                    GROUP BY guild_id
+                    """
+                )
+                return {
+                    int(row["guild_id"]): f"{row['version'].isoformat()}#{row['words']}"
+                    for row in cursor.fetchall()
+                }
+
     def log_message(
         self,
         guild_id: int | None,
@@ -666,6 +735,37 @@ class PostgresDB:
                 )
         return True
 
+    def add_scheduled_action(self, kind: str, due_at: datetime, payload: dict[str, Any]) -> int:
+        with self._connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO scheduled_actions (kind, due_at, payload)
+                    VALUES (%s, %s, %s)
+                    RETURNING id
+                    """,
+                    (kind, due_at, Json(payload)),
+                )
+                return int(cursor.fetchone()[0])
+
+    def get_scheduled_actions(self) -> list[dict[str, Any]]:
+        with self._connection() as connection:
+            with connection.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute(
+                    """
+                    SELECT id, kind, due_at, payload
+                    FROM scheduled_actions
+                    ORDER BY due_at
+                    """
+                )
+                return [dict(row) for row in cursor.fetchall()]
+
+    def delete_scheduled_action(self, action_id: int) -> bool:
+        with self._connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute("DELETE FROM scheduled_actions WHERE id = %s", (int(action_id),))
+                return cursor.rowcount > 0
+
     def save_voice_state(self, guild_id: int, channel_id: int) -> bool:
         return self.set_state(
             "voice_state",
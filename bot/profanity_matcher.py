@@ -0,0 +1,116 @@
+"""
+Compiled banned-word matcher (Aho-Corasick)
+"""
+from .text_normalizer import fold_for_matching
+
+# Higher wins when a message contains several banned words
+ACTION_SEVERITY = {
+    "mute": 1,
+    "disconnect": 2,
+    "both": 3,
+}
+
+
+class ProfanityMatcher:
+    """
+    Finds banned words in a message with a single pass over the text.
+
+    The word list is compiled into an Aho-Corasick automaton once, so scan cost
+    depends on message length rather than on how many words are banned.
+    Build a new matcher whenever the word list changes.
+    """
+
+    def __init__(self, word_actions):
+        """
+        Args:
+            word_actions: dict of banned word -> action ("mute", "disconnect", "both")
+        """
+        self.word_actions = dict(word_actions)
+
+        self._goto = [{}]
+        self._fail = [0]
+        # Per node: (severity, word, action) of the worst word ending here, or None
+        self._best = [None]
+        self._max_severity = max(ACTION_SEVERITY.values())
+
+        for word, action in self.word_actions.items():
+            self._add(word, action)
+        self._build_failure_links()
+
+    def __len__(self):
+        return len(self.word_actions)
+
+    def _add(self, word, action):
+        pattern = fold_for_matching(word).strip()
+        if not pattern:
+            return
+
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._best.append(None)
+            node = next_node
+
+        candidate = (ACTION_SEVERITY.get(action, ACTION_SEVERITY["mute"]), word, action)
+        if self._best[node] is None or candidate[0] > self._best[node][0]:
+            self._best[node] = candidate
+
+    def _build_failure_links(self):
+        # Breadth-first, so every failure target is finished before its dependents
+        queue = list(self._goto[0].values())
+        index = 0
+        while index < len(queue):
+            node = queue[index]
+            index += 1
+            for char, child in self._goto[node].items():
+                queue.append(child)
+
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0) if node else 0
+
+                # A node also "contains" every word ending at its failure target
+                inherited = self._best[self._fail[child]]
+                if inherited and (self._best[child] is None or inherited[0] > self._best[child][0]):
+                    self._best[child] = inherited
+
+    def find(self, text):
+        """
+        Scan ``text`` for banned words
+
+        Returns:
+            tuple: (word, action) for the highest-severity match, or None
+        """
+        if not self.word_actions or not text:
+            return None
+        return self.find_folded(fold_for_matching(text))
+
+    def find_folded(self, folded_text):
+        """Like find(), for text already passed through fold_for_matching"""
+        if not self.word_actions or not folded_text:
+            return None
+
+        goto = self._goto
+        fail = self._fail
+        best_at = self._best
+        best = None
+        node = 0
+
+        for char in folded_text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+
+            found = best_at[node]
+            if found and (best is None or found[0] > best[0]):
+                best = found
+                if best[0] >= self._max_severity:
+                    break
+
+        return (best[1], best[2]) if best else None
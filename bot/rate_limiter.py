@@ -30,12 +30,26 @@ class RateLimiter:
         # Logger
         self.logger = logging.getLogger('discord.rate_limiter')
     
-    def record_rate_limit(self):
-        """Record that we encountered a rate limit and calculate new backoff time"""
+    def record_rate_limit(self, retry_after=None):
+        """
+        Record that we encountered a rate limit and calculate new backoff time
+        
+        Args:
+            retry_after: seconds Discord asked us to wait; used as-is when given
+        """
         self.consecutive_limits += 1
         self.last_rate_limit = time.time()
         self.is_backing_off = True
         
+        if retry_after:
+            # The server knows when the bucket resets; don't guess longer
+            self.current_backoff = min(retry_after, self.max_backoff)
+            self.logger.warning(
+                f"Rate limit encountered ({self.consecutive_limits} consecutive). "
+                f"Retrying after {self.current_backoff:.1f} seconds."
+            )
+            return self.current_backoff
+        
         # Calculate exponential backoff with jitter (randomization)
         # Base: 5s, 10s, 20s, 40s, 80s, 160s, 320s, 640s, 900s (15min max)
         self.current_backoff = min(
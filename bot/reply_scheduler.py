@@ -0,0 +1,99 @@
+"""
+Per-channel reply scheduler for AI mentions
+"""
+import asyncio
+from collections import deque
+
+
+class ChannelReplyScheduler:
+    """
+    Serializes AI replies per channel so history writes stay in order.
+
+    Every channel gets its own FIFO queue drained by a single worker task.
+    With batching enabled the worker waits a short debounce window and hands
+    all mentions that piled up (up to ``max_batch``) to the handler at once,
+    so a mention storm costs one LLM call instead of N.
+    """
+
+    def __init__(self, handler, *, batching: bool = False, debounce_seconds: float = 1.5, max_batch: int = 5):
+        """
+        Args:
+            handler: async callable ``(channel_id, items) -> list`` returning
+                one result per queued item, in the same order.
+        """
+        self.handler = handler
+        self.batching = batching
+        self.debounce_seconds = debounce_seconds
+        self.max_batch = max(1, max_batch)
+
+        self._queues = {}  # channel_id: deque of (item, future)
+        self._workers = {}  # channel_id: asyncio task draining that queue
+
+        # Counters for the health snapshot
+        self.batches_run = 0
+        self.items_handled = 0
+        self.items_merged = 0
+
+    async def submit(self, channel_id, item):
+        """Queue an item for its channel and wait for the handler's result"""
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(channel_id, deque()).append((item, future))
+
+        worker = self._workers.get(channel_id)
+        if worker is None or worker.done():
+            self._workers[channel_id] = asyncio.create_task(self._drain(channel_id))
+
+        return await future
+
+    async def _drain(self, channel_id):
+        queue = self._queues[channel_id]
+        try:
+            while queue:
+                if self.batching:
+                    # Give concurrent mentions a moment to pile up
+                    await asyncio.sleep(self.debounce_seconds)
+                    take = min(len(queue), self.max_batch)
+                else:
+                    take = 1
+
+                batch = [queue.popleft() for _ in range(take)]
+                # Skip callers that gave up while waiting
+                batch = [(item, future) for item, future in batch if not future.done()]
+                if not batch:
+                    continue
+
+                self.batches_run += 1
+                self.items_handled += len(batch)
+                if len(batch) > 1:
+                    self.items_merged += len(batch) - 1
+
+                try:
+                    results = await self.handler(channel_id, [item for item, _ in batch])
+                except Exception as e:
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                else:
+                    for (_, future), result in zip(batch, results):
+                        if not future.done():
+                            future.set_result(result)
+        except asyncio.CancelledError:
+            while queue:
+                _, future = queue.popleft()
+                future.cancel()
+            raise
+        finally:
+            self._workers.pop(channel_id, None)
+            if not queue:
+                self._queues.pop(channel_id, None)
+
+    def get_stats(self):
+        """Get scheduler counters for logging/health checks"""
+        return {
+            "batching": self.batching,
+            "active_channels": len(self._workers),
+            "pending": sum(len(queue) for queue in self._queues.values()),
+            "batches_run": self.batches_run,
+            "items_handled": self.items_handled,
+            "items_merged": self.items_merged,
+        }
@@ -0,0 +1,116 @@
+"""
+Singleflight coalescing for duplicate AI requests
+"""
+import asyncio
+import time
+
+# How a caller's result was shared (``run`` returns False when it did the work itself)
+SHARED_IN_FLIGHT = "in_flight"  # joined a running request; its leader sends the reply
+SHARED_RECENT = "recent"  # repeat of a request that already finished and was answered
+
+
+class RequestCoalescer:
+    """
+    Lets identical AI requests share a single LLM call.
+
+    The first caller for a key runs the work; anyone asking for the same key
+    while it is still running (or within ``window`` seconds after it finished)
+    gets the same result back instead of starting another completion. If the
+    leader is cancelled, a waiting caller runs the work itself instead of
+    failing with it.
+    """
+
+    def __init__(self, window: float = 10.0, max_recent: int = 1024):
+        """Initialize the coalescer with an empty in-flight table"""
+        self.window = window
+        self.max_recent = max_recent
+
+        # key: asyncio.Future shared by every caller of an in-flight request
+        self._inflight = {}
+
+        # key: (finished_at, result) for requests that completed recently
+        self._recent = {}
+
+        # Counters for the health snapshot
+        self.leader_calls = 0
+        self.saved_calls = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalize message text so trivial spacing/case changes still coalesce"""
+        return " ".join((text or "").lower().split())
+
+    @classmethod
+    def make_key(cls, source, channel_id, author_id, text):
+        """Build the coalescing key for a chat request from one entry point ("mention", "usap", ...)"""
+        return (source, int(channel_id or 0), int(author_id or 0), cls.normalize(text))
+
+    def _prune(self, now: float) -> None:
+        expired = [key for key, (finished_at, _) in self._recent.items() if now - finished_at > self.window]
+        for key in expired:
+            del self._recent[key]
+
+        # Hard cap in case of a burst of unique keys inside one window
+        while len(self._recent) > self.max_recent:
+            self._recent.pop(next(iter(self._recent)))
+
+    async def run(self, key, factory):
+        """
+        Run ``factory()`` once per key and share its result
+
+        Returns:
+            tuple: (result, shared) where shared is False when this caller did
+            the work, SHARED_IN_FLIGHT when it joined a running request (the
+            leader sends the reply) or SHARED_RECENT when the same request was
+            already answered moments ago. Shared callers should not repeat
+            side effects like writing history.
+        """
+        now = time.monotonic()
+        self._prune(now)
+
+        recent = self._recent.get(key)
+        if recent is not None:
+            self.saved_calls += 1
+            return recent[1], SHARED_RECENT
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.saved_calls += 1
+            try:
+                return await asyncio.shield(future), SHARED_IN_FLIGHT
+            except asyncio.CancelledError:
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+            # The leader was cancelled, not us: do the work (others will join this run)
+            self.saved_calls -= 1
+            return await self.run(key, factory)
+
+        future = asyncio.get_running_loop().create_future()
+        # Avoid "exception was never retrieved" noise when nobody else is waiting
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        self.leader_calls += 1
+
+        try:
+            result = await factory()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            self._recent[key] = (time.monotonic(), result)
+            return result, False
+        finally:
+            self._inflight.pop(key, None)
+
+    def get_stats(self):
+        """Get coalescing counters for logging/health checks"""
+        return {
+            "leader_calls": self.leader_calls,
+            "saved_calls": self.saved_calls,
+            "in_flight": len(self._inflight),
+            "window_seconds": self.window,
+        }
@@ -0,0 +1,140 @@
+"""
+In-memory utterance encoding for speech-to-text uploads
+"""
+import asyncio
+import io
+import shutil
+import time
+import wave
+
+from .audio_dsp import SAMPLE_WIDTH, downmix_resample
+
+WHISPER_SAMPLE_RATE = 16000
+
+
+def encode_wav(pcm, sample_rate=WHISPER_SAMPLE_RATE):
+    """Mono 16-bit PCM -> WAV bytes, built in a BytesIO"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(SAMPLE_WIDTH)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm)
+    return buffer.getvalue()
+
+
+async def encode_flac(pcm, sample_rate=WHISPER_SAMPLE_RATE):
+    """
+    Mono 16-bit PCM -> FLAC bytes, piped through ffmpeg (no temp files)
+
+    Returns:
+        bytes or None: None when ffmpeg is missing or fails
+    """
+    if shutil.which("ffmpeg") is None:
+        return None
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-hide_banner", "-loglevel", "error",
+        "-f", "s16le", "-ar", str(sample_rate), "-ac", "1", "-i", "pipe:0",
+        "-f", "flac", "pipe:1",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate(pcm)
+    if process.returncode != 0 or not stdout:
+        print(f"⚠️ FLAC encode failed, falling back to WAV: {stderr.decode(errors='replace').strip()[:200]}")
+        return None
+    return stdout
+
+
+class EncodedUtterance:
+    __slots__ = ("filename", "data", "format", "pcm", "sample_rate", "raw_bytes", "encode_seconds")
+
+    def __init__(self, filename, data, fmt, pcm, sample_rate, raw_bytes, encode_seconds):
+        self.filename = filename
+        self.data = data
+        self.format = fmt
+        self.pcm = pcm  # 16 kHz mono PCM, for local engines
+        self.sample_rate = sample_rate
+        self.raw_bytes = raw_bytes
+        self.encode_seconds = encode_seconds
+
+    @property
+    def duration(self):
+        return len(self.pcm) / (SAMPLE_WIDTH * self.sample_rate)
+
+
+class UtteranceEncoder:
+    """
+    Turns received 48 kHz stereo utterances into small upload payloads.
+
+    Audio is mixed to mono and resampled to 16 kHz in memory (6x fewer
+    bytes than the raw capture), then encoded as FLAC through an ffmpeg
+    pipe, or as WAV when ffmpeg isn't available. Sizes and latencies are
+    kept for the health snapshot.
+    """
+
+    def __init__(self, *, channels=2, sample_rate=48000, target_rate=WHISPER_SAMPLE_RATE, fmt="flac"):
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.target_rate = target_rate
+        self.format = fmt
+
+        # Counters for the health snapshot
+        self.utterances = 0
+        self.raw_bytes = 0
+        self.uploaded_bytes = 0
+        self.encode_seconds = 0.0
+        self.uploads = 0
+        self.upload_seconds = 0.0
+        self.last_upload_seconds = 0.0
+        self.formats = {}
+
+    async def resample(self, pcm):
+        """Received PCM -> 16 kHz mono PCM (CPU work, so it runs off the event loop)"""
+        return await asyncio.to_thread(downmix_resample, pcm, self.channels, self.sample_rate, self.target_rate)
+
+    async def encode(self, pcm, name="utterance", mono=None):
+        """Encode a received utterance for upload (pass ``mono`` if it was already resampled)"""
+        started = time.perf_counter()
+        if mono is None:
+            mono = await self.resample(pcm)
+
+        data = None
+        fmt = "wav"
+        if self.format == "flac":
+            try:
+                data = await encode_flac(mono, self.target_rate)
+            except Exception as e:
+                print(f"⚠️ FLAC encode error, falling back to WAV: {e}")
+            if data is not None:
+                fmt = "flac"
+        if data is None:
+            data = encode_wav(mono, self.target_rate)
+
+        encode_seconds = time.perf_counter() - started
+        self.utterances += 1
+        self.raw_bytes += len(pcm)
+        self.uploaded_bytes += len(data)
+        self.encode_seconds += encode_seconds
+        self.formats[fmt] = self.formats.get(fmt, 0) + 1
+        return EncodedUtterance(f"{name}.{fmt}", data, fmt, mono, self.target_rate, len(pcm), encode_seconds)
+
+    def record_upload(self, seconds):
+        """Time spent in the STT request for one encoded utterance"""
+        self.uploads += 1
+        self.upload_seconds += seconds
+        self.last_upload_seconds = seconds
+
+    def get_stats(self):
+        """Get upload size/latency counters for logging/health checks"""
+        return {
+            "utterances": self.utterances,
+            "formats": dict(self.formats),
+            "raw_bytes": self.raw_bytes,
+            "uploaded_bytes": self.uploaded_bytes,
+            "compression_ratio": round(self.raw_bytes / self.uploaded_bytes, 2) if self.uploaded_bytes else None,
+            "avg_encode_ms": round(self.encode_seconds / self.utterances * 1000, 1) if self.utterances else None,
+            "avg_upload_ms": round(self.upload_seconds / self.uploads * 1000, 1) if self.uploads else None,
+            "last_upload_ms": round(self.last_upload_seconds * 1000, 1),
+        }
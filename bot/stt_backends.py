@@ -0,0 +1,298 @@
+"""
+Speech-to-text backends and a failover router
+"""
+import asyncio
+import math
+import threading
+import time
+
+try:
+    from pocketsphinx import Decoder
+except ImportError:
+    Decoder = None
+
+
+class STTError(Exception):
+    """A backend couldn't transcribe the utterance"""
+
+
+class STTRateLimited(STTError):
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class STTUnavailable(STTError):
+    """Every backend failed, timed out or had its circuit open"""
+
+    def __init__(self, message, rate_limited=False):
+        super().__init__(message)
+        self.rate_limited = rate_limited
+
+
+class Transcript:
+    """Backend-neutral transcription result (shaped like Groq's verbose_json)"""
+
+    __slots__ = ("text", "segments", "confidence", "backend", "latency")
+
+    def __init__(self, text, segments=None, confidence=None, backend=None, latency=0.0):
+        self.text = text
+        self.segments = segments
+        self.confidence = confidence  # 0..1 for engines without Whisper segment scores
+        self.backend = backend
+        self.latency = latency
+
+
+class STTBackend:
+    """
+    Interface for speech-to-text engines.
+
+    ``transcribe`` takes an EncodedUtterance (compressed ``data`` for
+    uploads, 16 kHz mono ``pcm`` for local engines) and returns a
+    Transcript, raising STTRateLimited on quota errors and STTError for
+    anything else it wants the router to fail over on.
+    """
+
+    name = "backend"
+    remote = False
+
+    async def transcribe(self, utterance):
+        raise NotImplementedError
+
+
+class GroqWhisperBackend(STTBackend):
+    name = "groq"
+    remote = True
+
+    def __init__(self, client, *, model="whisper-large-v3"):
+        self.client = client
+        self.model = model
+
+    async def transcribe(self, utterance):
+        try:
+            response = await asyncio.to_thread(
+                self.client.audio.transcriptions.create,
+                file=(utterance.filename, utterance.data),
+                model=self.model,
+                temperature=0,
+                response_format="verbose_json",
+                prompt="",  # Empty prompt to reduce hallucinations
+            )
+        except Exception as e:
+            if getattr(e, "status_code", None) == 429 or "429" in str(e) or "rate_limit" in str(e).lower():
+                headers = getattr(getattr(e, "response", None), "headers", None) or {}
+                try:
+                    retry_after = float(headers.get("retry-after"))
+                except (TypeError, ValueError):
+                    retry_after = None
+                raise STTRateLimited(str(e), retry_after) from e
+            raise STTError(str(e)) from e
+        return Transcript((getattr(response, "text", "") or "").strip(), getattr(response, "segments", None))
+
+
+class PocketSphinxBackend(STTBackend):
+    """
+    Offline CPU transcription with pocketsphinx's bundled US English model.
+
+    Much less accurate than Whisper (and English only), so it only runs when
+    the cloud backend is rate limited, timing out or its circuit is open.
+    The decoder loads lazily and is shared behind a lock. Transcripts carry
+    the hypothesis posterior as ``confidence`` so the transcript gate can
+    judge them without Whisper's segment scores.
+    """
+
+    name = "pocketsphinx"
+    remote = False
+
+    def __init__(self, *, sample_rate=16000, logbase=1.0001):
+        self.sample_rate = sample_rate
+        self.logbase = logbase  # pocketsphinx's default -logbase; posteriors come back in these units
+        self._decoder = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def available():
+        return Decoder is not None
+
+    def _transcribe_blocking(self, pcm):
+        with self._lock:
+            if self._decoder is None:
+                self._decoder = Decoder(samprate=self.sample_rate, loglevel="FATAL")
+            self._decoder.start_utt()
+            self._decoder.process_raw(pcm, full_utt=True)
+            self._decoder.end_utt()
+            hypothesis = self._decoder.hyp()
+        if hypothesis is None:
+            return "", 0.0
+        return hypothesis.hypstr.strip(), self.posterior(hypothesis.prob)
+
+    def posterior(self, log_prob):
+        """Log posterior in logbase units -> probability in 0..1"""
+        try:
+            return min(1.0, max(0.0, math.exp(log_prob * math.log(self.logbase))))
+        except (OverflowError, TypeError, ValueError):
+            return 0.0
+
+    async def transcribe(self, utterance):
+        if Decoder is None:
+            raise STTError("pocketsphinx is not installed")
+        try:
+            text, confidence = await asyncio.to_thread(self._transcribe_blocking, utterance.pcm)
+        except Exception as e:
+            raise STTError(str(e)) from e
+        return Transcript(text, confidence=confidence)
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures, half-opens after ``reset_seconds``"""
+
+    def __init__(self, *, failure_threshold=3, reset_seconds=30.0, clock=time.monotonic):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.opened = 0
+
+    @property
+    def state(self):
+        if self.open_until > self.clock():
+            return "open"
+        if self.consecutive_failures >= self.failure_threshold:
+            return "half_open"  # next call is the trial
+        return "closed"
+
+    def allow(self):
+        return self.open_until <= self.clock()
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+
+    def record_failure(self, open_for=None):
+        """Count a failure; ``open_for`` opens the circuit right away (e.g. Retry-After)"""
+        self.consecutive_failures += 1
+        if open_for is not None or self.consecutive_failures >= self.failure_threshold:
+            self.open_until = self.clock() + (open_for if open_for is not None else self.reset_seconds)
+            self.opened += 1
+
+
+class _BackendStats:
+    __slots__ = (
+        "calls", "successes", "failures", "rate_limited", "timeouts", "skipped_open",
+        "latency_seconds", "accepted", "rejected",
+    )
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+        self.latency_seconds = 0.0
+
+
+class STTRouter:
+    """
+    Tries backends in order, failing over on rate limits, timeouts, errors
+    and open circuits.
+
+    Each backend has its own circuit breaker: a 429 opens it for the
+    Retry-After time (or ``rate_limit_seconds``), and repeated failures
+    open it for ``reset_seconds``, so a struggling cloud API isn't hammered
+    while the offline engine covers. Per-backend latency is tracked, and
+    callers report whether each transcript passed the confidence gate
+    (``record_verdict``) as a cheap accuracy signal.
+    """
+
+    def __init__(self, backends, *, timeout_seconds=15.0, failure_threshold=3, reset_seconds=30.0,
+                 rate_limit_seconds=60.0, clock=time.monotonic):
+        self.backends = list(backends)
+        self.backends_by_name = {backend.name: backend for backend in self.backends}
+        self.timeout_seconds = timeout_seconds
+        self.rate_limit_seconds = rate_limit_seconds
+        self.breakers = {
+            backend.name: CircuitBreaker(failure_threshold=failure_threshold, reset_seconds=reset_seconds, clock=clock)
+            for backend in self.backends
+        }
+        self.stats = {backend.name: _BackendStats() for backend in self.backends}
+        self.failovers = 0
+        self.unavailable = 0
+
+    async def transcribe(self, utterance):
+        """
+        Returns:
+            Transcript: from the first backend that answered (``backend`` and ``latency`` set)
+
+        Raises:
+            STTUnavailable: no backend could transcribe it
+        """
+        errors = []
+        rate_limited = False
+        for index, backend in enumerate(self.backends):
+            stats = self.stats[backend.name]
+            breaker = self.breakers[backend.name]
+            if not breaker.allow():
+                stats.skipped_open += 1
+                errors.append(f"{backend.name}: circuit open")
+                continue
+
+            stats.calls += 1
+            started = time.perf_counter()
+            try:
+                transcript = await asyncio.wait_for(backend.transcribe(utterance), self.timeout_seconds)
+            except STTRateLimited as e:
+                stats.rate_limited += 1
+                rate_limited = True
+                breaker.record_failure(open_for=e.retry_after or self.rate_limit_seconds)
+                errors.append(f"{backend.name}: rate limited")
+            except asyncio.TimeoutError:
+                stats.timeouts += 1
+                breaker.record_failure()
+                errors.append(f"{backend.name}: timed out after {self.timeout_seconds}s")
+            except Exception as e:
+                stats.failures += 1
+                breaker.record_failure()
+                errors.append(f"{backend.name}: {e}")
+            else:
+                elapsed = time.perf_counter() - started
+                stats.successes += 1
+                stats.latency_seconds += elapsed
+                breaker.record_success()
+                transcript.backend = backend.name
+                transcript.latency = elapsed
+                if index:
+                    self.failovers += 1
+                    print(f"🔀 STT fell back to {backend.name} ({'; '.join(errors)})")
+                return transcript
+
+        self.unavailable += 1
+        raise STTUnavailable("; ".join(errors) or "no STT backends configured", rate_limited=rate_limited)
+
+    def record_verdict(self, backend_name, accepted):
+        """Whether a backend's transcript passed the confidence gate"""
+        stats = self.stats.get(backend_name)
+        if stats is None:
+            return
+        if accepted:
+            stats.accepted += 1
+        else:
+            stats.rejected += 1
+
+    def get_stats(self):
+        """Get per-backend latency/failure counters for logging/health checks"""
+        backends = {}
+        for backend in self.backends:
+            stats = self.stats[backend.name]
+            judged = stats.accepted + stats.rejected
+            backends[backend.name] = {
+                "circuit": self.breakers[backend.name].state,
+                "calls": stats.calls,
+                "successes": stats.successes,
+                "failures": stats.failures,
+                "rate_limited": stats.rate_limited,
+                "timeouts": stats.timeouts,
+                "skipped_open": stats.skipped_open,
+                "avg_latency_ms": round(stats.latency_seconds / stats.successes * 1000, 1) if stats.successes else None,
+                "accepted": stats.accepted,
+                "rejected": stats.rejected,
+                "accept_rate": round(stats.accepted / judged, 3) if judged else None,
+            }
+        return {"backends": backends, "failovers": self.failovers, "unavailable": self.unavailable}
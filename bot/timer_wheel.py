@@ -0,0 +1,318 @@
+"""
+Hierarchical timer wheel and a durable delayed-action scheduler built on it
+"""
+import asyncio
+import itertools
+import time
+from datetime import datetime, timezone
+
+
+class HierarchicalTimerWheel:
+    """
+    Timer wheel with ``levels`` wheels of ``slots`` buckets each.
+
+    Level 0 buckets are one tick wide, level 1 buckets ``slots`` ticks wide
+    and so on, so adding a timer is O(1) and advancing one tick only touches
+    one bucket (plus an occasional cascade from a higher level). With the
+    defaults (64 slots, 4 levels, 1s ticks) timers up to ~194 days out are
+    placed exactly; anything further is parked on the top level and
+    re-placed as the wheel turns. Cancelled timers stay in their bucket and
+    are dropped when the wheel reaches them.
+    """
+
+    def __init__(self, start_tick: int = 0, *, slots: int = 64, levels: int = 4):
+        self.slots = slots
+        self.levels = levels
+        self.current_tick = start_tick
+        self._wheels = [[[] for _ in range(slots)] for _ in range(levels)]
+        self._ready = []
+        self._cancelled = set()
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def add(self, timer_id, due_tick: int) -> None:
+        self._count += 1
+        self._place(timer_id, due_tick)
+
+    def cancel(self, timer_id) -> None:
+        """Forget a pending timer (ids must be unique and not yet expired)"""
+        self._cancelled.add(timer_id)
+        self._count -= 1
+        if not self._count:
+            self.reset(self.current_tick)
+
+    def reset(self, to_tick: int) -> None:
+        """Move an empty wheel straight to ``to_tick``, dropping cancelled leftovers"""
+        if self._count:
+            raise ValueError("only an empty wheel can be reset")
+        self._wheels = [[[] for _ in range(self.slots)] for _ in range(self.levels)]
+        self._ready = []
+        self._cancelled.clear()
+        self.current_tick = to_tick
+
+    def _place(self, timer_id, due_tick):
+        if timer_id in self._cancelled:
+            self._cancelled.discard(timer_id)
+            return
+        delta = due_tick - self.current_tick
+        if delta <= 0:
+            self._ready.append(timer_id)
+            return
+
+        level = 0
+        span = self.slots
+        while delta >= span and level < self.levels - 1:
+            level += 1
+            span *= self.slots
+
+        granularity = self.slots ** level
+        slot = (due_tick // granularity) % self.slots
+        self._wheels[level][slot].append((timer_id, due_tick))
+
+    def _take_ready(self):
+        ready, self._ready = self._ready, []
+        if not self._cancelled:
+            return ready
+        live = []
+        for timer_id in ready:
+            if timer_id in self._cancelled:
+                self._cancelled.discard(timer_id)
+            else:
+                live.append(timer_id)
+        return live
+
+    def advance(self, to_tick: int) -> list:
+        """Move the wheel forward to ``to_tick`` and return the ids that expired"""
+        expired = self._take_ready()
+
+        if self._count == len(expired):
+            # Nothing else is waiting - jump straight there
+            self._count = 0
+            self.reset(max(self.current_tick, to_tick))
+            return expired
+        while self.current_tick < to_tick:
+            self.current_tick += 1
+
+            # Cascade higher levels whose bucket boundary we just crossed
+            for level in range(1, self.levels):
+                granularity = self.slots ** level
+                if self.current_tick % granularity:
+                    break
+                slot = (self.current_tick // granularity) % self.slots
+                entries, self._wheels[level][slot] = self._wheels[level][slot], []
+                for timer_id, due_tick in entries:
+                    self._place(timer_id, due_tick)
+
+            slot = self.current_tick % self.slots
+            entries, self._wheels[0][slot] = self._wheels[0][slot], []
+            for timer_id, due_tick in entries:
+                if due_tick > self.current_tick or timer_id in self._cancelled:
+                    self._place(timer_id, due_tick)  # drops cancelled timers
+                else:
+                    expired.append(timer_id)
+            # Cascades can put already-due timers on the ready list
+            expired.extend(self._take_ready())
+
+            if self._count == len(expired):
+                self._count = 0
+                self.reset(to_tick)
+                return expired
+
+        self._count -= len(expired)
+        return expired
+
+
+class _ScheduledAction:
+    __slots__ = ("action_id", "kind", "due_at", "payload", "db_id", "attempts")
+
+    def __init__(self, action_id, kind, due_at, payload, db_id=None):
+        self.action_id = action_id
+        self.kind = kind
+        self.due_at = due_at
+        self.payload = payload
+        self.db_id = db_id
+        self.attempts = 0
+
+
+class ActionScheduler:
+    """
+    Runs delayed actions (auto-unmute etc.) from one coroutine.
+
+    Actions are persisted to the ``scheduled_actions`` table when a database
+    is available, reloaded by ``run()`` at startup, and anything that came due
+    while the bot was down fires immediately. Handlers are registered per
+    action kind and receive the payload dict. A handler that raises is
+    retried with exponential backoff up to ``max_attempts`` times; after
+    that its persisted row is kept so the next startup tries again.
+    """
+
+    def __init__(self, get_db=None, *, tick_seconds: float = 1.0, max_attempts: int = 5,
+                 retry_seconds: float = 30.0):
+        """
+        Args:
+            get_db: callable returning the PostgresDB (or None) at call time,
+                since cogs get their db attribute after construction.
+        """
+        self.get_db = get_db or (lambda: None)
+        self.tick_seconds = tick_seconds
+        self.max_attempts = max(1, max_attempts)
+        self.retry_seconds = retry_seconds
+        self.wheel = HierarchicalTimerWheel(self._now_tick())
+        self._handlers = {}
+        self._actions = {}  # action_id: _ScheduledAction
+        self._ids = itertools.count(1)
+        self._wakeup = asyncio.Event()
+        self._running_actions = set()
+
+        # Counters for the health snapshot
+        self.fired = 0
+        self.failed = 0
+        self.retried = 0
+        self.abandoned = 0
+        self.recovered = 0
+        self.recovered_overdue = 0
+
+    def _now_tick(self):
+        return int(time.time() / self.tick_seconds)
+
+    def _db(self):
+        db = self.get_db()
+        return db if db and db.connected else None
+
+    def register(self, kind, handler):
+        """Register the async handler called with the payload when a ``kind`` action fires"""
+        self._handlers[kind] = handler
+
+    def schedule(self, kind, delay_seconds, payload=None):
+        """Schedule an action ``delay_seconds`` from now and return its id"""
+        due_at = time.time() + max(0.0, delay_seconds)
+        payload = dict(payload or {})
+
+        db_id = None
+        db = self._db()
+        if db:
+            try:
+                db_id = db.add_scheduled_action(kind, datetime.fromtimestamp(due_at, timezone.utc), payload)
+            except Exception as e:
+                print(f"❌ Error persisting scheduled {kind} action: {e}")
+
+        return self._add(kind, due_at, payload, db_id)
+
+    def _add(self, kind, due_at, payload, db_id):
+        action = _ScheduledAction(next(self._ids), kind, due_at, payload, db_id)
+        self._enqueue(action)
+        return action.action_id
+
+    def _enqueue(self, action):
+        self._actions[action.action_id] = action
+        if not self.wheel:
+            # The wheel doesn't turn while idle; catch it up first or advance() walks the whole gap
+            self.wheel.reset(self._now_tick())
+        self.wheel.add(action.action_id, int(action.due_at / self.tick_seconds))
+        self._wakeup.set()
+
+    def cancel(self, action_id) -> bool:
+        """Cancel a pending action (the wheel entry is dropped when it's reached)"""
+        action = self._actions.pop(action_id, None)
+        if action is None:
+            return False
+        self.wheel.cancel(action_id)
+        self._delete_persisted(action)
+        return True
+
+    def _delete_persisted(self, action):
+        if action.db_id is None:
+            return
+        db = self._db()
+        if db:
+            try:
+                db.delete_scheduled_action(action.db_id)
+            except Exception as e:
+                print(f"❌ Error deleting scheduled {action.kind} action: {e}")
+
+    def recover(self) -> int:
+        """Load persisted actions from the database (call once at startup)"""
+        db = self._db()
+        if not db:
+            return 0
+
+        known = {action.db_id for action in self._actions.values() if action.db_id is not None}
+        now = time.time()
+        count = 0
+        for row in db.get_scheduled_actions():
+            if row["id"] in known:
+                continue
+            due_at = row["due_at"].timestamp()
+            if due_at <= now:
+                self.recovered_overdue += 1
+            self._add(row["kind"], due_at, dict(row["payload"] or {}), row["id"])
+            count += 1
+
+        self.recovered += count
+        return count
+
+    async def run(self):
+        """The single scheduler coroutine: recover, then fire actions as they come due"""
+        try:
+            recovered = self.recover()
+            if recovered:
+                print(f"⏰ Recovered {recovered} scheduled action(s) ({self.recovered_overdue} overdue)")
+        except Exception as e:
+            print(f"❌ Error recovering scheduled actions: {e}")
+
+        while True:
+            now_tick = self._now_tick()
+            for action_id in self.wheel.advance(now_tick):
+                action = self._actions.pop(action_id, None)
+                if action is not None:
+                    task = asyncio.create_task(self._fire(action))
+                    self._running_actions.add(task)
+                    task.add_done_callback(self._running_actions.discard)
+
+            if not self._actions:
+                # Idle: sleep until something gets scheduled
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            await asyncio.sleep(max(0.0, (now_tick + 1) * self.tick_seconds - time.time()))
+
+    async def _fire(self, action):
+        handler = self._handlers.get(action.kind)
+        action.attempts += 1
+        try:
+            if handler is None:
+                raise RuntimeError(f"no handler registered for '{action.kind}'")
+            await handler(action.payload)
+        except Exception as e:
+            self.failed += 1
+            if handler is not None and action.attempts < self.max_attempts:
+                delay = self.retry_seconds * 2 ** (action.attempts - 1)
+                print(f"❌ Scheduled {action.kind} action failed (attempt {action.attempts}), retrying in {delay:.0f}s: {e}")
+                self.retried += 1
+                action.due_at = time.time() + delay
+                self._enqueue(action)
+                return
+            # Keep the persisted row: the next startup's recover() tries it again
+            self.abandoned += 1
+            print(f"❌ Scheduled {action.kind} action failed after {action.attempts} attempt(s): {e}")
+            if handler is None:
+                self._delete_persisted(action)
+        else:
+            self.fired += 1
+            self._delete_persisted(action)
+
+    def get_stats(self):
+        """Get scheduler counters for logging/health checks"""
+        return {
+            "pending": len(self._actions),
+            "running": len(self._running_actions),
+            "fired": self.fired,
+            "failed": self.failed,
+            "retried": self.retried,
+            "abandoned": self.abandoned,
+            "recovered": self.recovered,
+            "recovered_overdue": self.recovered_overdue,
+        }
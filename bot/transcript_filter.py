@@ -0,0 +1,178 @@
+"""
+Confidence gate and hallucination filter for Whisper transcripts
+"""
+import re
+
+from .unicode_transform import fold_text
+
+# Whisper's usual output for silence/noise (compared after normalize_phrase)
+KNOWN_HALLUCINATIONS = (
+    "thank you",
+    "thank you very much",
+    "thanks for watching",
+    "thank you for watching",
+    "thanks for watching and please subscribe",
+    "please subscribe",
+    "subscribe to my channel",
+    "like and subscribe",
+    "see you in the next video",
+    "see you next time",
+    "bye",
+    "bye bye",
+    "you",
+    "so",
+    "okay",
+    "oh",
+    "hmm",
+    "music",
+    "applause",
+    "laughter",
+    "silence",
+    "Subtitles by the Amara.org community",
+    "ご視聴ありがとうございました",
+    "字幕由Amara.org社区提供",
+)
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def _field(segment, name):
+    if isinstance(segment, dict):
+        return segment.get(name)
+    return getattr(segment, name, None)
+
+
+def normalize_phrase(text):
+    """Lowercase, fold fancy letters, drop punctuation/brackets and extra spaces"""
+    text = _PUNCTUATION_RE.sub(" ", fold_text(text or "").lower())
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+class TranscriptVerdict:
+    __slots__ = ("accepted", "reason", "text", "avg_logprob", "no_speech_prob", "compression_ratio")
+
+    def __init__(self, accepted, reason, text, avg_logprob=None, no_speech_prob=None, compression_ratio=None):
+        self.accepted = accepted
+        self.reason = reason
+        self.text = text
+        self.avg_logprob = avg_logprob
+        self.no_speech_prob = no_speech_prob
+        self.compression_ratio = compression_ratio
+
+
+class TranscriptFilter:
+    """
+    Drops transcripts that are probably noise before they cost an LLM call.
+
+    Uses the verbose_json segment metadata with Whisper's own decoding
+    heuristics: a transcript is rejected when speech is unlikely
+    (no_speech_prob high while avg_logprob is below -1, Whisper's own
+    silence rule), when the model was very unsure (avg_logprob below
+    ``min_avg_logprob``), or when the text is repetitive (compression_ratio
+    above the ceiling). Segment scores are weighted by duration.
+    Transcripts that are just a known hallucination ("thanks for
+    watching", ...) are dropped whatever the scores say.
+
+    Offline fallback transcripts have no segment scores, so they are held
+    to a stricter rule: their ``confidence`` must reach
+    ``min_offline_confidence`` and, when ``offline_phrases`` is set, the
+    text must contain one of them (a wake or stop phrase). An English-only
+    engine turns noise and Tagalog speech into plausible English words,
+    so anything not clearly addressed to the bot is dropped.
+    """
+
+    def __init__(self, *, min_avg_logprob=-1.5, max_no_speech_prob=0.6, no_speech_logprob=-1.0,
+                 max_compression_ratio=2.4, min_chars=3, hallucinations=KNOWN_HALLUCINATIONS,
+                 min_offline_confidence=0.5, offline_phrases=()):
+        self.min_avg_logprob = min_avg_logprob
+        self.no_speech_logprob = no_speech_logprob
+        self.max_no_speech_prob = max_no_speech_prob
+        self.max_compression_ratio = max_compression_ratio
+        self.min_chars = min_chars
+        self.hallucinations = {normalize_phrase(phrase) for phrase in hallucinations}
+        self.min_offline_confidence = min_offline_confidence
+        self.offline_phrases = {normalize_phrase(phrase) for phrase in offline_phrases} - {""}
+
+        # Counters for the health snapshot
+        self.checked = 0
+        self.accepted = 0
+        self.suppressed = {}
+
+    @staticmethod
+    def segment_scores(transcription):
+        """
+        Duration-weighted (avg_logprob, no_speech_prob, max compression_ratio)
+        from a verbose_json response; Nones when it has no segments
+        """
+        segments = _field(transcription, "segments") or []
+        total = 0.0
+        logprob = no_speech = 0.0
+        compression = None
+        for segment in segments:
+            start = _field(segment, "start") or 0.0
+            end = _field(segment, "end") or start
+            weight = max(end - start, 0.01)
+            segment_logprob = _field(segment, "avg_logprob")
+            segment_no_speech = _field(segment, "no_speech_prob")
+            if segment_logprob is None or segment_no_speech is None:
+                continue
+            total += weight
+            logprob += weight * segment_logprob
+            no_speech += weight * segment_no_speech
+            segment_compression = _field(segment, "compression_ratio")
+            if segment_compression is not None:
+                compression = max(compression or 0.0, segment_compression)
+        if not total:
+            return None, None, compression
+        return logprob / total, no_speech / total, compression
+
+    def _reject(self, reason, text, scores):
+        self.suppressed[reason] = self.suppressed.get(reason, 0) + 1
+        return TranscriptVerdict(False, reason, text, *scores)
+
+    def _addressed(self, phrase):
+        padded = f" {phrase} "
+        return any(f" {wanted} " in padded for wanted in self.offline_phrases)
+
+    def check(self, transcription, *, offline=False):
+        """
+        Judge a verbose_json transcription (or plain object with .text)
+
+        ``offline`` marks transcripts from a local fallback engine, which
+        get the stricter confidence/phrase rule instead of segment scores.
+        """
+        self.checked += 1
+        text = (_field(transcription, "text") or "").strip()
+        scores = self.segment_scores(transcription)
+        avg_logprob, no_speech_prob, compression_ratio = scores
+        phrase = normalize_phrase(text)
+
+        if len(text) < self.min_chars:
+            return self._reject("too_short", text, scores)
+        if phrase in self.hallucinations:
+            return self._reject("known_hallucination", text, scores)
+        if offline:
+            confidence = _field(transcription, "confidence")
+            if confidence is None or confidence < self.min_offline_confidence:
+                return self._reject("low_confidence", text, scores)
+            if self.offline_phrases and not self._addressed(phrase):
+                return self._reject("not_addressed", text, scores)
+        if no_speech_prob is not None and no_speech_prob > self.max_no_speech_prob and avg_logprob < self.no_speech_logprob:
+            return self._reject("no_speech", text, scores)
+        if avg_logprob is not None and avg_logprob < self.min_avg_logprob:
+            return self._reject("low_confidence", text, scores)
+        if compression_ratio is not None and compression_ratio > self.max_compression_ratio:
+            return self._reject("repetitive", text, scores)
+
+        self.accepted += 1
+        return TranscriptVerdict(True, "ok", text, *scores)
+
+    def get_stats(self):
+        """Get accepted/suppressed counters for logging/health checks"""
+        return {
+            "checked": self.checked,
+            "accepted": self.accepted,
+            "suppressed": dict(self.suppressed),
+            "suppressed_total": sum(self.suppressed.values()),
+        }
@@ -0,0 +1,131 @@
+"""
+Bounded per-guild queue of utterances waiting for transcription
+"""
+import asyncio
+import time
+from collections import deque
+
+
+class UtteranceQueue:
+    """
+    Feeds captured utterances to a small pool of transcription workers.
+
+    Capture never waits on transcription: each guild has a bounded FIFO and
+    when it's full the oldest utterance is dropped (and counted) to make room,
+    since stale speech is the least useful. Workers take guilds round-robin,
+    and at most ``per_guild_concurrency`` utterances of one guild are in
+    flight at a time (1 keeps a guild's conversation in order), so one busy
+    voice channel can't starve the others.
+    """
+
+    def __init__(self, handler, *, max_per_guild=6, workers=3, per_guild_concurrency=1):
+        """
+        Args:
+            handler: async callable ``(guild_id, item)`` run for every utterance.
+        """
+        self.handler = handler
+        self.max_per_guild = max(1, max_per_guild)
+        self.worker_count = max(1, workers)
+        self.per_guild_concurrency = max(1, per_guild_concurrency)
+
+        self._queues = {}  # guild_id: deque of (item, enqueued_at)
+        self._active = {}  # guild_id: utterances in flight
+        self._ready = deque()  # guild ids with work they're allowed to start, fair order
+        self._wakeup = None
+        self._workers = []
+
+        # Counters for the health snapshot
+        self.submitted = 0
+        self.started = 0
+        self.dropped_oldest = 0
+        self.handled = 0
+        self.failed = 0
+        self.max_depth = 0
+        self.wait_seconds = 0.0
+
+    def _ensure_workers(self):
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._workers = [worker for worker in self._workers if not worker.done()]
+        loop = asyncio.get_running_loop()
+        while len(self._workers) < self.worker_count:
+            self._workers.append(loop.create_task(self._run()))
+
+    def _mark_ready(self, guild_id):
+        if (
+            self._queues.get(guild_id)
+            and self._active.get(guild_id, 0) < self.per_guild_concurrency
+            and guild_id not in self._ready
+        ):
+            self._ready.append(guild_id)
+            self._wakeup.set()
+
+    def submit(self, guild_id, item):
+        """Queue an utterance (call on the event loop; see submit_threadsafe)"""
+        self._ensure_workers()
+        queue = self._queues.get(guild_id)
+        if queue is None:
+            queue = self._queues[guild_id] = deque()
+        if len(queue) >= self.max_per_guild:
+            queue.popleft()
+            self.dropped_oldest += 1
+            print(f"⚠️ Transcription backlog full for guild {guild_id}, dropped the oldest utterance")
+        queue.append((item, time.monotonic()))
+        self.submitted += 1
+        self.max_depth = max(self.max_depth, len(queue))
+        self._mark_ready(guild_id)
+
+    def submit_threadsafe(self, loop, guild_id, item):
+        """Queue an utterance from another thread (the voice receive thread)"""
+        loop.call_soon_threadsafe(self.submit, guild_id, item)
+
+    def clear(self, guild_id):
+        """Forget a guild's pending utterances (e.g. when the bot leaves voice)"""
+        queue = self._queues.pop(guild_id, None)
+        return len(queue) if queue else 0
+
+    async def _run(self):
+        while True:
+            while not self._ready:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+
+            guild_id = self._ready.popleft()
+            queue = self._queues.get(guild_id)
+            if not queue or self._active.get(guild_id, 0) >= self.per_guild_concurrency:
+                continue
+
+            item, enqueued_at = queue.popleft()
+            self.started += 1
+            self.wait_seconds += time.monotonic() - enqueued_at
+            self._active[guild_id] = self._active.get(guild_id, 0) + 1
+            # Another worker may start this guild's next utterance if the cap allows
+            self._mark_ready(guild_id)
+            try:
+                await self.handler(guild_id, item)
+                self.handled += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"❌ Transcription worker error for guild {guild_id}: {e}")
+            finally:
+                self._active[guild_id] -= 1
+                if not self._active[guild_id]:
+                    del self._active[guild_id]
+                if queue is self._queues.get(guild_id) and not queue:
+                    del self._queues[guild_id]
+                self._mark_ready(guild_id)
+
+    def get_stats(self):
+        """Get queue depth and drop counters for logging/health checks"""
+        return {
+            "workers": self.worker_count,
+            "per_guild_concurrency": self.per_guild_concurrency,
+            "pending": {str(guild_id): len(queue) for guild_id, queue in self._queues.items() if queue},
+            "in_flight": sum(self._active.values()),
+            "submitted": self.submitted,
+            "dropped_oldest": self.dropped_oldest,
+            "handled": self.handled,
+            "failed": self.failed,
+            "max_depth": self.max_depth,
+            "avg_wait_ms": round(self.wait_seconds / self.started * 1000, 1) if self.started else None,
+        }
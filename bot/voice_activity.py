@@ -0,0 +1,49 @@
+"""
+Energy / zero-crossing voice activity detection with an adaptive noise floor
+"""
+
+
+class VoiceActivityDetector:
+    """
+    Classifies 20 ms frames of one speaker as speech or not.
+
+    A frame is speech when its RMS clears ``threshold_ratio`` times the
+    speaker's noise floor (and an absolute minimum), and its zero-crossing
+    rate isn't hiss-like. Very loud frames pass regardless of ZCR so
+    fricatives ("s", "sh") aren't cut. The noise floor follows non-speech
+    frames quickly and drifts up slowly during speech, so a fan or a hot
+    mic that starts mid-session stops counting as speech after a while.
+    """
+
+    __slots__ = (
+        "threshold_ratio", "min_rms", "max_zcr", "loud_ratio",
+        "noise_adapt", "speech_adapt", "noise_floor",
+    )
+
+    def __init__(self, *, threshold_ratio=3.0, min_rms=300, max_zcr=0.25, loud_ratio=8.0,
+                 noise_adapt=0.05, speech_adapt=0.002, initial_noise_floor=150.0):
+        self.threshold_ratio = threshold_ratio
+        self.min_rms = min_rms
+        self.max_zcr = max_zcr
+        self.loud_ratio = loud_ratio
+        self.noise_adapt = noise_adapt
+        self.speech_adapt = speech_adapt
+        self.noise_floor = float(initial_noise_floor)
+
+    def threshold(self):
+        return max(self.min_rms, self.noise_floor * self.threshold_ratio)
+
+    def is_speech(self, rms, zcr):
+        threshold = self.threshold()
+        speech = rms > threshold and (zcr <= self.max_zcr or rms > threshold * self.loud_ratio / self.threshold_ratio)
+
+        if not speech:
+            # Quiet frames pull the floor down immediately, noise raises it gradually
+            if rms < self.noise_floor:
+                self.noise_floor = float(rms) if rms else self.noise_floor * (1 - self.noise_adapt)
+            else:
+                self.noise_floor += self.noise_adapt * (rms - self.noise_floor)
+        else:
+            self.noise_floor += self.speech_adapt * (rms - self.noise_floor)
+        self.noise_floor = max(self.noise_floor, 1.0)
+        return speech
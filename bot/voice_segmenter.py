@@ -0,0 +1,98 @@
+"""
+Per-speaker utterance segmentation for received voice audio
+"""
+from collections import deque
+
+from .voice_activity import VoiceActivityDetector
+
+
+class SpeakerSegmenter:
+    """
+    Cuts one speaker's PCM stream into utterances.
+
+    Each speaker gets their own segmenter, so two people talking at once
+    produce two utterances instead of one interleaved recording, and one
+    person's silence never ends another's turn. Frames are kept as a list
+    of chunks and joined once when the utterance ends.
+
+    Speech starts after ``attack_frames`` consecutive speech frames (a lone
+    click doesn't open an utterance) and ends after ``hang_seconds`` of
+    non-speech. The last ``preroll_seconds`` before the start are kept in a
+    ring buffer and prepended, so the first syllable isn't clipped.
+    """
+
+    __slots__ = (
+        "speaker_id", "vad", "hang_seconds", "frame_seconds", "attack_frames", "max_seconds",
+        "preroll", "chunks", "size", "is_speaking", "speech_run", "silence_duration",
+        "speech_duration", "last_silence_log",
+    )
+
+    def __init__(self, speaker_id, *, vad=None, hang_seconds=0.8, preroll_seconds=0.3,
+                 attack_frames=2, max_seconds=30.0, frame_seconds=0.02):
+        self.speaker_id = speaker_id
+        self.vad = vad or VoiceActivityDetector()
+        self.hang_seconds = hang_seconds
+        self.frame_seconds = frame_seconds
+        self.attack_frames = max(1, attack_frames)
+        self.max_seconds = max_seconds
+        self.preroll = deque(maxlen=max(self.attack_frames, round(preroll_seconds / frame_seconds)))
+        self.chunks = []
+        self.size = 0
+        self.is_speaking = False
+        self.speech_run = 0
+        self.silence_duration = 0.0
+        self.speech_duration = 0.0
+        self.last_silence_log = 0.0
+
+    def _append(self, pcm):
+        self.chunks.append(pcm)
+        self.size += len(pcm)
+
+    def push(self, pcm, rms, zcr):
+        """
+        Feed one frame with its RMS and zero-crossing rate
+
+        Returns:
+            bytes: the finished utterance when this frame ends one, else None
+        """
+        speech = self.vad.is_speech(rms, zcr)
+
+        if not self.is_speaking:
+            self.preroll.append(pcm)
+            self.speech_run = self.speech_run + 1 if speech else 0
+            if self.speech_run < self.attack_frames:
+                return None
+            # Start of an utterance: pre-roll (which includes this frame) goes first
+            self.is_speaking = True
+            for chunk in self.preroll:
+                self._append(chunk)
+            self.preroll.clear()
+            self.speech_duration = len(self.chunks) * self.frame_seconds
+            self.silence_duration = 0.0
+            self.last_silence_log = 0.0
+            return None
+
+        self._append(pcm)
+        self.speech_duration += self.frame_seconds
+        if speech:
+            self.silence_duration = 0.0
+            self.last_silence_log = 0.0
+        else:
+            # Trailing silence stays in the utterance until the hangover runs out
+            self.silence_duration += self.frame_seconds
+
+        if self.silence_duration > self.hang_seconds or self.speech_duration >= self.max_seconds:
+            return self.flush()
+        return None
+
+    def flush(self):
+        """End the current utterance and return its audio (empty if there was none)"""
+        audio = b"".join(self.chunks)
+        self.chunks = []
+        self.size = 0
+        self.is_speaking = False
+        self.speech_run = 0
+        self.silence_duration = 0.0
+        self.speech_duration = 0.0
+        self.last_silence_log = 0.0
+        return audio
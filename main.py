@@ -19,6 +19,7 @@ if hasattr(sys.stderr, "reconfigure"):
 
 from bot.cog import ChatCog
 from bot.config import Config
+from bot.message_pipeline import MessageDispatcher
 from bot.postgres_db import PostgresDB
 from bot.runtime_config import can_use_audio_features
 from bot.speech_recognition_cog import SpeechRecognitionCog
@@ -62,6 +63,8 @@ class GNSLGBot(commands.Bot):
         self.booted_at = datetime.datetime.now(datetime.timezone.utc)
         self.self_ping_stop = threading.Event()
         self.status_restored = False
+        # One on_message listener runs every cog's message stages in order
+        self.message_pipeline = MessageDispatcher(self, command_prefix=Config.COMMAND_PREFIX)
 
     async def setup_hook(self) -> None:
         chat_cog = ChatCog(self)
@@ -73,10 +76,34 @@ class GNSLGBot(commands.Bot):
         await self.add_cog(speech_cog)
         speech_cog.get_ai_response = chat_cog.get_ai_response
 
+        chat_cog.register_message_stages(self.message_pipeline)
+        speech_cog.register_message_stages(self.message_pipeline)
+        self.add_listener(self.message_pipeline.dispatch, "on_message")
+
 
 bot = GNSLGBot()
 
 
+def build_performance_snapshot() -> dict[str, Any]:
+    snapshot: dict[str, Any] = {}
+    chat_cog = bot.get_cog("ChatCog")
+    snapshot["message_pipeline"] = bot.message_pipeline.get_stats()
+    if chat_cog:
+        snapshot["ai_coalescer"] = chat_cog.ai_coalescer.get_stats()
+        snapshot["reply_scheduler"] = chat_cog.reply_scheduler.get_stats()
+        snapshot["llm_scheduler"] = chat_cog.llm_scheduler.get_stats()
+        snapshot["greetings"] = chat_cog.get_greeting_cache_stats()
+        snapshot["scheduled_actions"] = chat_cog.action_scheduler.get_stats()
+        snapshot["state"] = chat_cog.get_state_stats()
+        snapshot["nicknames"] = chat_cog.nickname_reconciler.get_stats()
+        snapshot["mutations"] = chat_cog.mutations.get_stats()
+        snapshot["channel_bolding"] = chat_cog.get_channel_bold_stats()
+    speech_cog = bot.get_cog("SpeechRecognitionCog")
+    if speech_cog:
+        snapshot["speech"] = speech_cog.get_speech_stats()
+    return snapshot
+
+
 def build_health_snapshot() -> dict[str, Any]:
     db_ok = bot.db.healthcheck() if getattr(bot, "db", None) else False
     saved_voice_state = bot.db.get_saved_voice_state() if db_ok else None
@@ -107,6 +134,7 @@ def build_health_snapshot() -> dict[str, Any]:
             "maintenance_mode": maintenance_mode,
             "saved_voice_state": saved_voice_state,
         },
+        "performance": build_performance_snapshot(),
     }
 
 
@@ -190,6 +218,8 @@ async def on_ready():
 
     if not check_greetings.is_running():
         check_greetings.start()
+    if not pregenerate_greetings.is_running():
+        pregenerate_greetings.start()
 
 
 @tasks.loop(minutes=1)
@@ -224,7 +254,7 @@ async def check_greetings():
         ]
         if online_members:
             if chat_cog:
-                greeting = await chat_cog.generate_greeting("morning", online_members)
+                greeting = await chat_cog.generate_greeting("morning", online_members, for_date=current_date)
             else:
                 mentions = " ".join(member.mention for member in online_members)
                 greeting = random.choice(
@@ -241,7 +271,7 @@ async def check_greetings():
         and (last_night_greeting_date is None or last_night_greeting_date != current_date)
     ):
         if chat_cog:
-            greeting = await chat_cog.generate_greeting("night")
+            greeting = await chat_cog.generate_greeting("night", for_date=current_date)
         else:
             greeting = random.choice(
                 [
@@ -258,6 +288,37 @@ async def before_check_greetings():
     await bot.wait_until_ready()
 
 
+def next_greeting_datetime(now: datetime.datetime, hour: int) -> datetime.datetime:
+    scheduled = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+    if scheduled <= now:
+        scheduled += datetime.timedelta(days=1)
+    return scheduled
+
+
+@tasks.loop(minutes=15)
+async def pregenerate_greetings():
+    """Generate the next AI greetings off-peak so check_greetings can send instantly"""
+    if maintenance_mode or not Config.USE_AI_GREETING:
+        return
+
+    chat_cog = bot.get_cog("ChatCog")
+    if not chat_cog:
+        return
+
+    now = datetime.datetime.now(pytz.timezone("Asia/Manila"))
+    for greeting_type, hour in (("morning", Config.GOOD_MORNING_HOUR), ("night", Config.GOOD_NIGHT_HOUR)):
+        scheduled = next_greeting_datetime(now, hour)
+        hours_until = (scheduled - now).total_seconds() / 3600
+        # Off-peak hours normally; last-chance run if the greeting is close and still missing
+        if now.hour in Config.GREETING_PREGEN_HOURS or hours_until <= Config.GREETING_PREGEN_LEAD_HOURS:
+            await chat_cog.pregenerate_greeting(greeting_type, scheduled.date())
+
+
+@pregenerate_greetings.before_loop
+async def before_pregenerate_greetings():
+    await bot.wait_until_ready()
+
+
 @bot.event
 async def on_command_error(ctx, error):
     logger.warning("Command error (%s): %s", type(error).__name__, error)
@@ -0,0 +1,88 @@
+"""
+Benchmark per-frame energy detection (the old int.from_bytes peak loop vs
+bot.audio_dsp backends) on 20 ms 48 kHz stereo frames, and check that every
+backend agrees.
+
+    python scripts/bench_audio_dsp.py --frames 2000
+"""
+from pathlib import Path
+import argparse
+import math
+import random
+import struct
+import sys
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from bot.audio_dsp import BACKEND, available_backends, frame_levels  # noqa: E402
+
+FRAME_SAMPLES = 960 * 2  # 20 ms of 48 kHz stereo
+
+
+def old_peak(pcm):
+    """The previous VoiceSink.write loop"""
+    max_amp = 0
+    for i in range(0, len(pcm), 2):
+        sample = int.from_bytes(pcm[i:i+2], byteorder='little', signed=True)
+        max_amp = max(max_amp, abs(sample))
+    return max_amp
+
+
+def make_frames(count, rng):
+    frames = []
+    for _ in range(count):
+        amplitude = rng.choice([0, 200, 3000, 12000, 32767])
+        freq = rng.uniform(80, 3000)
+        samples = [
+            max(-32768, min(32767, int(amplitude * math.sin(2 * math.pi * freq * i / 96000) + rng.gauss(0, 50))))
+            for i in range(FRAME_SAMPLES)
+        ]
+        frames.append(struct.pack(f"<{FRAME_SAMPLES}h", *samples))
+    # Edge cases: silence, full-scale negative, odd length
+    frames.append(bytes(FRAME_SAMPLES * 2))
+    frames.append(struct.pack("<2h", -32768, 5))
+    frames.append(struct.pack("<2h", 100, -200) + b"\x01")
+    return frames
+
+
+def timed(func, frames):
+    started = time.perf_counter()
+    for frame in frames:
+        func(frame)
+    return (time.perf_counter() - started) / len(frames) * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    frames = make_frames(args.frames, random.Random(args.seed))
+    backends = available_backends()
+    failures = 0
+
+    for frame in frames:
+        expected_peak = old_peak(frame[:len(frame) - len(frame) % 2])
+        results = {backend: frame_levels(frame, backend) for backend in backends}
+        for backend, (rms, peak) in results.items():
+            reference_rms = results[backends[-1]][0]
+            if peak != expected_peak or abs(rms - reference_rms) > 1:
+                failures += 1
+                if failures <= 10:
+                    print(f"❌ {backend}: (rms={rms}, peak={peak}), expected peak {expected_peak}, rms ~{reference_rms}")
+
+    print(f"Frames: {len(frames)} x {FRAME_SAMPLES} samples (20ms stereo), default backend: {BACKEND}")
+    print(f"old int.from_bytes loop: {timed(old_peak, frames):8.1f}us/frame (peak only)")
+    for backend in backends:
+        cost = timed(lambda frame: frame_levels(frame, backend), frames)
+        print(f"{backend:<24} {cost:8.1f}us/frame (rms + peak)")
+    print(f"Checks: {'all passed' if not failures else f'{failures} failure(s)'}")
+    return 0 if not failures else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
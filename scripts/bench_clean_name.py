@@ -0,0 +1,106 @@
+"""
+Benchmark trailing role-emoji stripping (old endswith loop vs the suffix trie)
+and check both agree, including variation-selector cases.
+
+    python scripts/bench_clean_name.py --names 50000
+"""
+from pathlib import Path
+import argparse
+import random
+import string
+import sys
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from bot.emoji_suffix import EmojiSuffixIndex  # noqa: E402
+
+# Same values as Config.ROLE_EMOJI_MAP (kept here so the script runs without bot config/env)
+ROLE_EMOJIS = ["🌿", "🍆", "💦", "🚀", "🌸", "💪", "☁️", "🍑", "🛑", "🤤", "⭐"]
+
+# (name, expected) pairs the trie must get right
+CASES = [
+    ("Juan 🌿", "Juan"),
+    ("Juan 🌿 🍆 ⭐", "Juan"),
+    ("Juan ☁️", "Juan"),
+    ("Juan ☁", "Juan"),             # cloud without the variation selector
+    ("Juan ⭐️", "Juan"),            # star with a variation selector it isn't mapped with
+    ("Juan ☁️ ☁", "Juan"),
+    ("Juan🌿", "Juan🌿"),            # no space before the emoji: kept, like before
+    ("🌿", "🌿"),
+    ("Juan 🌿 is here", "Juan 🌿 is here"),
+    ("  Juan   🌿  ", "Juan"),
+    ("Juan \ufe0f", "Juan \ufe0f"),  # a lone variation selector isn't an emoji
+    ("", ""),
+]
+
+
+def old_strip(name, emojis):
+    """The previous clean_name_of_emojis loop (minus the "User" default)"""
+    clean_name = name.strip()
+    changed = True
+    while changed:
+        changed = False
+        for emoji_value in emojis:
+            if clean_name.endswith(f" {emoji_value}"):
+                clean_name = clean_name[:-len(emoji_value) - 1].strip()
+                changed = True
+        if clean_name.endswith(" ☁️") or clean_name.endswith(" ☁"):
+            clean_name = clean_name[:-2].strip()
+            changed = True
+    return clean_name
+
+
+def make_names(count, rng):
+    names = []
+    for _ in range(count):
+        base = "".join(rng.choice(string.ascii_letters + " ") for _ in range(rng.randint(1, 16))).strip() or "x"
+        suffix = " ".join(rng.choice(ROLE_EMOJIS) for _ in range(rng.choice([0, 1, 1, 1, 2, 3])))
+        names.append(f"{base} {suffix}" if suffix else base)
+    return names
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--names", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    index = EmojiSuffixIndex([*ROLE_EMOJIS, "☁️"])
+    failures = 0
+
+    for name, expected in CASES:
+        result = index.strip(name)
+        if result != expected:
+            failures += 1
+            print(f"❌ strip({name!r}) = {result!r}, expected {expected!r}")
+
+    names = make_names(args.names, random.Random(args.seed))
+    for name in names:
+        # Mapped emojis as written: both implementations must agree
+        if index.strip(name) != old_strip(name, ROLE_EMOJIS):
+            failures += 1
+            if failures <= 10:
+                print(f"❌ mismatch for {name!r}: {index.strip(name)!r} vs {old_strip(name, ROLE_EMOJIS)!r}")
+
+    started = time.perf_counter()
+    for name in names:
+        old_strip(name, ROLE_EMOJIS)
+    old_us = (time.perf_counter() - started) / len(names) * 1e6
+
+    started = time.perf_counter()
+    for name in names:
+        index.strip(name)
+    trie_us = (time.perf_counter() - started) / len(names) * 1e6
+
+    print(f"Names: {len(names)}, role emojis: {len(ROLE_EMOJIS)}")
+    print(f"endswith loop: {old_us:.2f}us/name")
+    print(f"suffix trie:   {trie_us:.2f}us/name")
+    print(f"Checks: {'all passed' if not failures else f'{failures} failure(s)'}")
+    return 0 if not failures else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
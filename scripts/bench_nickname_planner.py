@@ -0,0 +1,118 @@
+"""
+Benchmark the pure nickname planner on synthetic guilds: plan time and
+allocations (tracemalloc) for N members, plus a few expected-edit checks.
+
+    python scripts/bench_nickname_planner.py --members 100000
+"""
+from pathlib import Path
+import argparse
+import random
+import string
+import sys
+import time
+import tracemalloc
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from bot.nickname_planner import MemberSnapshot, NicknamePlanner  # noqa: E402
+from bot.unicode_transform import to_bold  # noqa: E402
+
+# Same shape as Config.ROLE_EMOJI_MAP (kept here so the script runs without bot config/env)
+ROLE_EMOJI_MAP = {
+    1000 + index: emoji
+    for index, emoji in enumerate(["🌿", "🍆", "💦", "🚀", "🌸", "💪", "☁️", "🍑", "🛑", "🤤", "⭐"])
+}
+UNMAPPED_ROLES = list(range(2000, 2020))
+
+# (snapshot, expected new name or None when no edit is expected)
+CASES = [
+    (MemberSnapshot(1, "Juan", (1000,)), f"{to_bold('Juan')} 🌿"),
+    (MemberSnapshot(2, "Juan 🍆", (1000, 1001)), f"{to_bold('Juan')} 🌿"),
+    (MemberSnapshot(3, f"{to_bold('Juan')} 🌿", (1000,)), None),
+    (MemberSnapshot(4, "Juan", (2000, 1001)), f"{to_bold('Juan')} 🍆"),  # unmapped role above a mapped one
+    (MemberSnapshot(5, "Bot 🌿", (1001,), is_bot=True), None),
+    (MemberSnapshot(6, "🌿", (1000,)), f"{to_bold('🌿')} 🌿"),
+    (MemberSnapshot(7, "Juan ☁", (1000,)), f"{to_bold('Juan')} 🌿"),
+]
+
+
+def planner_order(roles):
+    """Synthetic role ids stand in for positions: higher id, higher role"""
+    return tuple(sorted(roles, reverse=True))
+
+
+def make_snapshots(count, rng, planner):
+    mapped = list(ROLE_EMOJI_MAP)
+    snapshots = []
+    for member_id in range(count):
+        base = "".join(rng.choice(string.ascii_letters) for _ in range(rng.randint(3, 14)))
+        roles = rng.sample(mapped, rng.choice([0, 1, 1, 2, 3])) + rng.sample(UNMAPPED_ROLES, rng.randint(0, 4))
+        rng.shuffle(roles)
+        roll = rng.random()
+        if roll < 0.6:
+            # Already in the server format: the common case after the first run
+            name = planner.desired(base, planner_order(roles))
+        elif roll < 0.8:
+            name = base
+        else:
+            name = f"{base} {rng.choice(list(ROLE_EMOJI_MAP.values()))}"
+        snapshots.append(MemberSnapshot(member_id, name, planner_order(roles), is_bot=rng.random() < 0.01))
+    return snapshots
+
+
+def check_cases(planner):
+    failures = 0
+    for snapshot, expected in CASES:
+        edits, _ = planner.plan([snapshot])
+        result = edits[0].new if edits else None
+        if result != expected:
+            failures += 1
+            print(f"❌ {snapshot.display_name!r} {snapshot.role_ids}: got {result!r}, expected {expected!r}")
+    # only_role_id keeps just the members whose top mapped role matches
+    edits, _ = planner.plan([snapshot for snapshot, _ in CASES], only_role_id=1001)
+    if [edit.member_id for edit in edits] != [4]:
+        failures += 1
+        print(f"❌ only_role_id=1001 planned {[edit.member_id for edit in edits]}, expected [4]")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    planner = NicknamePlanner(ROLE_EMOJI_MAP)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    snapshots = make_snapshots(args.members, random.Random(args.seed), planner)
+    failures = check_cases(planner)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    edits, skipped = planner.plan(snapshots)
+    plan_seconds = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Timing without tracemalloc overhead
+    started = time.perf_counter()
+    planner.plan(snapshots)
+    untraced_seconds = time.perf_counter() - started
+
+    print(f"Members: {len(snapshots)}, role emojis: {len(ROLE_EMOJI_MAP)}")
+    print(f"Planner build: {build_ms:.2f}ms")
+    print(f"Plan: {untraced_seconds * 1000:.1f}ms ({untraced_seconds / len(snapshots) * 1e6:.2f}us/member), "
+          f"{plan_seconds * 1000:.1f}ms under tracemalloc")
+    print(f"Edits: {len(edits)}, skipped: {skipped}")
+    print(f"Allocations: {current / 1024:.0f}KiB retained, {peak / 1024:.0f}KiB peak "
+          f"({peak / max(1, len(snapshots)):.0f}B/member)")
+    print(f"Checks: {'all passed' if not failures else f'{failures} failure(s)'}")
+    return 0 if not failures else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,87 @@
+"""
+Benchmark the compiled profanity matcher against the old per-word substring scan.
+
+    python scripts/bench_profanity_matcher.py --terms 10000 --messages 2000
+"""
+from pathlib import Path
+import argparse
+import random
+import string
+import sys
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from bot.config import Config
+from bot.profanity_matcher import ACTION_SEVERITY, ProfanityMatcher
+
+
+def make_terms(count, rng):
+    terms = dict(Config.DEFAULT_WORD_ACTIONS)
+    actions = list(ACTION_SEVERITY)
+    while len(terms) < count:
+        word = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 10)))
+        terms[word] = rng.choice(actions)
+    return terms
+
+
+def make_messages(count, terms, rng, hit_rate):
+    filler = ["ano", "ba", "yan", "pre", "tara", "laro", "tayo", "mamaya", "grabe", "sige", "lol", "haha"]
+    words = list(terms)
+    messages = []
+    for _ in range(count):
+        parts = [rng.choice(filler) for _ in range(rng.randint(4, 20))]
+        if rng.random() < hit_rate:
+            parts.insert(rng.randrange(len(parts) + 1), rng.choice(words))
+        messages.append(" ".join(parts))
+    return messages
+
+
+def naive_find(text, word_actions):
+    """The previous on_message loop: first banned word found as a substring"""
+    content_lower = text.lower()
+    for word in word_actions:
+        if word in content_lower:
+            return word, word_actions[word]
+    return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--terms", type=int, default=10000)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--hit-rate", type=float, default=0.05, help="fraction of messages containing a banned word")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    terms = make_terms(args.terms, rng)
+    messages = make_messages(args.messages, terms, rng, args.hit_rate)
+
+    started = time.perf_counter()
+    matcher = ProfanityMatcher(terms)
+    build_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    naive_hits = sum(1 for message in messages if naive_find(message, terms))
+    naive_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    matcher_hits = sum(1 for message in messages if matcher.find(message))
+    matcher_seconds = time.perf_counter() - started
+
+    per_naive = naive_seconds / len(messages) * 1e6
+    per_matcher = matcher_seconds / len(messages) * 1e6
+    print(f"Terms: {len(terms)}, messages: {len(messages)}")
+    print(f"Automaton build:   {build_seconds * 1000:.1f}ms")
+    print(f"Per-word scan:     {per_naive:.1f}us/message ({naive_hits} hits)")
+    print(f"Compiled matcher:  {per_matcher:.1f}us/message ({matcher_hits} hits)")
+    print(f"Speedup:           {per_naive / per_matcher:.1f}x" if per_matcher else "Speedup: n/a")
+    # The matcher may also catch fancy-unicode/spaced-out hits the substring scan misses
+    return 0 if matcher_hits >= naive_hits else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,120 @@
+"""
+Benchmark the precompiled unicode transforms against the old per-character
+loops, and check their round-trip properties on random strings.
+
+    python scripts/bench_unicode_transform.py --strings 20000 --seed 7
+"""
+from pathlib import Path
+import argparse
+import random
+import re
+import string
+import sys
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from bot.unicode_transform import (  # noqa: E402
+    BOLD_MAP,
+    FANCY_TO_PLAIN,
+    fold_text,
+    from_bold,
+    normalize_for_tts,
+    to_bold,
+)
+
+EMOJI = ["🌿", "🍆", "💦", "🚀", "🌸", "💪", "☁️", "🍑", "🛑", "🤤", "⭐", "👨‍👩‍👧", "✨"]
+FANCY = list(FANCY_TO_PLAIN)
+
+
+def old_to_bold(text):
+    """The previous format_to_bold / to_unicode_bold"""
+    return ''.join(BOLD_MAP.get(c, c) for c in text)
+
+
+def old_normalize(text):
+    """The previous text_normalizer.normalize_text"""
+    text = ''.join(FANCY_TO_PLAIN.get(c, c) for c in text)
+    text = re.sub(r'[\U00010000-\U0010ffff]', '', text)
+    text = re.sub(r'[\u2700-\u27bf]', '', text)
+    text = re.sub(r'[\u2600-\u26ff]', '', text)
+    text = re.sub(r'[\ufe0f]', '', text)
+    text = re.sub(r'[\u200d]', '', text)
+    return text.strip()
+
+
+def random_plain(rng):
+    alphabet = string.ascii_letters + string.digits + " _-.!?()"
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 32)))
+
+
+def random_mixed(rng):
+    parts = []
+    for _ in range(rng.randint(0, 12)):
+        roll = rng.random()
+        if roll < 0.5:
+            parts.append(random_plain(rng)[:6])
+        elif roll < 0.8:
+            parts.append("".join(rng.choice(FANCY) for _ in range(rng.randint(1, 5))))
+        else:
+            parts.append(rng.choice(EMOJI))
+    return " ".join(parts)
+
+
+def check_properties(plain, mixed):
+    failures = []
+    for text in plain:
+        bold = to_bold(text)
+        if from_bold(bold) != text:
+            failures.append(("from_bold(to_bold(x)) == x", text))
+        if fold_text(bold) != text:
+            failures.append(("fold_text(to_bold(x)) == x", text))
+        if to_bold(bold) != bold:
+            failures.append(("to_bold is idempotent", text))
+        if bold != old_to_bold(text):
+            failures.append(("to_bold matches the old loop", text))
+    for text in mixed:
+        normalized = normalize_for_tts(text)
+        if normalized != old_normalize(text):
+            failures.append(("normalize_for_tts matches the old loop", text))
+        if normalize_for_tts(normalized) != normalized:
+            failures.append(("normalize_for_tts is idempotent", text))
+        if any(ord(c) > 0xFFFF for c in normalized):
+            failures.append(("no astral characters survive normalize_for_tts", text))
+    return failures
+
+
+def timed(func, texts):
+    started = time.perf_counter()
+    for text in texts:
+        func(text)
+    return (time.perf_counter() - started) / len(texts) * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--strings", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    plain = [random_plain(rng) for _ in range(args.strings)]
+    mixed = [random_mixed(rng) for _ in range(args.strings)]
+    # Known edge cases: variation selector, ZWJ sequences, the bold C that used to be mis-keyed
+    mixed += ["𝐂𝐡𝐚𝐭 ☁️", "👨‍👩‍👧 fam", "𝓏𝓏𝓏", "", "   ", "☁"]
+
+    failures = check_properties(plain, mixed)
+    for prop, text in failures[:10]:
+        print(f"❌ {prop}: {text!r}")
+
+    print(f"Strings: {len(plain)} plain, {len(mixed)} mixed")
+    print(f"Bold:      old {timed(old_to_bold, plain):.2f}us, translate {timed(to_bold, plain):.2f}us")
+    print(f"Normalize: old {timed(old_normalize, mixed):.2f}us, translate+regex {timed(normalize_for_tts, mixed):.2f}us")
+    print(f"Properties: {'all passed' if not failures else f'{len(failures)} failure(s)'}")
+    return 0 if not failures else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,166 @@
+"""
+Offline checks for the local wake/stop word gate.
+
+Runs the real pocketsphinx decoder when it is installed (silence and
+noise must be dropped, not crash the gate); the decoder-less fixtures
+use a stub that behaves like pocketsphinx 5, where hyp() and seg() are
+None when nothing was spotted.
+
+    python scripts/check_keyword_gate.py
+"""
+from pathlib import Path
+import asyncio
+import random
+import struct
+import sys
+import tempfile
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from bot.config import Config  # noqa: E402
+from bot.keyword_spotter import GATE_DROP, GATE_PASS, GATE_STOP, GATE_WAKE, KeywordGate  # noqa: E402
+
+RATE = 16000
+
+
+def silence(seconds):
+    return bytes(int(seconds * RATE) * 2)
+
+
+def noise(seconds, level=400, seed=3):
+    rng = random.Random(seed)
+    count = int(seconds * RATE)
+    return struct.pack(f"<{count}h", *(max(-32768, min(32767, int(rng.gauss(0, level)))) for _ in range(count)))
+
+
+class StubSegment:
+    def __init__(self, word):
+        self.word = word
+
+
+class StubDecoder:
+    """Spots whatever it's told to; hyp()/seg() are None otherwise, like pocketsphinx 5"""
+
+    def __init__(self):
+        self.next_words = []
+
+    def start_utt(self):
+        pass
+
+    def process_raw(self, pcm, full_utt=False):
+        pass
+
+    def end_utt(self):
+        pass
+
+    def hyp(self):
+        return object() if self.next_words else None
+
+    def seg(self):
+        return [StubSegment(word) for word in self.next_words] or None
+
+
+def stub_gate(work_dir):
+    gate = KeywordGate(["hey bot"], ["stop"], wake_window_seconds=20.0, work_dir=work_dir)
+    decoder = StubDecoder()
+    gate.spotter._decoder = decoder
+    gate.spotter._failed = False
+    return gate, decoder
+
+
+async def check_stub(work_dir):
+    failures = []
+    gate, decoder = stub_gate(work_dir)
+    if await gate.check(1, 1, noise(1.0)) != GATE_DROP:
+        failures.append("stub: nothing spotted should drop")
+    decoder.next_words = ["stop "]
+    if await gate.check(1, 1, silence(1.0)) != GATE_STOP:
+        failures.append("stub: short stop word should stop")
+    decoder.next_words = ["hey bot"]
+    if await gate.check(1, 1, noise(2.0)) != GATE_WAKE:
+        failures.append("stub: wake word should open the window")
+    decoder.next_words = []
+    if await gate.check(1, 1, noise(2.0)) != GATE_PASS:
+        failures.append("stub: follow-up inside the wake window should pass")
+    if await gate.check(1, 2, noise(2.0)) != GATE_DROP:
+        failures.append("stub: another speaker without a wake word should drop")
+    stats = gate.get_stats()
+    if stats["decisions"][GATE_DROP] != 2 or gate.checked != 5:
+        failures.append("stub: drops should be counted in the gate stats")
+    if abs(stats["gated_seconds"] - 4.0) > 0.05:
+        failures.append(f"stub: gated_seconds should be 4.0, got {stats['gated_seconds']}")
+    return failures
+
+
+async def check_no_wake_loads(work_dir):
+    """Only the stop word is in the dictionary: nothing could wake the gate, so it must pass"""
+    gate = KeywordGate(["gising ka bot"], ["stop"], work_dir=work_dir)
+    spotter = gate.spotter
+    spotter._failed = False
+
+    def build_decoder(phrases):
+        if any(phrase != "stop" for phrase in phrases):
+            raise RuntimeError("word not in dictionary")
+        return StubDecoder()
+
+    spotter._build_decoder = build_decoder
+    failures = []
+    for attempt in range(2):
+        decision = await gate.check(1, 1, noise(1.0))
+        if decision != GATE_PASS:
+            failures.append(f"no loadable wake word, utterance {attempt + 1}: got {decision}, expected {GATE_PASS}")
+    if gate.active or spotter.phrases != ["stop"]:
+        failures.append("gate should report inactive once no wake phrase loaded")
+    return failures
+
+
+async def check_inactive(work_dir):
+    gate = KeywordGate(Config.VOICE_WAKE_WORDS, Config.VOICE_STOP_WORDS, enabled=False, work_dir=work_dir)
+    if await gate.check(1, 1, silence(0.5)) != GATE_PASS:
+        return ["inactive gate should pass short audio"]
+    return []
+
+
+async def check_real(work_dir):
+    gate = KeywordGate(
+        Config.VOICE_WAKE_WORDS, Config.VOICE_STOP_WORDS,
+        threshold=Config.VOICE_KWS_THRESHOLD, work_dir=work_dir,
+    )
+    if not gate.active:
+        print("pocketsphinx is not installed; skipping real decoder fixtures")
+        return []
+    failures = []
+    for name, pcm in (("1s silence", silence(1.0)), ("1s noise", noise(1.0))):
+        try:
+            decision = await gate.check(1, 1, pcm)
+        except Exception as e:
+            failures.append(f"real decoder, {name}: raised {type(e).__name__}: {e}")
+            continue
+        if decision != GATE_DROP:
+            failures.append(f"real decoder, {name}: got {decision}, expected {GATE_DROP}")
+    print(f"Real decoder phrases: {gate.get_stats()['phrases']}")
+    return failures
+
+
+async def run_checks():
+    with tempfile.TemporaryDirectory() as work_dir:
+        return (
+            await check_stub(work_dir)
+            + await check_no_wake_loads(work_dir)
+            + await check_inactive(work_dir)
+            + await check_real(work_dir)
+        )
+
+
+def main() -> int:
+    failures = asyncio.run(run_checks())
+    for failure in failures:
+        print(f"❌ {failure}")
+    print(f"Keyword gate checks: {'all passed' if not failures else f'{len(failures)} failure(s)'}")
+    return 0 if not failures else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
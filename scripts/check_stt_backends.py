@@ -0,0 +1,225 @@
+"""
+Offline checks for the STT router, backends and transcript gate: fake
+Groq clients and canned verbose_json fixtures, no network needed.
+
+    python scripts/check_stt_backends.py
+    python scripts/check_stt_backends.py --wav utterance.wav   # also run pocketsphinx on a 16 kHz mono WAV
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import sys
+import time
+import wave
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from bot.stt_audio import EncodedUtterance  # noqa: E402
+from bot.stt_backends import (  # noqa: E402
+    GroqWhisperBackend,
+    PocketSphinxBackend,
+    STTBackend,
+    STTRouter,
+    STTUnavailable,
+    Transcript,
+)
+from bot.transcript_filter import TranscriptFilter  # noqa: E402
+
+UTTERANCE = EncodedUtterance("fixture.wav", b"RIFF....", "wav", bytes(32000), 16000, 192000, 0.0)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeResponse:
+    def __init__(self, text, segments):
+        self.text = text
+        self.segments = segments
+
+
+class FakeAPIError(Exception):
+    def __init__(self, message, status_code=None, retry_after=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response = type("Response", (), {"headers": {"retry-after": retry_after} if retry_after else {}})()
+
+
+class FakeGroqClient:
+    """Mimics client.audio.transcriptions.create with scripted outcomes"""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+        self.audio = self
+        self.transcriptions = self
+
+    def create(self, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0) if self.outcomes else FakeResponse("hello bot", [])
+        if isinstance(outcome, Exception):
+            raise outcome
+        if isinstance(outcome, (int, float)):
+            time.sleep(outcome)
+            return FakeResponse("slow hello", [])
+        return outcome
+
+
+class ScriptedBackend(STTBackend):
+    remote = False
+
+    def __init__(self, name, text="offline hello"):
+        self.name = name
+        self.text = text
+        self.calls = 0
+
+    async def transcribe(self, utterance):
+        self.calls += 1
+        return Transcript(self.text)
+
+
+def segment(avg_logprob, no_speech_prob, compression_ratio=1.3, start=0.0, end=2.0):
+    return {
+        "start": start, "end": end, "avg_logprob": avg_logprob,
+        "no_speech_prob": no_speech_prob, "compression_ratio": compression_ratio,
+    }
+
+
+# (name, response, accepted, reason)
+TRANSCRIPT_FIXTURES = [
+    ("clear question", FakeResponse(" Hey bot, anong oras na?", [segment(-0.25, 0.02)]), True, "ok"),
+    ("youtube outro on noise", FakeResponse("Thanks for watching!", [segment(-0.3, 0.4)]), False, "known_hallucination"),
+    ("amara credits", FakeResponse("Subtitles by the Amara.org community", [segment(-0.5, 0.5)]), False, "known_hallucination"),
+    ("silence", FakeResponse("I'm going to go.", [segment(-1.3, 0.91)]), False, "no_speech"),
+    ("mumbling", FakeResponse("the the uh what", [segment(-1.9, 0.3)]), False, "low_confidence"),
+    ("repetition loop", FakeResponse("hi hi hi hi hi hi hi hi", [segment(-0.4, 0.1, 3.2)]), False, "repetitive"),
+    ("too short", FakeResponse("a", [segment(-0.1, 0.01)]), False, "too_short"),
+    ("long mostly confident", FakeResponse("tell me a joke about cats please",
+                                           [segment(-0.2, 0.05, end=4.0), segment(-2.0, 0.2, start=4.0, end=4.5)]), True, "ok"),
+    ("remote text, no segments", Transcript("stop the music"), True, "ok"),
+]
+
+# Offline fallback transcripts: (name, transcript, accepted, reason)
+OFFLINE_PHRASES = ["bot", "gnslg", "stop", "cancel", "hinto", "tigil", "tama na"]
+OFFLINE_FIXTURES = [
+    ("buzz decoded as a word", Transcript("wow", confidence=0.9), False, "not_addressed"),
+    ("tagalog as english word salad", Transcript("and go on and that", confidence=0.6), False, "not_addressed"),
+    ("bottle is not bot", Transcript("bottle of water", confidence=0.9), False, "not_addressed"),
+    ("addressed but unsure", Transcript("hey bot what time is it", confidence=0.2), False, "low_confidence"),
+    ("no posterior", Transcript("hey bot play music"), False, "low_confidence"),
+    ("addressed and confident", Transcript("hey bot what time is it", confidence=0.8), True, "ok"),
+    ("stop command", Transcript("stop", confidence=0.7), True, "ok"),
+    ("multi-word stop phrase", Transcript("tama na", confidence=0.7), True, "ok"),
+]
+
+
+async def check_router():
+    failures = []
+    clock = FakeClock()
+
+    # Rate limit fails over to offline, opens Groq's circuit for Retry-After, then Groq recovers
+    groq_client = FakeGroqClient([FakeAPIError("Error code: 429 rate_limit_exceeded", 429, "20")])
+    offline = ScriptedBackend("offline")
+    router = STTRouter([GroqWhisperBackend(groq_client), offline], clock=clock)
+    result = await router.transcribe(UTTERANCE)
+    if result.backend != "offline" or router.breakers["groq"].state != "open":
+        failures.append("429 should fail over to offline and open groq's circuit")
+    await router.transcribe(UTTERANCE)
+    if groq_client.calls != 1 or router.stats["groq"].skipped_open != 1:
+        failures.append("open circuit should skip groq without calling it")
+    clock.now += 21
+    result = await router.transcribe(UTTERANCE)
+    if result.backend != "groq" or router.breakers["groq"].state != "closed":
+        failures.append("groq should be retried and close its circuit after Retry-After")
+
+    # Repeated errors open the circuit only after the threshold
+    groq_client = FakeGroqClient([FakeAPIError("500 upstream"), FakeAPIError("500 upstream"), FakeAPIError("500 upstream")])
+    router = STTRouter([GroqWhisperBackend(groq_client), ScriptedBackend("offline")], failure_threshold=3, clock=clock)
+    for _ in range(3):
+        await router.transcribe(UTTERANCE)
+    if router.breakers["groq"].state != "open" or router.stats["groq"].failures != 3 or router.failovers != 3:
+        failures.append("three errors should open groq's circuit, each call failing over")
+
+    # Timeouts fail over
+    router = STTRouter([GroqWhisperBackend(FakeGroqClient([0.3])), ScriptedBackend("offline")], timeout_seconds=0.05)
+    result = await router.transcribe(UTTERANCE)
+    if result.backend != "offline" or router.stats["groq"].timeouts != 1:
+        failures.append("a slow backend should time out and fail over")
+
+    # Everything rate limited: STTUnavailable tells the caller it was a rate limit
+    router = STTRouter([GroqWhisperBackend(FakeGroqClient([FakeAPIError("429 Too Many Requests", 429)]))])
+    try:
+        await router.transcribe(UTTERANCE)
+        failures.append("no backend left should raise STTUnavailable")
+    except STTUnavailable as e:
+        if not e.rate_limited:
+            failures.append("STTUnavailable should report rate_limited")
+
+    # Accuracy counters
+    router = STTRouter([ScriptedBackend("offline")])
+    router.record_verdict("offline", True)
+    router.record_verdict("offline", False)
+    if router.get_stats()["backends"]["offline"]["accept_rate"] != 0.5:
+        failures.append("record_verdict should feed accept_rate")
+    return failures
+
+
+def check_transcripts():
+    failures = []
+    transcript_filter = TranscriptFilter()
+    for name, response, accepted, reason in TRANSCRIPT_FIXTURES:
+        verdict = transcript_filter.check(response)
+        if verdict.accepted != accepted or verdict.reason != reason:
+            failures.append(f"{name}: got {verdict.reason}, expected {reason}")
+
+    offline_filter = TranscriptFilter(offline_phrases=OFFLINE_PHRASES)
+    for name, transcript, accepted, reason in OFFLINE_FIXTURES:
+        verdict = offline_filter.check(transcript, offline=True)
+        if verdict.accepted != accepted or verdict.reason != reason:
+            failures.append(f"offline {name}: got {verdict.reason}, expected {reason}")
+
+    backend = PocketSphinxBackend()
+    if backend.posterior(0) != 1.0 or not 0.13 < backend.posterior(-20000) < 0.14 or backend.posterior(-10**9) != 0.0:
+        failures.append("pocketsphinx posteriors should map logbase units to 0..1")
+    return failures
+
+
+def run_wav(path):
+    if not PocketSphinxBackend.available():
+        print("pocketsphinx is not installed; skipping --wav")
+        return
+    with wave.open(path, "rb") as wav_file:
+        if wav_file.getnchannels() != 1 or wav_file.getframerate() != 16000 or wav_file.getsampwidth() != 2:
+            raise SystemExit(f"{path}: need 16 kHz mono 16-bit audio")
+        pcm = wav_file.readframes(wav_file.getnframes())
+    utterance = EncodedUtterance(path, b"", "wav", pcm, 16000, len(pcm), 0.0)
+    started = time.perf_counter()
+    transcript = asyncio.run(PocketSphinxBackend().transcribe(utterance))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    verdict = TranscriptFilter(offline_phrases=OFFLINE_PHRASES).check(transcript, offline=True)
+    print(f"{path}: '{transcript.text}' confidence={transcript.confidence:.3f} -> {verdict.reason} ({elapsed_ms:.0f}ms)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--wav", action="append", default=[])
+    args = parser.parse_args()
+
+    failures = asyncio.run(check_router()) + check_transcripts()
+    for failure in failures:
+        print(f"❌ {failure}")
+    for path in args.wav:
+        run_wav(path)
+    print(f"Router fixtures + {len(TRANSCRIPT_FIXTURES) + len(OFFLINE_FIXTURES)} transcript fixtures: "
+          f"{'all passed' if not failures else f'{len(failures)} failure(s)'}")
+    return 0 if not failures else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
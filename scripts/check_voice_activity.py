@@ -0,0 +1,157 @@
+"""
+Run the per-speaker VAD/segmenter over audio fixtures and check where
+utterances start and end.
+
+Built-in fixtures are synthesized deterministically (voiced harmonic
+bursts, hiss, clicks, a fan that turns on mid-stream) as 48 kHz stereo
+16-bit PCM, the format discord-ext-voice-recv delivers. Pass recorded
+WAV files with --wav to print the segments found in real audio.
+
+    python scripts/check_voice_activity.py
+    python scripts/check_voice_activity.py --wav recording.wav
+"""
+from pathlib import Path
+import argparse
+import math
+import random
+import struct
+import sys
+import wave
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from bot.audio_dsp import frame_levels, zero_crossing_rate  # noqa: E402
+from bot.voice_segmenter import SpeakerSegmenter  # noqa: E402
+
+RATE = 48000
+FRAME = 960  # samples per channel in 20 ms
+FRAME_BYTES = FRAME * 4
+
+
+def voiced(rng, seconds, amplitude, f0=140.0):
+    """Harmonic stack with a 4 Hz syllable envelope (rough stand-in for speech)"""
+    out = []
+    for i in range(int(seconds * RATE)):
+        t = i / RATE
+        envelope = 0.55 + 0.45 * math.sin(2 * math.pi * 4 * t)
+        value = sum(math.sin(2 * math.pi * f0 * h * t) / h for h in (1, 2, 3, 4, 5))
+        out.append(amplitude * envelope * value / 2.3 + rng.gauss(0, 60))
+    return out
+
+
+def noise(rng, seconds, level):
+    return [rng.gauss(0, level) for _ in range(int(seconds * RATE))]
+
+
+def to_pcm(samples):
+    clipped = [max(-32768, min(32767, int(sample))) for sample in samples]
+    # Same signal on both channels
+    return struct.pack(f"<{len(clipped) * 2}h", *(value for sample in clipped for value in (sample, sample)))
+
+
+def fixtures():
+    """name: (pcm, [(expected_start_s, expected_end_s), ...])"""
+    rng = random.Random(7)
+    quiet = lambda seconds: noise(rng, seconds, 80)  # noqa: E731
+    return {
+        "single utterance": (
+            to_pcm(quiet(1.0) + voiced(rng, 1.5, 4000) + quiet(1.5)),
+            [(1.0, 2.5)],
+        ),
+        "soft onset keeps the first syllable": (
+            to_pcm(quiet(1.0) + voiced(rng, 0.15, 500) + voiced(rng, 1.2, 5000) + quiet(1.5)),
+            [(1.0, 2.35)],
+        ),
+        "two utterances with a short pause": (
+            to_pcm(quiet(0.5) + voiced(rng, 1.0, 4000) + quiet(0.4) + voiced(rng, 1.0, 4000) + quiet(1.5)),
+            [(0.5, 2.9)],
+        ),
+        "two utterances with a long pause": (
+            to_pcm(quiet(0.5) + voiced(rng, 1.0, 4000) + quiet(1.5) + voiced(rng, 1.0, 4000) + quiet(1.5)),
+            [(0.5, 1.5), (3.0, 4.0)],
+        ),
+        "hiss is not speech": (
+            to_pcm(quiet(0.5) + noise(rng, 1.5, 700) + quiet(1.0)),
+            [],
+        ),
+        "a click is not speech": (
+            to_pcm(quiet(0.5) + [30000, -30000] * 240 + quiet(1.0)),
+            [],
+        ),
+        "fan turning on is absorbed by the noise floor": (
+            to_pcm(quiet(0.5) + noise(rng, 4.0, 400) + voiced(rng, 1.0, 6000) + noise(rng, 1.5, 400)),
+            [(4.5, 5.5)],
+        ),
+    }
+
+
+def segment(pcm):
+    """Feed 20 ms frames through one speaker's segmenter; returns [(start_s, end_s, bytes)]"""
+    segmenter = SpeakerSegmenter("fixture")
+    segments = []
+    utterance_start = None
+    for frame_index in range(len(pcm) // FRAME_BYTES):
+        frame = pcm[frame_index * FRAME_BYTES:(frame_index + 1) * FRAME_BYTES]
+        rms, _ = frame_levels(frame)
+        was_speaking = segmenter.is_speaking
+        audio = segmenter.push(frame, rms, zero_crossing_rate(frame, 2))
+        if segmenter.is_speaking and not was_speaking:
+            # The utterance starts where its first (pre-roll) chunk started
+            utterance_start = (frame_index + 1) * 0.02 - segmenter.size / FRAME_BYTES * 0.02
+        if audio is not None:
+            end = (frame_index + 1) * 0.02 - segmenter.hang_seconds
+            segments.append((utterance_start, end, len(audio)))
+    if segmenter.is_speaking:
+        segments.append((utterance_start, len(pcm) / FRAME_BYTES * 0.02, segmenter.size))
+    return segments
+
+
+def check_fixture(name, pcm, expected, tolerance=0.35):
+    found = segment(pcm)
+    failures = 0
+    if len(found) != len(expected):
+        failures += 1
+    else:
+        for (start, end, _), (expected_start, expected_end) in zip(found, expected):
+            # The pre-roll may start a little early; it must never start late
+            if start > expected_start + 0.05 or start < expected_start - tolerance or abs(end - expected_end) > tolerance:
+                failures += 1
+    spans = ", ".join(f"{start:.2f}-{end:.2f}s" for start, end, _ in found) or "none"
+    print(f"{'✅' if not failures else '❌'} {name}: found {spans}; expected "
+          f"{', '.join(f'{s:.2f}-{e:.2f}s' for s, e in expected) or 'none'}")
+    return failures
+
+
+def read_wav(path):
+    with wave.open(str(path), "rb") as wav_file:
+        if wav_file.getsampwidth() != 2 or wav_file.getframerate() != RATE:
+            raise SystemExit(f"{path}: need 16-bit {RATE} Hz audio")
+        pcm = wav_file.readframes(wav_file.getnframes())
+        if wav_file.getnchannels() == 1:
+            samples = struct.unpack(f"<{len(pcm) // 2}h", pcm)
+            pcm = struct.pack(f"<{len(samples) * 2}h", *(value for sample in samples for value in (sample, sample)))
+    return pcm
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--wav", action="append", default=[], help="recorded 48 kHz 16-bit WAV to segment")
+    args = parser.parse_args()
+
+    if args.wav:
+        for path in args.wav:
+            spans = segment(read_wav(path))
+            print(f"{path}: {len(spans)} utterance(s)")
+            for start, end, size in spans:
+                print(f"  {start:6.2f}s - {end:6.2f}s ({size} bytes)")
+        return 0
+
+    failures = sum(check_fixture(name, pcm, expected) for name, (pcm, expected) in fixtures().items())
+    print(f"Checks: {'all passed' if not failures else f'{failures} failure(s)'}")
+    return 0 if not failures else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
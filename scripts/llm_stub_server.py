@@ -0,0 +1,320 @@
+"""
+Offline OpenAI/Groq-compatible chat completions stub for load tests.
+
+Run it and point the bot at it:
+
+    python scripts/llm_stub_server.py --port 8765 --latency-ms 400 --rate-limit-rate 0.05
+    GROQ_BASE_URL=http://127.0.0.1:8765 python main.py
+
+Serves POST /openai/v1/chat/completions (streaming and non-streaming) and
+GET /stats for call counters. Replies are shaped like the bot expects for
+each prompt kind (reply, planning pass, memory refresh) so the parsing code
+downstream still runs.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+
+class StubBehavior:
+    """Latency, failure injection and counters shared by all handler threads"""
+
+    def __init__(
+        self,
+        *,
+        latency_ms: float = 300.0,
+        jitter_ms: float = 100.0,
+        distribution: str = "lognormal",
+        rate_limit_rate: float = 0.0,
+        rate_limit_models=None,
+        stream_chunk_ms: float = 15.0,
+        seed=None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.distribution = distribution
+        self.rate_limit_rate = rate_limit_rate
+        # Empty means every model can be rate limited
+        self.rate_limit_models = set(rate_limit_models or [])
+        self.stream_chunk_ms = stream_chunk_ms
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = 0
+            self.rate_limited = 0
+            self.streamed = 0
+            self.by_kind = {}
+            self.by_model = {}
+
+    def sample_latency(self) -> float:
+        """Seconds to sleep before answering"""
+        with self._lock:
+            mean, jitter = self.latency_ms, self.jitter_ms
+            if self.distribution == "fixed":
+                value = mean
+            elif self.distribution == "uniform":
+                value = self._random.uniform(mean - jitter, mean + jitter)
+            elif self.distribution == "normal":
+                value = self._random.gauss(mean, jitter)
+            else:
+                # Long right tail, like real inference latency
+                sigma = min(2.0, jitter / mean) if mean > 0 else 0.0
+                value = mean * self._random.lognormvariate(0.0, sigma) if mean > 0 else 0.0
+        return max(0.0, value) / 1000.0
+
+    def should_rate_limit(self, model: str) -> bool:
+        if self.rate_limit_models and model not in self.rate_limit_models:
+            return False
+        with self._lock:
+            return self._random.random() < self.rate_limit_rate
+
+    def record(self, *, model, kind, rate_limited=False, streamed=False):
+        with self._lock:
+            self.calls += 1
+            self.by_model[model] = self.by_model.get(model, 0) + 1
+            if rate_limited:
+                self.rate_limited += 1
+                return
+            self.by_kind[kind] = self.by_kind.get(kind, 0) + 1
+            if streamed:
+                self.streamed += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "completed": self.calls - self.rate_limited,
+                "rate_limited": self.rate_limited,
+                "streamed": self.streamed,
+                "by_kind": dict(self.by_kind),
+                "by_model": dict(self.by_model),
+            }
+
+
+def classify_request(messages) -> str:
+    """Guess which bot code path sent this prompt"""
+    system = " ".join(str(m.get("content") or "") for m in messages if m.get("role") == "system")
+    if "UNIVERSAL_LEARNING" in system:
+        return "planning"
+    if "memory engine" in system.lower():
+        return "memory"
+    if any("greeting sa Tagalog" in str(m.get("content") or "") for m in messages):
+        return "greeting"
+    return "reply"
+
+
+def build_reply_text(kind: str, messages) -> str:
+    last_user = next(
+        (str(m.get("content") or "") for m in reversed(messages) if m.get("role") == "user"),
+        "",
+    )
+    if kind == "planning":
+        return "PLAN: Sagutin nang maikli pero may angas.\nUNIVERSAL_LEARNING: wala"
+    if kind == "memory":
+        return (
+            "CHANNEL_SUMMARY: Magulo pero masaya ang channel, puro asaran.\n"
+            "USER_FACTS: wala"
+        )
+    return f"Ano ba yan, sagot ko sa '{last_user[:60]}' ay oo na lang para matapos na tayo."
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    behavior: StubBehavior = None  # set by make_server
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # Keep load test output readable
+        return
+
+    def _send_json(self, status: int, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/stats":
+            self._send_json(200, self.behavior.snapshot())
+            return
+        self._send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+
+        if self.path.rstrip("/") == "/stats/reset":
+            self.behavior.reset()
+            self._send_json(200, {"ok": True})
+            return
+
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+
+        try:
+            payload = json.loads(raw or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": {"message": "invalid json"}})
+            return
+
+        model = payload.get("model") or "stub-model"
+        messages = payload.get("messages") or []
+        kind = classify_request(messages)
+
+        time.sleep(self.behavior.sample_latency())
+
+        if self.behavior.should_rate_limit(model):
+            self.behavior.record(model=model, kind=kind, rate_limited=True)
+            self._send_json(
+                429,
+                {"error": {"message": f"Rate limit reached for model `{model}`", "type": "tokens", "code": "rate_limit_exceeded"}},
+                headers={"retry-after": "1"},
+            )
+            return
+
+        text = build_reply_text(kind, messages)
+        prompt_tokens = sum(estimate_tokens(str(m.get("content") or "")) for m in messages)
+        completion_tokens = estimate_tokens(text)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+
+        if payload.get("stream"):
+            self.behavior.record(model=model, kind=kind, streamed=True)
+            self._stream(completion_id, created, model, text)
+            return
+
+        self.behavior.record(model=model, kind=kind)
+        self._send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+    def _stream(self, completion_id, created, model, text):
+        """Server-sent events in the OpenAI chunk format"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def chunk(delta, finish_reason=None):
+            data = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            self.wfile.write(f"data: {json.dumps(data)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        chunk({"role": "assistant", "content": ""})
+        words = text.split(" ")
+        for index, word in enumerate(words):
+            time.sleep(self.behavior.stream_chunk_ms / 1000.0)
+            chunk({"content": word if index == 0 else f" {word}"})
+        chunk({}, finish_reason="stop")
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+def make_server(host: str = "127.0.0.1", port: int = 0, **behavior_options):
+    """Create (but don't start) a stub server; port 0 picks a free port"""
+    behavior = StubBehavior(**behavior_options)
+    handler = type("BoundStubRequestHandler", (StubRequestHandler,), {"behavior": behavior})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.behavior = behavior
+    return server
+
+
+def start_in_thread(host: str = "127.0.0.1", port: int = 0, **behavior_options):
+    """Start a stub server on a daemon thread and return it (``server.base_url`` is set)"""
+    server = make_server(host, port, **behavior_options)
+    server.base_url = f"http://{server.server_address[0]}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, name="llm-stub-server", daemon=True).start()
+    return server
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_behavior_arguments(parser)
+    return parser
+
+
+def add_behavior_arguments(parser):
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="mean completion latency")
+    parser.add_argument("--jitter-ms", type=float, default=100.0, help="spread of the latency distribution")
+    parser.add_argument("--latency-dist", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of calls answered with 429")
+    parser.add_argument(
+        "--rate-limit-models",
+        default="",
+        help="comma-separated models that can be rate limited (default: all)",
+    )
+    parser.add_argument("--stream-chunk-ms", type=float, default=15.0, help="delay between streamed chunks")
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def behavior_options_from_args(args):
+    return {
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "distribution": args.latency_dist,
+        "rate_limit_rate": args.rate_limit_rate,
+        "rate_limit_models": [m.strip() for m in args.rate_limit_models.split(",") if m.strip()],
+        "stream_chunk_ms": args.stream_chunk_ms,
+        "seed": args.seed,
+    }
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    server = make_server(args.host, args.port, **behavior_options_from_args(args))
+    host, port = server.server_address[:2]
+    print(f"LLM stub listening on http://{host}:{port} (set GROQ_BASE_URL to this)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.behavior.snapshot(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
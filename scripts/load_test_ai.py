@@ -0,0 +1,267 @@
+"""
+Load test for the AI mention pipeline against the offline LLM stub.
+
+Drives N simulated channels of mentions through the same path as
+the message pipeline stages (coalescer -> per-channel reply scheduler -> planning pass
+-> reply with GROQ_MODELS fallback, plus memory refreshes) and reports
+throughput, reply latency and LLM calls per reply.
+
+    python scripts/load_test_ai.py --channels 20 --mentions 10 --latency-ms 400
+    python scripts/load_test_ai.py --base-url http://127.0.0.1:8765   # external stub
+
+Needs the bot's runtime dependencies installed (discord.py, groq); no Discord
+connection, database or real Groq quota is used.
+"""
+from collections import defaultdict
+from pathlib import Path
+from types import SimpleNamespace
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import urllib.request
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import llm_stub_server  # noqa: E402  (lives next to this script)
+
+
+class InMemoryStore:
+    """The slice of PostgresDB the AI pipeline touches, kept in dicts"""
+
+    connected = True
+
+    def __init__(self):
+        self.conversations = defaultdict(list)
+        self.messages = defaultdict(list)
+        self.channel_memory = {}
+        self.user_memory = {}
+        self.summarized_counts = defaultdict(int)
+
+    def get_persona(self, key, default=None):
+        return default
+
+    def get_conversation_history(self, channel_id, limit=10):
+        return list(self.conversations[int(channel_id)][-limit:])
+
+    def add_to_conversation(self, channel_id, is_user, content):
+        self.conversations[int(channel_id)].append({"is_user": is_user, "content": content})
+        return True
+
+    def log_message(self, guild_id, channel_id, author_id, author_tag, content, *, is_bot=False):
+        self.messages[int(channel_id)].append({
+            "guild_id": guild_id,
+            "channel_id": channel_id,
+            "author_id": author_id,
+            "author_tag": author_tag,
+            "content": content.strip() or "[attachment]",
+            "is_bot": is_bot,
+        })
+        return True
+
+    def get_recent_messages(self, channel_id, limit=60):
+        return list(self.messages[int(channel_id)][-limit:])
+
+    def should_refresh_channel_memory(self, channel_id, every=20):
+        count = len(self.messages[int(channel_id)])
+        if count - self.summarized_counts[int(channel_id)] >= every:
+            self.summarized_counts[int(channel_id)] = count
+            return True
+        return False
+
+    def get_channel_memory(self, channel_id):
+        return self.channel_memory.get(int(channel_id), "")
+
+    def set_channel_memory(self, channel_id, summary):
+        self.channel_memory[int(channel_id)] = summary
+        return True
+
+    def get_user_memory(self, user_id):
+        return self.user_memory.get(int(user_id), "")
+
+    def merge_user_memory(self, user_id, facts):
+        self.user_memory[int(user_id)] = facts
+        return True
+
+
+class SimChannel:
+    def __init__(self, channel_id):
+        self.id = channel_id
+        self.guild = None
+        self.sent = []
+
+    def typing(self):
+        return _NoopTyping()
+
+    async def send(self, content=None, **kwargs):
+        self.sent.append(content)
+
+
+class _NoopTyping:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def make_author(user_id):
+    name = f"user{user_id}"
+    return SimpleNamespace(id=user_id, name=name, display_name=name, mention=f"<@{user_id}>", bot=False, voice=None)
+
+
+def fetch_stub_stats(base_url):
+    with urllib.request.urlopen(f"{base_url}/stats", timeout=5) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+def reset_stub_stats(base_url):
+    request = urllib.request.Request(f"{base_url}/stats/reset", data=b"", method="POST")
+    urllib.request.urlopen(request, timeout=5).close()
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run_load(cog, args):
+    rng = random.Random(args.seed)
+    channels = [SimChannel(900000000000000000 + index) for index in range(args.channels)]
+    latencies = []
+    coalesced = 0
+    errors = 0
+
+    async def one_mention(channel, author, content):
+        nonlocal coalesced, errors
+        message = SimpleNamespace(
+            id=rng.getrandbits(60),
+            content=content,
+            attachments=[],
+            author=author,
+            channel=channel,
+            guild=None,
+        )
+        started = time.perf_counter()
+        try:
+            # Same order as the memory_log and mention_reply message stages
+            await cog._record_message_for_memory(message)
+            _, shared = await cog.ai_coalescer.run(
+                cog.ai_coalescer.make_key("mention", channel.id, author.id, content),
+                lambda: cog.reply_scheduler.submit(channel.id, (message, content)),
+            )
+        except Exception as e:
+            errors += 1
+            print(f"❌ Mention failed: {e}")
+            return
+        if shared:
+            coalesced += 1
+            return
+        latencies.append(time.perf_counter() - started)
+
+    async def drive_channel(channel):
+        tasks = []
+        for index in range(args.mentions):
+            author = make_author(100000000000000000 + rng.randrange(args.users_per_channel))
+            if args.duplicate_rate and rng.random() < args.duplicate_rate:
+                content = "uy bot ano ginagawa mo"
+            else:
+                content = f"uy bot tanong {index} sa channel {channel.id % 1000}"
+            tasks.append(asyncio.create_task(one_mention(channel, author, content)))
+            await asyncio.sleep(rng.expovariate(1000.0 / args.interval_ms) if args.interval_ms > 0 else 0)
+        await asyncio.gather(*tasks)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(drive_channel(channel) for channel in channels))
+    # Let background memory refreshes finish so their calls are counted
+    while cog.memory_refresh_in_progress:
+        await asyncio.sleep(0.05)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "elapsed": elapsed,
+        "latencies": latencies,
+        "coalesced": coalesced,
+        "errors": errors,
+        "messages_sent": sum(len(channel.sent) for channel in channels),
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--channels", type=int, default=10, help="simulated channels")
+    parser.add_argument("--mentions", type=int, default=10, help="mentions per channel")
+    parser.add_argument("--users-per-channel", type=int, default=5)
+    parser.add_argument("--interval-ms", type=float, default=200.0, help="mean gap between mentions in a channel")
+    parser.add_argument("--duplicate-rate", type=float, default=0.0, help="fraction of mentions that repeat the same text")
+    parser.add_argument("--batching", action="store_true", help="enable AI_REPLY_BATCHING for this run")
+    parser.add_argument("--memory-every", type=int, default=20, help="messages between memory refreshes")
+    parser.add_argument("--base-url", default=None, help="use an already running stub instead of starting one")
+    llm_stub_server.add_behavior_arguments(parser)
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server = llm_stub_server.start_in_thread(**llm_stub_server.behavior_options_from_args(args))
+        base_url = server.base_url
+    else:
+        reset_stub_stats(base_url)
+
+    # Config reads the environment at import time
+    os.environ["GROQ_BASE_URL"] = base_url
+    os.environ.setdefault("GROQ_API_KEY", "stub-key")
+    os.environ["AI_REPLY_BATCHING"] = "true" if args.batching else "false"
+
+    from bot.config import Config
+    from bot.cog import ChatCog
+
+    Config.MEMORY_REFRESH_EVERY = args.memory_every
+
+    async def runner():
+        bot = SimpleNamespace(
+            user=SimpleNamespace(id=1, name="ginsilog"),
+            guilds=[],
+            get_channel=lambda channel_id: None,
+            loop=asyncio.get_running_loop(),
+        )
+        cog = ChatCog(bot)
+        cog.db = InMemoryStore()
+        result = await run_load(cog, args)
+        result["llm_scheduler"] = cog.llm_scheduler.get_stats()
+        result["reply_scheduler"] = cog.reply_scheduler.get_stats()
+        return result
+
+    result = asyncio.run(runner())
+    stub_stats = fetch_stub_stats(base_url)
+    if server:
+        server.shutdown()
+
+    latencies = result["latencies"]
+    replies = len(latencies)
+    completed_calls = stub_stats["completed"]
+    print(f"Mentions:          {args.channels * args.mentions} ({result['coalesced']} coalesced, {result['errors']} errors)")
+    print(f"Replies:           {replies} ({result['messages_sent']} messages sent)")
+    print(f"Elapsed:           {result['elapsed']:.2f}s")
+    print(f"Throughput:        {replies / result['elapsed']:.2f} replies/s" if result["elapsed"] else "Throughput: n/a")
+    print(f"Reply latency:     p50 {percentile(latencies, 0.50) * 1000:.0f}ms, "
+          f"p95 {percentile(latencies, 0.95) * 1000:.0f}ms, max {max(latencies, default=0) * 1000:.0f}ms")
+    print(f"LLM calls:         {stub_stats['calls']} ({stub_stats['rate_limited']} rate limited) by kind {stub_stats['by_kind']}")
+    print(f"LLM calls / reply: {completed_calls / replies:.2f}" if replies else "LLM calls / reply: n/a")
+    print(f"Queue waits:       {json.dumps(result['llm_scheduler']['classes'])}")
+    return 0 if not result["errors"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())